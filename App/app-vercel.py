@@ -12,11 +12,11 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Add paths for imports
+# (only the project root: every import is package-qualified)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
-sys.path.append(project_root)
-sys.path.append(os.path.join(project_root, 'echo_backend'))
-sys.path.append(os.path.join(project_root, 'Core_Brain'))
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Import components (Vercel-friendly version)
 try:
@@ -27,7 +27,7 @@ try:
     # Initialize components
     nlp = NLPEngine()
     memory = MemoryManager()
-    router = PersonalityRouter()
+    router = PersonalityRouter(nlp=nlp)
     
     BACKEND_AVAILABLE = True
     logger.info("Backend components imported successfully")
@@ -195,15 +195,14 @@ if st.button("📤 Send Message", use_container_width=True):
                         'response': 'Analysis component not available.'
                     }
                 else:
-                    # Use NLP analysis
-                    analysis = nlp.analyze(user_input, memory)
-                    personality_response = router.get_response(user_input, memory)
+                    # Classify once and let the personality generate the only reply
+                    analysis = nlp.classify(user_input, memory)
 
                     result = {
                         'intent': analysis['intent'],
                         'emotion': analysis['emotion'],
                         'sentiment': analysis['sentiment'],
-                        'response': personality_response
+                        'response': None
                     }
 
                 # Display results
@@ -215,7 +214,13 @@ if st.button("📤 Send Message", use_container_width=True):
                 with col3_text:
                     st.metric("📊 Sentiment", result['sentiment'].title())
                 
-                st.info(result['response'])
+                if result['response'] is None:
+                    # Render the personality reply token by token
+                    result['response'] = st.write_stream(
+                        router.get_response_stream(user_input, memory, analysis=analysis)
+                    )
+                else:
+                    st.info(result['response'])
 
                 # Add to history
                 st.session_state.conversation_history.append({
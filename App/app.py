@@ -7,7 +7,8 @@ import os
 import sys
 import logging
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(project_root)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 from Core_Brain.nlp_engine.personality_router import PersonalityRouter
 from Core_Brain.memory_manager import MemoryManager
@@ -16,12 +17,6 @@ from Core_Brain.memory_manager import MemoryManager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Add paths for imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(os.path.join(current_dir, '..'))
-sys.path.append(os.path.join(current_dir, '..', 'echo_backend'))
-sys.path.append(os.path.join(current_dir, '..', 'Core_Brain'))
-
 # Try to import backend components with better error handling
 BACKEND_AVAILABLE = False
 components = {}
@@ -29,17 +24,17 @@ components = {}
 try:
     # Import from echo_backend.integration
     from echo_backend.integration import (
-        stt, tts, nlp, memory, pipeline, 
+        get_stt, get_nlp, get_memory, pipeline,
         get_core_status, is_core_ready
     )
 
     from Core_Brain.nlp_engine import NLPEngine
     
+    # Text chat needs NLP and memory right away; Whisper loads on the first recording
     components = {
-        'stt': stt,
-        'tts': tts,
-        'nlp': nlp, 
-        'memory': memory,
+        'get_stt': get_stt,
+        'nlp': get_nlp(), 
+        'memory': get_memory(),
         'pipeline': pipeline,
         'get_core_status': get_core_status,
         'is_core_ready': is_core_ready
@@ -54,12 +49,11 @@ except ImportError as e:
     
     # Create dummy functions for graceful degradation
     components = {
-        'stt': None,
-        'tts': None,
+        'get_stt': lambda: None,
         'nlp': None,
         'memory': None,
         'pipeline': None,
-        'get_core_status': lambda: {'all_components': False},
+        'get_core_status': lambda: {},
         'is_core_ready': lambda: False
     }
 
@@ -67,13 +61,12 @@ except ImportError as e:
 if "selected_personality" not in st.session_state:
     st.session_state.selected_personality = "echo"  # default
 
-router = PersonalityRouter()
+router = PersonalityRouter(nlp=components['nlp'])
 if BACKEND_AVAILABLE:
     router.set_personality(st.session_state.selected_personality)
 
 # Extract components
-stt = components['stt']
-tts = components['tts'] 
+get_stt = components['get_stt']
 nlp = components['nlp']
 memory = components['memory']
 pipeline = components['pipeline']
@@ -147,20 +140,16 @@ with st.sidebar:
             core_ready = is_core_ready()
             if core_ready:
                 st.markdown('<div class="status-online">🟢 All Systems Online</div>', unsafe_allow_html=True)
-                
-                # Show detailed status
-                status = get_core_status()
-                for component, is_ready in status.items():
-                    icon = "✅" if is_ready else "❌"
-                    component_name = component.replace('_', ' ').title()
-                    st.write(f"{icon} {component_name}")
             else:
                 st.markdown('<div class="status-offline">🔴 Some Components Offline</div>', unsafe_allow_html=True)
-                status = get_core_status()
-                for component, is_ready in status.items():
-                    icon = "✅" if is_ready else "❌"
-                    component_name = component.replace('_', ' ').title()
-                    st.write(f"{icon} {component_name}")
+
+            # Show detailed status; components load on first use
+            status_icons = {"ready": "✅", "loading": "⏳", "not loaded": "⚪", "failed": "❌"}
+            status = get_core_status()
+            for component, state in status.items():
+                icon = status_icons.get(state, "❔")
+                component_name = component.replace('_', ' ').title()
+                st.write(f"{icon} {component_name} ({state})")
         except Exception as e:
             st.markdown('<div class="status-offline">🔴 Status Check Failed</div>', unsafe_allow_html=True)
             st.write(f"Error: {str(e)}")
@@ -253,6 +242,8 @@ col1, col2 = st.columns([2, 1])
 
 with col1:
     if st.button("🎙️ Record Audio", use_container_width=True):
+        with st.spinner("Loading speech recognition..."):
+            stt = get_stt()
         if stt is None:
             st.error(" Speech-to-Text component not available")
         else:
@@ -298,17 +289,25 @@ with col1:
                 st.metric(" Sentiment", result['sentiment'].title())
 
             st.subheader("Echo's Response")
-            personality_response = router.get_response(result['transcribed_text'], memory)
-            st.info(personality_response)
+            # The pipeline already classified this turn, don't analyse it again
+            personality_response = st.write_stream(router.get_response_stream(
+                result['transcribed_text'], memory,
+                analysis={
+                    'intent': result['intent'],
+                    'emotion': result['emotion'],
+                    'sentiment': result['sentiment']
+                }
+            ))
             result['response_text'] = personality_response
 
             # Audio response
             if result.get('response_audio_path') and os.path.exists(result['response_audio_path']):
-                st.audio(result['response_audio_path'], format="audio/mp3")
-                # Clean up response audio file
+                audio_ext = os.path.splitext(result['response_audio_path'])[1].lstrip('.') or 'mp3'
+                st.audio(result['response_audio_path'], format=f"audio/{audio_ext}")
+                # Clean up response audio file (files from the TTS cache are reused, so they stay)
                 try:
-                    time.sleep(1)
-                    if os.path.exists(result['response_audio_path']):
+                    if not result.get('response_audio_cached') and os.path.exists(result['response_audio_path']):
+                        time.sleep(1)
                         os.remove(result['response_audio_path'])
                         logger.info(f"Cleaned up response audio file: {result['response_audio_path']}")
                 except Exception as response_cleanup_error:
@@ -361,15 +360,14 @@ with col2:
                             'response': 'Analysis component not available.'
                         }
                     else:
-                        # Use NLP analysis instead of hardcoded values
-                        analysis = nlp.analyze(user_input, memory)
-                        personality_response = router.get_response(user_input, memory)
+                        # Classify once and let the personality generate the only reply
+                        analysis = nlp.classify(user_input, memory)
 
                         result = {
                             'intent': analysis['intent'],
                             'emotion': analysis['emotion'],
                             'sentiment': analysis['sentiment'],
-                            'response': personality_response
+                            'response': None
                         }
 
                     # Display results
@@ -381,7 +379,13 @@ with col2:
                     with col3_text:
                         st.metric("Sentiment", result['sentiment'].title())
                     
-                    st.info(result['response'])
+                    if result['response'] is None:
+                        # Render the personality reply token by token
+                        result['response'] = st.write_stream(
+                            router.get_response_stream(user_input, memory, analysis=analysis)
+                        )
+                    else:
+                        st.info(result['response'])
 
                     # Add to history
                     st.session_state.conversation_history.append({
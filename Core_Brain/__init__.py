@@ -1,8 +1,5 @@
 import logging
-from .speech_to_text import SpeechToText 
-from .text_to_speech import TextToSpeech 
-from .memory_manager import MemoryManager
-from .nlp_engine.nlp_engine import NLPEngine
+import threading
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -10,84 +7,175 @@ logger = logging.getLogger(__name__)
 __version__ = "1.0.0"
 __description__ = "Core AI Assistant Brain - Integrated Speech, NLP, and Memory"
 
-def _initialize_components():
-    """Initialize all core components with proper error handling."""
-    components = {}
-    
-    try:
-        components['stt'] = SpeechToText(model_name="small")
-        logger.info("Speech-to-Text initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Speech-to-Text: {e}")
-        components['stt'] = None
-    
-    try:
-        components['tts'] = TextToSpeech()
-        logger.info("Text-to-Speech initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Text-to-Speech: {e}")
-        components['tts'] = None
-    
-    try:
-        components['nlp'] = NLPEngine()
-        logger.info("NLP Engine initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize NLP Engine: {e}")
-        components['nlp'] = None
-    
-    try:
-        components['memory'] = MemoryManager()
-        logger.info("Memory Manager initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Memory Manager: {e}")
-        components['memory'] = None
-    
-    return components
-
-_components = _initialize_components()
-
-stt = _components['stt']
-tts = _components['tts'] 
-nlp = _components['nlp']
-memory = _components['memory']
+# Component states reported by get_core_status()
+NOT_LOADED = "not loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+def _build_stt():
+    from .speech_to_text import SpeechToText
+    # No fixed model: clips are routed to the tiers in ECHO_STT_TIERS
+    return SpeechToText()
+
+
+def _build_tts():
+    from .text_to_speech import TextToSpeech
+    from .speech_config import TTS_PREWARM
+    tts = TextToSpeech()
+    if TTS_PREWARM:
+        # Canned replies are cached on a daemon thread; requests don't wait for it
+        tts.prewarm(background=True)
+    return tts
+
+
+def _build_nlp():
+    from .nlp_engine.nlp_engine import NLPEngine
+    nlp = NLPEngine()
+    nlp.warm_connections()
+    return nlp
+
+
+def _build_memory():
+    from .memory_manager import MemoryManager
+    return MemoryManager()
+
+
+# name -> (status key, factory). Nothing is built at import time: each
+# component is created on first use (get_stt() etc.) or by warmup().
+_FACTORIES = {
+    'stt': ('speech_to_text', _build_stt),
+    'tts': ('text_to_speech', _build_tts),
+    'nlp': ('nlp_engine', _build_nlp),
+    'memory': ('memory_manager', _build_memory),
+}
+
+_instances = {}
+_states = {name: NOT_LOADED for name in _FACTORIES}
+_errors = {}
+_locks = {name: threading.Lock() for name in _FACTORIES}
+
+
+def _get_component(name):
+    """Build the named component once (thread-safe); None if it failed to initialise."""
+    if _states[name] in (READY, FAILED):
+        return _instances.get(name)
+    with _locks[name]:
+        if _states[name] in (NOT_LOADED, LOADING):
+            label, factory = _FACTORIES[name]
+            _states[name] = LOADING
+            try:
+                _instances[name] = factory()
+                _states[name] = READY
+                logger.info(f"{label.replace('_', ' ').title()} initialized successfully")
+            except Exception as e:
+                _errors[name] = str(e)
+                _states[name] = FAILED
+                logger.error(f"Failed to initialize {label}: {e}")
+        return _instances.get(name)
+
+
+def get_stt():
+    """The shared SpeechToText (loads the Whisper models on first call), or None."""
+    return _get_component('stt')
+
+
+def get_tts():
+    """The shared TextToSpeech, or None."""
+    return _get_component('tts')
+
+
+def get_nlp():
+    """The shared NLPEngine, or None."""
+    return _get_component('nlp')
+
+
+def get_memory():
+    """The shared MemoryManager, or None."""
+    return _get_component('memory')
+
+
+def warmup(components=None, background=False):
+    """
+    Eagerly build components (all by default) for processes that would rather
+    pay the loading cost at startup than on the first request. With
+    background=True loading happens on a daemon thread and this returns at once.
+    """
+    names = list(_FACTORIES) if components is None else list(components)
+
+    def load():
+        for name in names:
+            _get_component(name)
+
+    if background:
+        threading.Thread(target=load, name="core-brain-warmup", daemon=True).start()
+    else:
+        load()
+    return get_core_status()
 
-__all__ = [
-    'SpeechToText',
-    'TextToSpeech', 
-    'NLPEngine',
-    'MemoryManager',
-    'stt',
-    'tts',
-    'nlp', 
-    'memory'
-]
 
 def get_core_status():
     """
-    Get the initialization status of all core components.
-    
+    Get the state of every core component without loading anything.
+
     Returns:
-        dict: Status of each component (True if initialized, False if failed)
+        dict: "not loaded", "loading", "ready" or "failed" per component
     """
-    return {
-        'speech_to_text': stt is not None,
-        'text_to_speech': tts is not None,
-        'nlp_engine': nlp is not None,
-        'memory_manager': memory is not None
-    }
+    return {label: _states[name] for name, (label, _) in _FACTORIES.items()}
+
+
+def get_core_errors():
+    """Initialisation error message per failed component."""
+    return {_FACTORIES[name][0]: error for name, error in _errors.items()}
+
 
 def is_core_ready():
     """
-    Check if all core components are ready.
-    
+    Check that no core component has failed.
+
+    Components that are not loaded yet count as available; they are built
+    on first use.
+
     Returns:
-        bool: True if all components initialized successfully
+        bool: True if no component failed to initialise
     """
-    status = get_core_status()
-    return all(status.values())
-
-if is_core_ready():
-    logger.info("All core brain components initialized successfully")
-else:
-    failed_components = [name for name, status in get_core_status().items() if not status]
-    logger.warning(f"Some components failed to initialize: {failed_components}")
+    return FAILED not in get_core_status().values()
+
+
+# Classes are imported on first access too, so `import Core_Brain` stays cheap
+_CLASSES = {
+    'SpeechToText': '.speech_to_text',
+    'TextToSpeech': '.text_to_speech',
+    'NLPEngine': '.nlp_engine.nlp_engine',
+    'MemoryManager': '.memory_manager',
+}
+
+
+def __getattr__(name):
+    # Keeps `from Core_Brain import stt, nlp, ...` working, now lazily
+    if name in _FACTORIES:
+        return _get_component(name)
+    if name in _CLASSES:
+        import importlib
+        return getattr(importlib.import_module(_CLASSES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'SpeechToText',
+    'TextToSpeech',
+    'NLPEngine',
+    'MemoryManager',
+    'stt',
+    'tts',
+    'nlp',
+    'memory',
+    'get_stt',
+    'get_tts',
+    'get_nlp',
+    'get_memory',
+    'warmup',
+    'get_core_status',
+    'is_core_ready',
+]
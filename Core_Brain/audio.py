@@ -0,0 +1,129 @@
+# Turns uploads, files and pydub segments into the 16 kHz mono float32
+# samples Whisper takes, in memory and without writing to disk
+import io
+import os
+import subprocess
+import tempfile
+import wave
+
+from .speech_config import FFMPEG
+
+SAMPLE_RATE = 16000
+# pydub's AudioSegment.normalize() default, kept so transcripts match the old path
+NORMALIZE_HEADROOM_DB = 0.1
+
+
+class AudioDecodeError(RuntimeError):
+    pass
+
+
+class _NeedsSeekableInput(AudioDecodeError):
+    # MP4/M4A written with the index at the end can't be demuxed from a pipe
+    pass
+
+
+def _pcm16_to_float(pcm: bytes, channels: int = 1):
+    import numpy as np
+
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples[: len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def _resample(samples, from_rate: int, to_rate: int):
+    # Linear interpolation, the same quality pydub's set_frame_rate gave the old path
+    import numpy as np
+
+    if from_rate == to_rate or not samples.size:
+        return samples
+    length = int(round(len(samples) * to_rate / from_rate))
+    positions = np.arange(length, dtype=np.float64) * (from_rate / to_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def _decode_wav(source, sample_rate):
+    """Samples of a 16-bit PCM WAV (any rate / channel count), or None to let ffmpeg handle it."""
+    try:
+        with wave.open(source, "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getcomptype() != "NONE":
+                return None
+            channels, rate = wav.getnchannels(), wav.getframerate()
+            pcm = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return _resample(_pcm16_to_float(pcm, channels), rate, sample_rate)
+
+
+def _ffmpeg_decode(path_or_bytes, sample_rate, timeout=None):
+    """Any format ffmpeg understands, resampled and downmixed, read back from stdout."""
+    from_pipe = not isinstance(path_or_bytes, str)
+    # Same output flags as whisper.audio.load_audio, so the samples are identical
+    if from_pipe:
+        cmd = [FFMPEG, "-threads", "0", "-i", "pipe:0"]
+    else:
+        cmd = [FFMPEG, "-nostdin", "-threads", "0", "-i", path_or_bytes]
+    cmd += ["-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-"]
+    try:
+        proc = subprocess.run(
+            cmd, input=bytes(path_or_bytes) if from_pipe else None,
+            capture_output=True, timeout=timeout,
+        )
+    except FileNotFoundError:
+        raise AudioDecodeError("ffmpeg not found (set ECHO_FFMPEG or install ffmpeg)")
+    except subprocess.TimeoutExpired:
+        raise AudioDecodeError(f"ffmpeg timed out after {timeout:.1f}s")
+    if proc.returncode != 0:
+        stderr = proc.stderr.decode(errors="replace")
+        message = stderr.strip().splitlines()
+        if from_pipe and "moov atom not found" in stderr:
+            raise _NeedsSeekableInput(message[-1])
+        raise AudioDecodeError(message[-1] if message else f"ffmpeg exit code {proc.returncode}")
+    return _pcm16_to_float(proc.stdout)
+
+
+def normalize_peak(samples, headroom_db: float = NORMALIZE_HEADROOM_DB):
+    """Scale so the loudest sample sits headroom_db below full scale, like AudioSegment.normalize()."""
+    import numpy as np
+
+    peak = float(np.abs(samples).max()) if samples.size else 0.0
+    if peak == 0.0:
+        return samples
+    target = 10 ** (-headroom_db / 20)
+    return samples * np.float32(target / peak)
+
+
+def decode_audio(source, sample_rate: int = SAMPLE_RATE, normalize: bool = True, timeout=None):
+    """
+    Decode bytes (an upload) or a file path to mono float32 samples at sample_rate.
+
+    16-bit PCM WAVs are read and resampled in NumPy; everything else
+    goes through one ffmpeg process fed on stdin and read from stdout. Only
+    containers ffmpeg can't parse from a pipe (MP4/M4A with the index at the
+    end) are spooled to a temporary file, which is removed straight after.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        samples = _decode_wav(io.BytesIO(source), sample_rate)
+        if samples is None:
+            try:
+                samples = _ffmpeg_decode(source, sample_rate, timeout)
+            except _NeedsSeekableInput:
+                with tempfile.NamedTemporaryFile(suffix=".m4a") as spool:
+                    spool.write(source)
+                    spool.flush()
+                    samples = _ffmpeg_decode(spool.name, sample_rate, timeout)
+    else:
+        path = os.fspath(source)
+        samples = _decode_wav(path, sample_rate) if path.lower().endswith(".wav") else None
+        if samples is None:
+            samples = _ffmpeg_decode(path, sample_rate, timeout)
+    return normalize_peak(samples) if normalize else samples
+
+
+def segment_to_array(audio_segment, sample_rate: int = SAMPLE_RATE):
+    """A pydub AudioSegment as mono float32 samples at sample_rate, without exporting a WAV."""
+    import numpy as np
+
+    segment = audio_segment.set_frame_rate(sample_rate).set_channels(1)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    return samples / float(1 << (8 * segment.sample_width - 1))
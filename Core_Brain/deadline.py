@@ -0,0 +1,44 @@
+# Request-wide time budget passed through STT, NLP and TTS
+import math
+import time
+
+
+class Deadline:
+    """
+    Absolute point in time a request must finish by.
+
+    Created once at request entry and handed to every stage, which sizes its
+    own timeouts from remaining() instead of using fixed waits, so the total
+    latency is bounded by the budget rather than the sum of worst cases.
+    Deadline(None) never expires.
+    """
+
+    def __init__(self, seconds):
+        self.budget = seconds
+        self._expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative; infinite for an unbounded deadline."""
+        if self._expires_at is None:
+            return math.inf
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self, margin: float = 0.0) -> bool:
+        """True once fewer than margin seconds are left."""
+        return self.remaining() <= margin
+
+    def has(self, seconds: float) -> bool:
+        """True if at least `seconds` of budget are left."""
+        return self.remaining() >= seconds
+
+    def timeout(self, default: float) -> float:
+        """A stage's own timeout, shortened to fit what is left of the budget."""
+        return min(default, self.remaining())
+
+    def elapsed(self) -> float:
+        if self._expires_at is None:
+            return 0.0
+        return self.budget - (self._expires_at - time.monotonic())
+
+    def __repr__(self):
+        return f"Deadline(budget={self.budget}, remaining={self.remaining():.2f})"
@@ -1,14 +1,26 @@
-from cryptography.fernet import Fernet
+import threading
 import uuid
 from datetime import datetime
 class MemoryManager:
     def __init__(self , key = None):
-        if key is None:
-            key = Fernet.generate_key()
-        self.fernet = Fernet(key)
+        # The cipher (and the cryptography import) is created on first use
+        self._key = key
+        self._fernet = None
+        self._fernet_lock = threading.Lock()
 
         self.history = []
 
+    @property
+    def fernet(self):
+        if self._fernet is None:
+            with self._fernet_lock:
+                if self._fernet is None:
+                    from cryptography.fernet import Fernet
+                    if self._key is None:
+                        self._key = Fernet.generate_key()
+                    self._fernet = Fernet(self._key)
+        return self._fernet
+
     def add_memory(self, user, echo, session_id=None):
         try:
             if not session_id:
@@ -19,6 +31,7 @@ class MemoryManager:
                 print("Warning: Empty user or echo input, skipping memory storage")
                 return
 
+            # Raises ImportError when cryptography is missing: nothing is stored then
             encrypted_user = self.fernet.encrypt(user.encode()).decode()
             encrypted_echo = self.fernet.encrypt(echo.encode()).decode()
 
@@ -33,21 +46,9 @@ class MemoryManager:
             if len(self.history) > 5:
                 self.history.pop(0)
         except Exception as e:
-            # Log error but don't crash the application
-            print(f"Memory storage error: {e}")
-            # Store unencrypted as fallback for critical conversations
-            try:
-                self.history.append({
-                    "session": session_id or str(uuid.uuid4()),
-                    "user": user,
-                    "echo": echo,
-                    "timestamp": datetime.now().isoformat(),
-                    "encrypted": False
-                })
-                if len(self.history) > 5:
-                    self.history.pop(0)
-            except Exception as fallback_error:
-                print(f"Fallback memory storage also failed: {fallback_error}")
+            # Log error but don't crash the application; an exchange that
+            # couldn't be encrypted is dropped rather than kept in plaintext
+            print(f"Memory storage error: {e}, not storing this exchange")
 
 
     def get_context_text(self, session_id=None):
@@ -1,4 +1,5 @@
 from .nlp_engine import NLPEngine
+from .async_engine import AsyncNLPEngine
 
 # Package metadata
 __version__ = "1.0.0"
@@ -8,6 +9,7 @@ __description__ = "NLP Engine for intent detection and emotion analysis"
 # Export main classes/functions
 __all__ = [
     'NLPEngine',
+    'AsyncNLPEngine',
 ]
 
 DEFAULT_MODEL = "llama3-8b-8192"
@@ -0,0 +1,314 @@
+# asyncio flavour of NLPEngine for servers that hold many conversations per process
+import asyncio
+import time
+
+from .nlp_engine import NLPEngine, CIRCUIT_OPEN_ERROR, DEADLINE_ERROR
+from .resilience import RETRYABLE_STATUSES, retry_after_seconds
+from .http_client import get_async_http_client
+from .config import BATCH_RETRY_ROUNDS, BATCH_CONCURRENCY
+
+
+class AsyncNLPEngine(NLPEngine):
+    """
+    NLPEngine with coroutine versions of call_groq_model(_stream), detect_intent
+    (_cached / _batch), detect_emotion(_batch), classify, analyze and analyze_stream.
+
+    Prompts, parsing, validation and fallbacks are inherited from NLPEngine, so
+    results match the sync engine; only the network wait is non-blocking.
+    """
+
+    async def call_groq_model(self, messages, max_tokens=200, temperature=0.7, deadline=None):
+        """Call Groq API without blocking the event loop"""
+        payload = self._payload(messages, max_tokens, temperature)
+        # SQLite lookups take microseconds; not worth a thread hop
+        cache_key, cached = self._cached_completion(payload)
+        if cached is not None:
+            return cached
+        client = get_async_http_client()
+        started = time.monotonic()
+
+        for attempt in range(self.retry_policy.max_attempts):
+            timeout = self._attempt_timeout(deadline)
+            if timeout is None:
+                self.logger.warning(f"[Attempt {attempt+1}] Request deadline reached, skipping Groq call")
+                return DEADLINE_ERROR
+
+            if not self.breaker.allow_request():
+                self.logger.warning("Groq circuit open, skipping call")
+                return CIRCUIT_OPEN_ERROR
+
+            try:
+                response = await client.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+                text, retryable, retry_after = self._read_completion(response, attempt)
+            except Exception as e:
+                self.logger.error(f"[Attempt {attempt+1}] Request Error: {e}")
+                text, retryable, retry_after = None, True, None
+
+            self._record_outcome(text is not None, retryable)
+            if text is not None:
+                self._store_completion(cache_key, text)
+                return text
+            if not retryable:
+                break
+
+            delay = self._retry_delay(attempt, started, retry_after, deadline)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        return f"[Groq Error]: Failed after {attempt+1} attempts"
+
+    async def call_groq_model_stream(self, messages, max_tokens=200, temperature=0.7, deadline=None):
+        """Async generator variant of NLPEngine.call_groq_model_stream."""
+        payload = self._payload(messages, max_tokens, temperature, stream=True)
+        client = get_async_http_client()
+        started = time.monotonic()
+
+        for attempt in range(self.retry_policy.max_attempts):
+            timeout = self._attempt_timeout(deadline)
+            if timeout is None:
+                self.logger.warning(f"[Attempt {attempt+1}] Request deadline reached, skipping Groq call")
+                yield DEADLINE_ERROR
+                return
+
+            if not self.breaker.allow_request():
+                self.logger.warning("Groq circuit open, skipping call")
+                yield CIRCUIT_OPEN_ERROR
+                return
+
+            emitted = False
+            retryable, retry_after = True, None
+            try:
+                async with client.stream("POST", self.api_url, headers=self.headers, json=payload,
+                                         timeout=timeout) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        self.logger.warning(f"[Attempt {attempt+1}] HTTP {response.status_code}: {body}")
+                        retryable = response.status_code in RETRYABLE_STATUSES
+                        retry_after = retry_after_seconds(response.headers) if retryable else None
+                    else:
+                        async for line in response.aiter_lines():
+                            delta, done = self._parse_stream_line(line, attempt)
+                            if done:
+                                break
+                            if delta:
+                                if not emitted:
+                                    self.breaker.record_success()
+                                emitted = True
+                                yield delta
+                        if not emitted:
+                            self.logger.warning(f"[Attempt {attempt+1}] Empty streamed response from model.")
+
+            except Exception as e:
+                self.logger.error(f"[Attempt {attempt+1}] Stream Error: {e}")
+
+            if emitted:
+                return
+            self._record_outcome(False, retryable)
+            if not retryable:
+                break
+
+            delay = self._retry_delay(attempt, started, retry_after, deadline)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+        yield f"[Groq Error]: Failed after {attempt+1} attempts"
+
+    async def detect_intent(self, user_input: str, deadline=None) -> str:
+        local = self._local_intent(user_input)
+        if local is not None:
+            return local
+        cached = self._cached_label("intent", user_input)
+        if cached is not None:
+            return cached
+
+        result = await self.call_groq_model(self._intent_messages(user_input), max_tokens=10, deadline=deadline)
+        return self._intent_result(user_input, result)
+
+    async def detect_intent_cached(self, user_input: str) -> str:
+        return await self.detect_intent(user_input)
+
+    async def detect_emotion(self, user_input: str, deadline=None) -> dict:
+        local = self._local_emotion(user_input)
+        if local is not None:
+            return local
+        cached = self._cached_label("emotion", user_input)
+        if cached is not None:
+            return dict(cached)
+
+        result = await self.call_groq_model(self._emotion_messages(user_input), max_tokens=50, deadline=deadline)
+        return self._emotion_result(user_input, result)
+
+    async def detect_intent_batch(self, texts, deadline=None) -> list:
+        return await self._classify_batch("intent", texts, deadline=deadline)
+
+    async def detect_emotion_batch(self, texts, deadline=None) -> list:
+        return await self._classify_batch("emotion", texts, deadline=deadline)
+
+    async def _classify_batch(self, kind: str, texts, deadline=None) -> list:
+        """Chunks of a round run as concurrent tasks, at most BATCH_CONCURRENCY at a time."""
+        texts = list(texts)
+        results = self._batch_prefill(kind, texts)
+        pending = [i for i, result in enumerate(results) if result is None]
+        limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def run(request):
+            _, messages, max_tokens = request
+            async with limit:
+                return await self.call_groq_model(messages, max_tokens=max_tokens, temperature=0.2, deadline=deadline)
+
+        for attempt in range(1 + BATCH_RETRY_ROUNDS):
+            if not pending:
+                break
+            requests = self._batch_requests(kind, texts, pending, attempt)
+            outputs = await asyncio.gather(*(run(request) for request in requests))
+
+            pending = []
+            for (chunk, _, _), result in zip(requests, outputs):
+                pending.extend(self._batch_collect(kind, texts, chunk, result, results))
+            if pending:
+                self.logger.info(f"Batch {kind} round {attempt+1}: {len(pending)} item(s) to retry")
+
+        return self._batch_finish(kind, results, pending)
+
+    async def _detect_intent_and_emotion(self, user_input: str, deadline=None):
+        """Run detect_intent and detect_emotion as concurrent tasks with one shared timeout."""
+        intent_task = asyncio.ensure_future(self.detect_intent(user_input, deadline=deadline))
+        emotion_task = asyncio.ensure_future(self.detect_emotion(user_input, deadline=deadline))
+        wait = self.classify_timeout if deadline is None else deadline.timeout(self.classify_timeout)
+        await asyncio.wait([intent_task, emotion_task], timeout=wait)
+
+        if intent_task.done():
+            intent = intent_task.result()
+        else:
+            intent_task.cancel()
+            self.logger.warning(f"Intent detection timed out after {wait:.1f}s")
+            intent = "unknown"
+
+        if emotion_task.done():
+            emotion_data = emotion_task.result()
+        else:
+            emotion_task.cancel()
+            self.logger.warning(f"Emotion detection timed out after {wait:.1f}s")
+            emotion_data = {"emotion": "neutral", "sentiment": "neutral"}
+
+        return intent, emotion_data
+
+    async def analyze_fused(self, user_input: str, context: str = "", include_response: bool = True, deadline=None):
+        messages = self._fused_messages(user_input, context, include_response)
+        result = await self.call_groq_model(messages, deadline=deadline, **self._fused_params(include_response))
+        return self._parse_fused(result, include_response)
+
+    async def classify(self, user_input: str, memory_manager=None, fused=None, deadline=None) -> dict:
+        context = ""
+        if memory_manager:
+            context = memory_manager.get_context_text()
+
+        cached = self._semantic_lookup(user_input)
+        if cached is not None:
+            analysis = {key: cached[key] for key in ("intent", "emotion", "sentiment")}
+            analysis["context"] = context
+            return analysis
+
+        use_fused = self.fused_analysis if fused is None else fused
+        analysis = await self.analyze_fused(user_input, include_response=False, deadline=deadline) if use_fused else None
+
+        if analysis is None:
+            intent, emotion_data = await self._detect_intent_and_emotion(user_input, deadline=deadline)
+            analysis = {
+                "intent": intent,
+                "emotion": emotion_data["emotion"],
+                "sentiment": emotion_data["sentiment"]
+            }
+
+        self._semantic_store(user_input, analysis, context)
+        analysis["context"] = context
+        return analysis
+
+    async def analyze(self, user_input: str, memory_manager=None, fused=None, deadline=None) -> dict:
+        context = ""
+        if memory_manager:
+            context = memory_manager.get_context_text()
+
+        cached = self._semantic_lookup(user_input)
+        result = self._cached_reply(cached, context)
+
+        use_fused = self.fused_analysis if fused is None else fused
+        if result is None and cached is None and use_fused:
+            result = await self.analyze_fused(user_input, context, deadline=deadline)
+
+        if result is None:
+            if cached is not None:
+                intent, emotion_data = cached["intent"], {"emotion": cached["emotion"], "sentiment": cached["sentiment"]}
+            else:
+                intent, emotion_data = await self._detect_intent_and_emotion(user_input, deadline=deadline)
+
+            messages = self._reply_messages(
+                user_input, intent, emotion_data["emotion"], emotion_data["sentiment"], context
+            )
+            response = await self.call_groq_model(messages, max_tokens=150, temperature=0.8, deadline=deadline)
+
+            result = {
+                "intent": intent,
+                "emotion": emotion_data["emotion"],
+                "sentiment": emotion_data["sentiment"],
+                "response": response
+            }
+
+        if cached is None or (cached["response"] is None and not context):
+            self._semantic_store(user_input, result, context)
+
+        # Save memory
+        if memory_manager:
+            memory_manager.add_memory(user_input, result["response"])
+
+        return result
+
+    async def analyze_stream(self, user_input: str, memory_manager=None, fused=None, deadline=None):
+        """(result, async generator of reply deltas); see NLPEngine.analyze_stream."""
+        context = ""
+        if memory_manager:
+            context = memory_manager.get_context_text()
+
+        cached = self._semantic_lookup(user_input)
+        result = self._cached_reply(cached, context)
+
+        if result is None:
+            if cached is not None:
+                result = {key: cached[key] for key in ("intent", "emotion", "sentiment")}
+            else:
+                use_fused = self.fused_analysis if fused is None else fused
+                result = (
+                    await self.analyze_fused(user_input, include_response=False, deadline=deadline)
+                    if use_fused else None
+                )
+            if result is None:
+                intent, emotion_data = await self._detect_intent_and_emotion(user_input, deadline=deadline)
+                result = {
+                    "intent": intent,
+                    "emotion": emotion_data["emotion"],
+                    "sentiment": emotion_data["sentiment"]
+                }
+
+        async def deltas():
+            if "response" in result:
+                yield result["response"]
+            else:
+                messages = self._reply_messages(
+                    user_input, result["intent"], result["emotion"], result["sentiment"], context
+                )
+                parts = []
+                async for delta in self.call_groq_model_stream(
+                    messages, max_tokens=150, temperature=0.8, deadline=deadline
+                ):
+                    parts.append(delta)
+                    yield delta
+                result["response"] = "".join(parts)
+
+            if cached is None or (cached["response"] is None and not context):
+                self._semantic_store(user_input, result, context)
+            if memory_manager:
+                memory_manager.add_memory(user_input, result["response"])
+
+        return result, deltas()
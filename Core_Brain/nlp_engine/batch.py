@@ -0,0 +1,124 @@
+# Packing many texts into one intent / emotion completion and reading the numbered results back
+import json
+
+from .config import (
+    VALID_INTENTS, VALID_EMOTIONS, VALID_SENTIMENTS, BATCH_INPUT_TOKENS, BATCH_OUTPUT_TOKENS, BATCH_MAX_ITEMS
+)
+
+# Rough token estimate for English text; good enough to size chunks
+CHARS_PER_TOKEN = 4
+# "12. " prefix and newline around every packed message
+ITEM_OVERHEAD_TOKENS = 4
+# Reply tokens per item: "12": "emotional_support",  /  "12": {"emotion": "sad", "sentiment": "negative"},
+OUTPUT_TOKENS_PER_ITEM = {"intent": 10, "emotion": 24}
+# Closing braces and slack on top of the per-item reply estimate
+OUTPUT_TOKENS_SLACK = 16
+
+FALLBACKS = {"intent": "unknown", "emotion": {"emotion": "neutral", "sentiment": "neutral"}}
+
+
+def _clean(text: str, max_chars: int) -> str:
+    # One line per message so the numbering stays unambiguous
+    return " ".join(str(text).split())[:max_chars]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + ITEM_OVERHEAD_TOKENS
+
+
+def plan_chunks(kind: str, texts, indices, max_items=None, input_budget=None, output_budget=None):
+    """
+    Split indices (into texts) into chunks whose packed prompts fit
+    input_budget tokens and whose replies fit output_budget tokens.
+    """
+    max_items = BATCH_MAX_ITEMS if max_items is None else max_items
+    input_budget = BATCH_INPUT_TOKENS if input_budget is None else input_budget
+    output_budget = BATCH_OUTPUT_TOKENS if output_budget is None else output_budget
+    max_items = max(1, min(max_items, (output_budget - OUTPUT_TOKENS_SLACK) // OUTPUT_TOKENS_PER_ITEM[kind]))
+    max_chars = input_budget * CHARS_PER_TOKEN
+
+    chunks, chunk, used = [], [], 0
+    for index in indices:
+        cost = estimate_tokens(_clean(texts[index], max_chars))
+        if chunk and (len(chunk) >= max_items or used + cost > input_budget):
+            chunks.append(chunk)
+            chunk, used = [], 0
+        chunk.append(index)
+        used += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def batch_messages(kind: str, texts, input_budget=None) -> list:
+    """Chat messages asking for one label per numbered text, as a JSON object keyed by number."""
+    input_budget = BATCH_INPUT_TOKENS if input_budget is None else input_budget
+    max_chars = input_budget * CHARS_PER_TOKEN
+    if kind == "intent":
+        system_prompt = (
+            "You are an intent detector. For every numbered message, pick its intent from: "
+            f"{', '.join(VALID_INTENTS)}.\n"
+            "Reply ONLY with JSON mapping each number to its intent, like: "
+            "{\"1\": \"greeting\", \"2\": \"question\"}"
+        )
+    else:
+        system_prompt = (
+            "You are an emotion and sentiment detector. For every numbered message, pick its "
+            f"emotion from: {', '.join(VALID_EMOTIONS)} and its sentiment from: {', '.join(VALID_SENTIMENTS)}.\n"
+            "Reply ONLY with JSON mapping each number to its result, like: "
+            "{\"1\": {\"emotion\": \"sad\", \"sentiment\": \"negative\"}, "
+            "\"2\": {\"emotion\": \"happy\", \"sentiment\": \"positive\"}}"
+        )
+    numbered = "\n".join(f"{n}. {_clean(text, max_chars)}" for n, text in enumerate(texts, 1))
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": numbered}
+    ]
+
+
+def max_tokens_for(kind: str, count: int) -> int:
+    return OUTPUT_TOKENS_PER_ITEM[kind] * count + OUTPUT_TOKENS_SLACK
+
+
+def _valid(kind: str, value):
+    if kind == "intent":
+        label = str(value).lower().strip()
+        return label if label in VALID_INTENTS else None
+    if not isinstance(value, dict):
+        return None
+    emotion = str(value.get("emotion", "")).lower().strip()
+    sentiment = str(value.get("sentiment", "")).lower().strip()
+    if emotion in VALID_EMOTIONS and sentiment in VALID_SENTIMENTS:
+        return {"emotion": emotion, "sentiment": sentiment}
+    return None
+
+
+def parse_batch(kind: str, result: str, count: int) -> dict:
+    """
+    {number: label} for the items 1..count the reply answered with a valid
+    label. Missing, extra or invalid items are left out so callers can retry them.
+    """
+    if result.startswith("[Groq Error]"):
+        return {}
+    start_idx = result.find('{')
+    end_idx = result.rfind('}') + 1
+    if start_idx == -1 or end_idx <= start_idx:
+        return {}
+    try:
+        parsed = json.loads(result[start_idx:end_idx])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+
+    labels = {}
+    for key, value in parsed.items():
+        try:
+            number = int(str(key).strip().rstrip('.'))
+        except ValueError:
+            continue
+        if 1 <= number <= count:
+            label = _valid(kind, value)
+            if label is not None:
+                labels[number] = label
+    return labels
@@ -0,0 +1,83 @@
+# Process-wide cache of intent / emotion results, bounded by size and age
+import threading
+import time
+from collections import OrderedDict
+
+from .config import CLASSIFY_CACHE_SIZE, CLASSIFY_CACHE_TTL
+
+
+class TTLCache:
+    """
+    Thread-safe LRU map whose entries also expire ttl seconds after being set.
+
+    Keys are (kind, model, normalized text), so every NLPEngine using the same
+    model shares results and "Hello!" / "hello !" count as the same message.
+    """
+
+    def __init__(self, maxsize=None, ttl=None):
+        self.maxsize = CLASSIFY_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = CLASSIFY_CACHE_TTL if ttl is None else ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key(kind: str, model: str, text: str):
+        # Same normalisation as features.normalize_text, without importing numpy
+        return kind, model, " ".join(text.lower().split())
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_cache = TTLCache()
+
+
+def get_classification_cache() -> TTLCache:
+    """The cache shared by every NLPEngine in the process."""
+    return _cache
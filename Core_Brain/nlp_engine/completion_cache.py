@@ -0,0 +1,178 @@
+# Persistent Groq completion cache: SQLite (WAL) keyed by a hash of the request payload
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from .config import COMPLETION_CACHE_MODE, COMPLETION_CACHE_PATH, COMPLETION_CACHE_MAX_MB
+
+logger = logging.getLogger(__name__)
+
+# record:  serve stored completions, call Groq and store on a miss
+# replay:  serve stored completions only; a miss is an error, nothing touches the network
+# bypass:  always call Groq, store (refresh) the result
+# off:     no cache
+MODES = ("off", "record", "replay", "bypass")
+
+REPLAY_MISS_ERROR = "[Groq Error]: Not in completion cache (replay mode)"
+
+# After exceeding the size cap, drop least recently used rows down to this fraction of it
+_COMPACT_TO = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used);
+"""
+
+
+def payload_key(payload: dict) -> str:
+    """Canonical content hash: the same model, messages and sampling params give the same key."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    Content-addressed store of completion texts.
+
+    One SQLite connection per thread; WAL lets readers proceed while another
+    thread writes. Total response size is tracked in memory and the least
+    recently used rows are deleted once it passes max_bytes.
+    """
+
+    def __init__(self, path=None, mode=None, max_bytes=None):
+        self.path = COMPLETION_CACHE_PATH if path is None else path
+        self.mode = COMPLETION_CACHE_MODE if mode is None else mode
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown completion cache mode {self.mode!r}, expected one of {MODES}")
+        self.max_bytes = int(COMPLETION_CACHE_MAX_MB * 1024 * 1024) if max_bytes is None else max_bytes
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        self._total_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def reads_enabled(self):
+        return self.mode in ("record", "replay")
+
+    @property
+    def writes_enabled(self):
+        return self.mode in ("record", "bypass")
+
+    def get(self, key: str):
+        conn = self._conn()
+        row = conn.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        conn.execute("UPDATE completions SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        size = len(response.encode("utf-8"))
+        now = time.time()
+        conn = self._conn()
+        old = conn.execute("SELECT size FROM completions WHERE key = ?", (key,)).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO completions (key, model, response, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, model, response, size, now, now),
+        )
+        with self._lock:
+            self.writes += 1
+            self._total_bytes += size - (old[0] if old else 0)
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.compact()
+
+    def compact(self, target_bytes=None):
+        """Delete least recently used rows until the cache is at most target_bytes (default 90% of the cap)."""
+        target = int(self.max_bytes * _COMPACT_TO) if target_bytes is None else target_bytes
+        conn = self._conn()
+        with self._lock:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+            removed = 0
+            if total > target:
+                freed = 0
+                doomed = []
+                for key, size in conn.execute("SELECT key, size FROM completions ORDER BY last_used"):
+                    if total - freed <= target:
+                        break
+                    doomed.append((key,))
+                    freed += size
+                conn.executemany("DELETE FROM completions WHERE key = ?", doomed)
+                total -= freed
+                removed = len(doomed)
+            self._total_bytes = total
+            self.evictions += removed
+        if removed:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            logger.info(f"Completion cache compacted: removed {removed} entries, {total} bytes left")
+        return removed
+
+    def clear(self):
+        conn = self._conn()
+        with self._lock:
+            conn.execute("DELETE FROM completions")
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        entries = conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "entries": entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache():
+    """The process-wide cache configured by ECHO_COMPLETION_CACHE, or None when it is off."""
+    global _cache
+    if COMPLETION_CACHE_MODE == "off":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CompletionCache()
+            logger.info(f"Completion cache in {_cache.mode} mode at {_cache.path}")
+        return _cache
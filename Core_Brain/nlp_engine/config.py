@@ -4,3 +4,96 @@
 # import os
 # HF_API_TOKEN = os.getenv("HF_API_TOKEN")
 
+import os
+
+
+def _env_flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Labels the detectors may return; anything else falls back to unknown / neutral.
+VALID_INTENTS = ["greeting", "question", "request", "get_weather", "emotional_support", "manipulation_check", "unknown"]
+VALID_EMOTIONS = ["happy", "sad", "angry", "fear", "surprise", "disgust", "neutral"]
+VALID_SENTIMENTS = ["positive", "negative", "neutral"]
+
+# Fused analysis: get intent, emotion, sentiment and the reply from a single
+# structured completion instead of three sequential calls (opt-in).
+FUSED_ANALYSIS = _env_flag("ECHO_FUSED_ANALYSIS")
+
+# Run detect_intent and detect_emotion side by side on a shared thread pool.
+CONCURRENT_CLASSIFICATION = _env_flag("ECHO_CONCURRENT_CLASSIFICATION", default=True)
+# Size of the process-wide classification pool (shared by every NLPEngine).
+CLASSIFY_WORKERS = int(os.getenv("ECHO_CLASSIFY_WORKERS", "8"))
+# Seconds to wait for a classification before using its fallback value; the
+# model calls behind it time out at the same point, freeing their workers.
+CLASSIFY_TIMEOUT = float(os.getenv("ECHO_CLASSIFY_TIMEOUT", "30"))
+
+# Shared keep-alive HTTP client (see http_client.py).
+HTTP_POOL_SIZE = int(os.getenv("ECHO_HTTP_POOL_SIZE", "10"))
+# HTTP/2 multiplexing needs httpx[http2]; falls back to requests when missing.
+HTTP2 = _env_flag("ECHO_HTTP2")
+# Connections to open to the Groq API at startup (0 disables pre-warming).
+HTTP_PREWARM_CONNECTIONS = int(os.getenv("ECHO_HTTP_PREWARM", "2"))
+
+# Groq retry policy (see resilience.py): attempts, per-attempt timeout, the
+# exponential backoff range and the total time one call may spend retrying.
+GROQ_MAX_ATTEMPTS = int(os.getenv("ECHO_GROQ_MAX_ATTEMPTS", "3"))
+GROQ_TIMEOUT = float(os.getenv("ECHO_GROQ_TIMEOUT", "20"))
+GROQ_BACKOFF_BASE = float(os.getenv("ECHO_GROQ_BACKOFF_BASE", "0.5"))
+GROQ_BACKOFF_MAX = float(os.getenv("ECHO_GROQ_BACKOFF_MAX", "8"))
+GROQ_RETRY_BUDGET = float(os.getenv("ECHO_GROQ_RETRY_BUDGET", "30"))
+# Circuit breaker: consecutive upstream failures before failing fast, and
+# seconds to wait before letting a probe request through again.
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("ECHO_BREAKER_FAILURES", "5"))
+BREAKER_RECOVERY_TIMEOUT = float(os.getenv("ECHO_BREAKER_RESET", "30"))
+
+# Local intent classifier (local_intent.py): model file written by
+# scripts/train_intent_classifier.py, and the probability below which
+# detect_intent escalates to the LLM. Unused when the file doesn't exist.
+LOCAL_INTENT = _env_flag("ECHO_LOCAL_INTENT", default=True)
+LOCAL_INTENT_MODEL = os.getenv(
+    "ECHO_INTENT_MODEL", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "intent_classifier.npz")
+)
+LOCAL_INTENT_THRESHOLD = float(os.getenv("ECHO_INTENT_CONFIDENCE", "0.8"))
+
+# Emotion / sentiment detection (local_emotion.py): "llm" asks Groq every time,
+# "local" uses the offline lexicon detector only, "prefilter" uses the lexicon
+# result when its confidence reaches ECHO_EMOTION_CONFIDENCE and the LLM otherwise.
+EMOTION_MODE = os.getenv("ECHO_EMOTION_MODE", "llm").strip().lower()
+LOCAL_EMOTION_THRESHOLD = float(os.getenv("ECHO_EMOTION_CONFIDENCE", "0.5"))
+
+# Semantic response cache (semantic_cache.py, opt-in): near-identical messages
+# reuse an earlier classification, and the reply when there is no conversation
+# context. Entries, seconds an entry stays valid, and minimum cosine similarity
+# (paraphrases of a stored message score 1.0, messages about something else
+# <= 0.70, the same message plus a detail ~0.82; see tests/test_semantic_cache.py).
+SEMANTIC_CACHE = _env_flag("ECHO_SEMANTIC_CACHE")
+SEMANTIC_CACHE_SIZE = int(os.getenv("ECHO_SEMANTIC_CACHE_SIZE", "1024"))
+SEMANTIC_CACHE_TTL = float(os.getenv("ECHO_SEMANTIC_CACHE_TTL", "3600"))
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("ECHO_SEMANTIC_CACHE_THRESHOLD", "0.85"))
+
+# Classification cache (classification_cache.py): LLM intent / emotion results
+# shared by every engine, keyed on normalized text + model; entries and seconds.
+CLASSIFY_CACHE = _env_flag("ECHO_CLASSIFY_CACHE", default=True)
+CLASSIFY_CACHE_SIZE = int(os.getenv("ECHO_CLASSIFY_CACHE_SIZE", "4096"))
+CLASSIFY_CACHE_TTL = float(os.getenv("ECHO_CLASSIFY_CACHE_TTL", "3600"))
+
+# Persistent completion cache (completion_cache.py) for development, regression
+# runs and replays: off | record | replay | bypass, the SQLite file, and the size
+# cap in MB after which least recently used completions are dropped.
+COMPLETION_CACHE_MODE = os.getenv("ECHO_COMPLETION_CACHE", "off").strip().lower()
+COMPLETION_CACHE_PATH = os.getenv(
+    "ECHO_COMPLETION_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "echo", "completions.sqlite3")
+)
+COMPLETION_CACHE_MAX_MB = float(os.getenv("ECHO_COMPLETION_CACHE_MAX_MB", "256"))
+
+# Batched classification (batch.py): prompt / reply token budgets and item cap per
+# completion, extra rounds for items the model skipped, and completions in flight.
+BATCH_INPUT_TOKENS = int(os.getenv("ECHO_BATCH_INPUT_TOKENS", "2000"))
+BATCH_OUTPUT_TOKENS = int(os.getenv("ECHO_BATCH_OUTPUT_TOKENS", "1024"))
+BATCH_MAX_ITEMS = int(os.getenv("ECHO_BATCH_MAX_ITEMS", "40"))
+BATCH_RETRY_ROUNDS = int(os.getenv("ECHO_BATCH_RETRY_ROUNDS", "2"))
+BATCH_CONCURRENCY = int(os.getenv("ECHO_BATCH_CONCURRENCY", "4"))
@@ -0,0 +1,82 @@
+# Hashed n-gram text features shared by the local (CPU-only) models
+import re
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # local models are disabled without numpy
+    np = None
+
+N_FEATURES = 2 ** 14
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace, so trivially different inputs compare equal."""
+    return " ".join(text.lower().split())
+
+
+def _ngrams(text: str):
+    words = _TOKEN.findall(text.lower())
+    # Word unigrams and bigrams
+    for n in (1, 2):
+        for i in range(len(words) - n + 1):
+            yield "w:" + " ".join(words[i:i + n])
+    # Character 3-5 grams, robust to typos and inflections ("feeling" ~ "feel")
+    padded = f" {' '.join(words)} "
+    for n in (3, 4, 5):
+        for i in range(len(padded) - n + 1):
+            yield "c:" + padded[i:i + n]
+
+
+def _hashed(text: str, n_features: int):
+    for gram in _ngrams(text):
+        h = zlib.crc32(gram.encode("utf-8"))
+        yield h % n_features, (-1.0 if h & 0x80000000 else 1.0)
+
+
+def sparse_features(text: str, n_features: int = N_FEATURES):
+    """
+    Same features as hash_features() for one text, as (indices, values) of its
+    non-zero columns. Scoring a linear model on these skips the dense row.
+    """
+    if np is None:
+        raise ImportError("numpy is required for local text features")
+
+    counts = {}
+    for col, sign in _hashed(text, n_features):
+        counts[col] = counts.get(col, 0.0) + sign
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    values = np.sign(values) * np.log1p(np.abs(values))
+    norm = np.linalg.norm(values)
+    if norm > 0:
+        values /= norm
+    return indices, values
+
+
+def hash_features(texts, n_features: int = N_FEATURES):
+    """
+    Signed feature hashing of word and character n-grams.
+
+    Returns a float32 (len(texts), n_features) matrix with sublinear term
+    frequencies and L2-normalised rows. crc32 is used instead of hash() so
+    features are stable across processes (and saved models stay valid).
+    """
+    if np is None:
+        raise ImportError("numpy is required for local text features")
+
+    rows, cols, signs = [], [], []
+    for row, text in enumerate(texts):
+        for col, sign in _hashed(text, n_features):
+            rows.append(row)
+            cols.append(col)
+            signs.append(sign)
+
+    X = np.zeros((len(texts), n_features), dtype=np.float32)
+    if rows:
+        np.add.at(X, (np.asarray(rows), np.asarray(cols)), np.asarray(signs, dtype=np.float32))
+    X = np.sign(X) * np.log1p(np.abs(X))
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
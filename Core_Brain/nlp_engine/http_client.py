@@ -0,0 +1,161 @@
+# Process-wide pooled HTTP client shared by every NLPEngine instance
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import HTTP_POOL_SIZE, HTTP2, HTTP_PREWARM_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient:
+    """
+    Keep-alive connection pool with a requests-style post().
+
+    Uses a requests.Session by default, or an httpx.Client with HTTP/2
+    multiplexing when http2=True and httpx[http2] is installed.
+    """
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, http2=HTTP2):
+        self.pool_size = pool_size
+        self.http2 = False
+        self._client = None
+
+        if http2:
+            try:
+                import httpx
+                self._client = httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+                )
+                self.http2 = True
+            except ImportError as e:
+                logger.warning(f"HTTP/2 requested but unavailable ({e}), using requests")
+
+        if self._client is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._client = session
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        return self._client.post(url, headers=headers, json=json, timeout=timeout)
+
+    @contextmanager
+    def stream_post(self, url, headers=None, json=None, timeout=None):
+        """POST and yield a StreamedResponse whose body is read incrementally."""
+        if self.http2:
+            with self._client.stream("POST", url, headers=headers, json=json, timeout=timeout) as response:
+                yield StreamedResponse(response)
+        else:
+            response = self._client.post(url, headers=headers, json=json, timeout=timeout, stream=True)
+            try:
+                yield StreamedResponse(response)
+            finally:
+                response.close()
+
+    def warm(self, url, connections=1, timeout=5):
+        """Open `connections` keep-alive connections to url's host so later calls skip TCP/TLS setup."""
+        def _touch():
+            try:
+                self._client.head(url, timeout=timeout)
+            except Exception as e:
+                logger.debug(f"Connection pre-warm to {url} failed: {e}")
+
+        # Concurrent requests force the pool to open separate connections
+        threads = [threading.Thread(target=_touch, daemon=True) for _ in range(max(1, connections))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout)
+
+    def close(self):
+        self._client.close()
+
+
+class StreamedResponse:
+    """Same view over a streamed requests or httpx response."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    def iter_lines(self):
+        for line in self._response.iter_lines():
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            yield line
+
+    def read_text(self):
+        if hasattr(self._response, "iter_content"):
+            # requests: no read(); .text loads whatever is left of the body
+            return self._response.text
+        body = self._response.read()
+        if isinstance(body, bytes):
+            return body.decode("utf-8", errors="replace")
+        return body
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HTTPClient, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
+
+
+def prewarm(url, connections=HTTP_PREWARM_CONNECTIONS, background=True):
+    """Pre-open pooled connections to url, in a daemon thread by default."""
+    if connections <= 0:
+        return None
+    client = get_http_client()
+    if not background:
+        client.warm(url, connections)
+        return None
+    thread = threading.Thread(target=client.warm, args=(url, connections), daemon=True, name="http-prewarm")
+    thread.start()
+    return thread
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client():
+    """
+    Return the pooled httpx.AsyncClient for the running event loop.
+
+    httpx connections are bound to the loop that opened them, so there is one
+    client per loop rather than one per process. Requires httpx.
+    """
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("AsyncNLPEngine needs httpx: pip install httpx") from e
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        kwargs = {
+            "limits": httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+        }
+        if HTTP2:
+            try:
+                import h2  # noqa: F401
+                kwargs["http2"] = True
+            except ImportError:
+                logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+        client = httpx.AsyncClient(**kwargs)
+        _async_clients[loop] = client
+    return client
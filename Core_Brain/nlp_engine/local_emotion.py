@@ -0,0 +1,253 @@
+# Offline emotion / sentiment detector: word lexicon + negation and intensifier rules
+import re
+import threading
+
+from .features import np
+from .config import VALID_EMOTIONS
+
+# Emotions scored by the lexicon; "neutral" is what's left when nothing scores
+EMOTIONS = [e for e in VALID_EMOTIONS if e != "neutral"]
+
+# word -> emotion it signals (weight 1.0; inflections are listed explicitly)
+EMOTION_WORDS = {
+    "happy": [
+        "happy", "happier", "happiest", "happiness", "glad", "joy", "joyful", "excited", "exciting", "thrilled",
+        "delighted", "cheerful", "grateful", "thankful", "proud", "yay", "love", "loving", "loved", "enjoy",
+        "enjoying", "enjoyed", "celebrate", "celebrating", "blessed", "content", "relieved", "pleased", "ecstatic",
+        "promoted", "promotion", "won", "smile", "smiling", "laugh", "laughing", "fun", "hopeful",
+    ],
+    "sad": [
+        "sad", "sadder", "saddest", "sadness", "unhappy", "depressed", "depressing", "depression", "down", "lonely",
+        "alone", "cry", "crying", "cried", "tears", "miss", "missing", "heartbroken", "hurt", "hurting", "grief",
+        "grieving", "upset", "gloomy", "miserable", "hopeless", "empty", "lost", "died", "death", "disappointed",
+        "disappointing", "sorrow", "broke", "worthless", "tired", "exhausted",
+    ],
+    "angry": [
+        "angry", "anger", "mad", "furious", "annoyed", "annoying", "irritated", "irritating", "hate", "hated",
+        "hating", "rage", "raging", "frustrated", "frustrating", "frustration", "pissed", "outraged", "livid",
+        "resent", "unfair", "stupid", "sick of", "fed up",
+    ],
+    "fear": [
+        "scared", "afraid", "fear", "fearful", "anxious", "anxiety", "nervous", "worried", "worry", "worrying",
+        "terrified", "terrifying", "panic", "panicking", "frightened", "stressed", "stress", "stressful", "dread",
+        "uneasy", "insecure", "overwhelmed", "tense",
+    ],
+    "surprise": [
+        "surprised", "surprise", "surprising", "shocked", "shocking", "wow", "amazed", "unexpected", "unexpectedly",
+        "omg", "astonished", "whoa", "unbelievable", "suddenly", "speechless",
+    ],
+    "disgust": [
+        "disgusted", "disgusting", "disgust", "gross", "yuck", "eww", "ew", "nasty", "revolting", "repulsive",
+        "vile", "sickening", "creepy",
+    ],
+}
+
+# Sentiment-only words (carry polarity but no specific emotion)
+POLARITY_WORDS = {
+    1.0: [
+        "good", "great", "nice", "awesome", "amazing", "wonderful", "fantastic", "excellent", "best", "perfect",
+        "beautiful", "cool", "fine", "better", "brilliant", "lovely", "thanks", "thank", "helpful", "well",
+    ],
+    -1.0: [
+        "bad", "terrible", "awful", "horrible", "worst", "worse", "poor", "wrong", "hard", "difficult", "problem",
+        "fail", "failed", "failing", "pain", "painful", "ugly", "useless", "sucks", "struggling",
+    ],
+}
+
+# Polarity implied by each emotion when scoring sentiment
+EMOTION_POLARITY = {"happy": 1.0, "sad": -1.0, "angry": -1.0, "fear": -1.0, "surprise": 0.0, "disgust": -1.0}
+
+NEGATORS = {
+    "not", "no", "never", "nothing", "nobody", "neither", "nor", "without", "hardly", "barely",
+    "dont", "don't", "doesnt", "doesn't", "didnt", "didn't", "isnt", "isn't", "wasnt", "wasn't", "arent",
+    "aren't", "cant", "can't", "cannot", "wont", "won't", "aint", "ain't",
+}
+INTENSIFIERS = {
+    "very": 1.5, "really": 1.5, "so": 1.5, "extremely": 2.0, "super": 1.5, "too": 1.3, "totally": 1.5,
+    "incredibly": 2.0, "absolutely": 1.8, "completely": 1.5, "deeply": 1.8, "truly": 1.5, "terribly": 1.8,
+    "slightly": 0.5, "somewhat": 0.6, "kinda": 0.6, "kind of": 0.6, "a bit": 0.6, "little": 0.7,
+}
+# Tokens a negation reaches forward ("not very happy" still negates "happy")
+NEGATION_WINDOW = 3
+# Words that end a negation's scope early
+_SCOPE_BREAKERS = {"but", "however", "although", "though", "yet"}
+
+# Emoticons and emoji mapped to lexicon words before tokenising
+_EMOJI = {
+    ":)": " happy ", ":-)": " happy ", ":d": " happy ", "😊": " happy ", "😀": " happy ", "😂": " laugh ",
+    "❤️": " love ", "🎉": " celebrate ", ":(": " sad ", ":-(": " sad ", "😢": " cry ", "😭": " cry ",
+    "😡": " angry ", "😠": " angry ", "😨": " scared ", "😱": " shocked ", "🤢": " disgusted ", "😮": " wow ",
+}
+_TOKEN = re.compile(r"[a-z']+")
+
+# Negated emotion -> what it signals instead: "not happy" leans sad, "not scared"
+# or "not angry" just removes the emotion (rows/cols follow EMOTIONS)
+_NEGATED_EMOTION = {"happy": {"sad": 0.5}}
+# Sentiment cutoffs on the summed polarity
+_SENTIMENT_MARGIN = 0.3
+# An emotion needs at least this much evidence, else "neutral"
+_MIN_EMOTION_SCORE = 0.5
+
+
+class LexiconEmotionDetector:
+    """
+    Lexicon + rules emotion and sentiment scorer with no network or model file.
+
+    Texts are tokenised in Python; scoring is a scatter-add of per-token
+    emotion and polarity rows into one (texts x emotions) matrix, so a batch
+    costs about the same number of NumPy calls as a single text.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("numpy is required for LexiconEmotionDetector")
+        vocab = {}
+        for emotion, words in EMOTION_WORDS.items():
+            for word in words:
+                vocab.setdefault(word, len(vocab))
+        for words in POLARITY_WORDS.values():
+            for word in words:
+                vocab.setdefault(word, len(vocab))
+        self.vocab = vocab
+        # Phrases ("fed up", "kind of") are matched as joined bigrams
+        self.phrases = {w for w in list(vocab) + list(INTENSIFIERS) + list(NEGATORS) if " " in w}
+
+        n_emotions = len(EMOTIONS)
+        self.emotion_matrix = np.zeros((len(vocab), n_emotions), dtype=np.float32)
+        self.polarity = np.zeros(len(vocab), dtype=np.float32)
+        for emotion, words in EMOTION_WORDS.items():
+            col = EMOTIONS.index(emotion)
+            for word in words:
+                self.emotion_matrix[vocab[word], col] = 1.0
+                self.polarity[vocab[word]] = EMOTION_POLARITY[emotion]
+        for value, words in POLARITY_WORDS.items():
+            for word in words:
+                self.polarity[vocab[word]] = value
+
+        # A negated token contributes emotion_row @ negation_transfer
+        self.negation_transfer = np.zeros((n_emotions, n_emotions), dtype=np.float32)
+        for source, targets in _NEGATED_EMOTION.items():
+            for target, weight in targets.items():
+                self.negation_transfer[EMOTIONS.index(source), EMOTIONS.index(target)] = weight
+
+    def _tokens(self, text: str):
+        text = text.lower()
+        for emoji, word in _EMOJI.items():
+            if emoji in text:
+                text = text.replace(emoji, word)
+        words = _TOKEN.findall(text)
+        i = 0
+        while i < len(words):
+            if i + 1 < len(words) and f"{words[i]} {words[i + 1]}" in self.phrases:
+                yield f"{words[i]} {words[i + 1]}"
+                i += 2
+            else:
+                yield words[i]
+                i += 1
+
+    def _hits(self, text: str):
+        """(vocab index, weight, negated) for every lexicon word, after applying the rules."""
+        hits = []
+        negate_left = 0
+        boost = 1.0
+        for token in self._tokens(text):
+            if token in NEGATORS or token.endswith("n't"):
+                negate_left = NEGATION_WINDOW
+                continue
+            if token in INTENSIFIERS:
+                boost *= INTENSIFIERS[token]
+                continue
+            if token in _SCOPE_BREAKERS:
+                negate_left = 0
+                boost = 1.0
+                continue
+            index = self.vocab.get(token)
+            if index is not None:
+                hits.append((index, boost, negate_left > 0))
+                negate_left = 0
+            elif negate_left:
+                negate_left -= 1
+            boost = 1.0
+        return hits
+
+    def score_batch(self, texts):
+        """
+        Raw scores for a list of texts: (emotion_scores [n x len(EMOTIONS)],
+        polarity [n]). Negated words flip polarity at half strength.
+        """
+        docs, indices, weights, negated = [], [], [], []
+        for row, text in enumerate(texts):
+            for index, weight, neg in self._hits(text or ""):
+                docs.append(row)
+                indices.append(index)
+                weights.append(weight)
+                negated.append(neg)
+
+        n = len(texts)
+        emotion_scores = np.zeros((n, len(EMOTIONS)), dtype=np.float32)
+        polarity = np.zeros(n, dtype=np.float32)
+        if not docs:
+            return emotion_scores, polarity
+
+        docs = np.asarray(docs, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float32)
+        negated = np.asarray(negated, dtype=bool)
+
+        rows = self.emotion_matrix[indices]
+        rows[negated] = rows[negated] @ self.negation_transfer
+        np.add.at(emotion_scores, docs, rows * weights[:, None])
+        signs = np.where(negated, -0.5, 1.0).astype(np.float32)
+        np.add.at(polarity, docs, self.polarity[indices] * weights * signs)
+        return emotion_scores, polarity
+
+    def predict_batch(self, texts):
+        """[(result, confidence)] per text, result shaped like detect_emotion's {"emotion", "sentiment"}."""
+        emotion_scores, polarity = self.score_batch(texts)
+        if not len(texts):
+            return []
+
+        order = np.argsort(-emotion_scores, axis=1)
+        rows = np.arange(len(texts))
+        top = emotion_scores[rows, order[:, 0]]
+        second = emotion_scores[rows, order[:, 1]]
+        has_emotion = top >= _MIN_EMOTION_SCORE
+        # Confidence: how clearly the top emotion beats the runner-up, damped for thin evidence
+        confidence = np.where(has_emotion, (top - second) / (top + 1.0), 0.0)
+
+        results = []
+        for i in range(len(texts)):
+            emotion = EMOTIONS[order[i, 0]] if has_emotion[i] else "neutral"
+            if polarity[i] > _SENTIMENT_MARGIN:
+                sentiment = "positive"
+            elif polarity[i] < -_SENTIMENT_MARGIN:
+                sentiment = "negative"
+            else:
+                sentiment = "neutral"
+            results.append(({"emotion": emotion, "sentiment": sentiment}, float(confidence[i])))
+        return results
+
+    def predict(self, text: str):
+        return self.predict_batch([text])[0]
+
+    def detect_batch(self, texts):
+        """{"emotion", "sentiment"} for each text."""
+        return [result for result, _ in self.predict_batch(texts)]
+
+    def detect(self, text: str) -> dict:
+        return self.predict(text)[0]
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_lexicon_emotion_detector():
+    """Process-wide detector, or None when numpy is missing."""
+    global _detector
+    if np is None:
+        return None
+    with _detector_lock:
+        if _detector is None:
+            _detector = LexiconEmotionDetector()
+        return _detector
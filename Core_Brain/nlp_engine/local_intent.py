@@ -0,0 +1,127 @@
+# CPU-only intent classifier: hashed n-gram features + multinomial logistic regression
+import logging
+import os
+import threading
+
+from .features import np, hash_features, sparse_features, N_FEATURES
+from .config import LOCAL_INTENT_MODEL
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix multiply, keeps the dense feature block small
+_BATCH_ROWS = 512
+
+
+class LocalIntentClassifier:
+    """
+    Linear softmax model over hashed n-grams, stored as plain NumPy arrays.
+
+    predict() takes microseconds on CPU; NLPEngine uses it first and only asks
+    the LLM when the top probability is below its confidence threshold.
+    """
+
+    def __init__(self, labels, weights=None, bias=None, n_features=N_FEATURES):
+        if np is None:
+            raise ImportError("numpy is required for LocalIntentClassifier")
+        self.labels = list(labels)
+        self.n_features = n_features
+        self.weights = weights if weights is not None else np.zeros((n_features, len(self.labels)), dtype=np.float32)
+        self.bias = bias if bias is not None else np.zeros(len(self.labels), dtype=np.float32)
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts):
+        """(len(texts), len(labels)) matrix of class probabilities."""
+        out = []
+        for start in range(0, len(texts), _BATCH_ROWS):
+            X = hash_features(texts[start:start + _BATCH_ROWS], self.n_features)
+            out.append(self._softmax(X @ self.weights + self.bias))
+        if not out:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        return np.vstack(out)
+
+    def predict(self, text: str):
+        """Return (label, confidence) for one text."""
+        indices, values = sparse_features(text, self.n_features)
+        proba = self._softmax((values @ self.weights[indices] + self.bias)[None, :])[0]
+        best = int(proba.argmax())
+        return self.labels[best], float(proba[best])
+
+    def predict_batch(self, texts):
+        proba = self.predict_proba(list(texts))
+        best = proba.argmax(axis=1)
+        return [(self.labels[i], float(proba[row, i])) for row, i in enumerate(best)]
+
+    def fit(self, texts, labels, epochs=200, learning_rate=0.1, l2=1e-4):
+        """Train with full-batch Adam on the softmax cross-entropy loss."""
+        index = {label: i for i, label in enumerate(self.labels)}
+        y = np.array([index[label] for label in labels])
+        X = hash_features(list(texts), self.n_features)
+        Y = np.eye(len(self.labels), dtype=np.float32)[y]
+        n = len(y)
+
+        params = [self.weights, self.bias]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+
+        for step in range(1, epochs + 1):
+            grad = (self._softmax(X @ self.weights + self.bias) - Y) / n
+            grads = [X.T @ grad + l2 * self.weights, grad.sum(axis=0)]
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                p -= learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+        return self
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(
+            path, weights=self.weights, bias=self.bias,
+            labels=np.array(self.labels), n_features=np.array(self.n_features)
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(
+            labels=[str(label) for label in data["labels"]],
+            weights=data["weights"].astype(np.float32),
+            bias=data["bias"].astype(np.float32),
+            n_features=int(data["n_features"])
+        )
+
+
+_classifier = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def get_local_intent_classifier():
+    """
+    The process-wide classifier loaded from ECHO_INTENT_MODEL, or None when
+    numpy is missing or no model has been trained (see scripts/train_intent_classifier.py).
+    """
+    global _classifier, _classifier_loaded
+    with _classifier_lock:
+        if not _classifier_loaded:
+            _classifier_loaded = True
+            if np is None:
+                logger.info("numpy not installed, local intent classifier disabled")
+            elif not os.path.exists(LOCAL_INTENT_MODEL):
+                logger.info(f"No local intent model at {LOCAL_INTENT_MODEL}, using the LLM only")
+            else:
+                try:
+                    _classifier = LocalIntentClassifier.load(LOCAL_INTENT_MODEL)
+                    logger.info(f"Loaded local intent classifier from {LOCAL_INTENT_MODEL}")
+                except Exception as e:
+                    logger.error(f"Failed to load local intent classifier: {e}")
+        return _classifier
@@ -1,11 +1,9 @@
 # NLP, intent detection, emotion sense
-import sys
 import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import json
 import time
-from functools import lru_cache
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import logging
 try:
     from dotenv import load_dotenv
@@ -13,88 +11,316 @@ try:
 except ImportError:
     # dotenv not available, continue without it
     pass
+from .config import (
+    VALID_INTENTS, VALID_EMOTIONS, VALID_SENTIMENTS, FUSED_ANALYSIS, CONCURRENT_CLASSIFICATION, CLASSIFY_WORKERS, CLASSIFY_TIMEOUT,
+    LOCAL_INTENT, LOCAL_INTENT_THRESHOLD, EMOTION_MODE, LOCAL_EMOTION_THRESHOLD, SEMANTIC_CACHE,
+    CLASSIFY_CACHE, BATCH_MAX_ITEMS, BATCH_RETRY_ROUNDS, BATCH_CONCURRENCY
+)
+from .http_client import get_http_client, prewarm
+from .resilience import RetryPolicy, RETRYABLE_STATUSES, get_circuit_breaker, retry_after_seconds
+from .classification_cache import get_classification_cache
+from .completion_cache import get_completion_cache, payload_key, REPLAY_MISS_ERROR
+from . import batch
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+CIRCUIT_OPEN_ERROR = "[Groq Error]: Upstream unavailable (circuit open)"
+DEADLINE_ERROR = "[Groq Error]: Deadline exceeded"
+# Don't start an attempt with less budget than this left
+MIN_ATTEMPT_SECONDS = 0.5
+
+_classify_executor = None
+_classify_executor_lock = threading.Lock()
+
+
+def _get_classify_executor():
+    """Process-wide bounded pool used to run intent and emotion detection concurrently."""
+    global _classify_executor
+    with _classify_executor_lock:
+        if _classify_executor is None:
+            _classify_executor = ThreadPoolExecutor(
+                max_workers=max(2, CLASSIFY_WORKERS), thread_name_prefix="nlp-classify"
+            )
+        return _classify_executor
 
 
 class NLPEngine:
-    def __init__(self, model_name="llama3-8b-8192"):
+    def __init__(self, model_name="llama3-8b-8192", fused_analysis=None, concurrent_classification=None,
+                 classify_timeout=None, local_intent=None, local_intent_threshold=None,
+                 emotion_mode=None, local_emotion_threshold=None, semantic_cache=None, classify_cache=None):
         self.model_name = model_name
+        # Opt-in single-completion analysis, see analyze_fused()
+        self.fused_analysis = FUSED_ANALYSIS if fused_analysis is None else fused_analysis
+        self.concurrent_classification = (
+            CONCURRENT_CLASSIFICATION if concurrent_classification is None else concurrent_classification
+        )
+        self.classify_timeout = CLASSIFY_TIMEOUT if classify_timeout is None else classify_timeout
+        # On-box intent model in front of the LLM, see _local_intent()
+        self.local_intent = LOCAL_INTENT if local_intent is None else local_intent
+        self.local_intent_threshold = (
+            LOCAL_INTENT_THRESHOLD if local_intent_threshold is None else local_intent_threshold
+        )
+        # "llm", "local" or "prefilter", see _local_emotion()
+        self.emotion_mode = EMOTION_MODE if emotion_mode is None else emotion_mode
+        self.local_emotion_threshold = (
+            LOCAL_EMOTION_THRESHOLD if local_emotion_threshold is None else local_emotion_threshold
+        )
+        # Opt-in near-duplicate cache shared by every engine, see _semantic_lookup()
+        self.semantic_cache = SEMANTIC_CACHE if semantic_cache is None else semantic_cache
+        # LLM intent / emotion results shared across engines, see _cached_label()
+        self.classify_cache = CLASSIFY_CACHE if classify_cache is None else classify_cache
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
         
         # Groq API setup for cloud deployment
-        self.api_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.api_url = GROQ_API_URL
         self.headers = {
             "Authorization": f"Bearer {GROQ_API_KEY}",
             "Content-Type": "application/json"
         }
+        # Keep-alive pool shared by every engine in the process
+        self.http = get_http_client()
+        # Backoff for this engine's calls; the breaker is shared by every engine talking to Groq
+        self.retry_policy = RetryPolicy()
+        self.breaker = get_circuit_breaker("groq")
 
-        
+    def warm_connections(self, connections=None, background=True):
+        """Pre-open pooled connections to the Groq API so the first call skips TCP/TLS setup."""
+        if connections is None:
+            return prewarm(self.api_url, background=background)
+        return prewarm(self.api_url, connections, background=background)
 
-    def call_groq_model(self, messages, max_tokens=200, temperature=0.7):
-        """Call Groq API - cloud-ready replacement for HF"""
-        payload = {
+    def _payload(self, messages, max_tokens, temperature, stream=False):
+        return {
             "model": self.model_name,
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
             "top_p": 1,
-            "stream": False
+            "stream": stream
         }
+
+    def _read_completion(self, response, attempt):
+        """
+        Check one completion response.
+
+        Returns (text, retryable, retry_after): text is None when the attempt
+        failed, retryable says whether trying again can help and retry_after is
+        the server's requested wait in seconds, if it sent one.
+        """
+        if response.status_code == 429:  # Rate limit
+            retry_after = retry_after_seconds(response.headers)
+            self.logger.warning(f"[Attempt {attempt+1}] Rate limit hit, retry after {retry_after}s")
+            return None, True, retry_after
+
+        if response.status_code != 200:
+            self.logger.warning(f"[Attempt {attempt+1}] HTTP {response.status_code}: {response.text}")
+            retryable = response.status_code in RETRYABLE_STATUSES
+            return None, retryable, retry_after_seconds(response.headers) if retryable else None
+
+        if not response.content:
+            self.logger.warning(f"[Attempt {attempt+1}] Empty response from model.")
+            return None, True, None
+
+        try:
+            result = response.json()
+            if "choices" in result and len(result["choices"]) > 0:
+                return result["choices"][0]["message"]["content"].strip(), False, None
+            self.logger.warning(f"[Attempt {attempt+1}] Invalid response structure: {result}")
+        except Exception as e:
+            self.logger.error(f"[Attempt {attempt+1}] JSON parsing error: {e}")
+        return None, True, None
+
+    def _record_outcome(self, ok, retryable):
+        # Non-retryable answers (bad request, bad key) still prove the upstream is reachable
+        if ok or not retryable:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def upstream_status(self):
+        """Circuit breaker state for the Groq upstream."""
+        return self.breaker.snapshot()
+
+    def cache_stats(self):
+        """Hit / miss counters of the shared classification and semantic caches."""
+        stats = {"classification": get_classification_cache().stats()}
+        semantic = self._semantic_cache()
+        if semantic is not None:
+            stats["semantic"] = semantic.stats()
+        return stats
+
+    def _cached_completion(self, payload):
+        """
+        (cache key, stored text) for a payload under ECHO_COMPLETION_CACHE. The
+        text is None on a miss, or REPLAY_MISS_ERROR when replay mode forbids calling Groq.
+        """
+        cache = get_completion_cache()
+        if cache is None:
+            return None, None
+        key = payload_key(payload)
+        if cache.reads_enabled:
+            try:
+                text = cache.get(key)
+            except Exception as e:
+                self.logger.error(f"Completion cache read failed: {e}")
+                text = None
+            if text is not None:
+                return key, text
+        if cache.mode == "replay":
+            self.logger.warning("Completion not recorded, replay mode skips Groq call")
+            return key, REPLAY_MISS_ERROR
+        return key, None
+
+    def _store_completion(self, key, text):
+        cache = get_completion_cache()
+        if key is None or cache is None or not cache.writes_enabled:
+            return
+        try:
+            cache.put(key, self.model_name, text)
+        except Exception as e:
+            self.logger.error(f"Completion cache write failed: {e}")
+
+    def _attempt_timeout(self, deadline):
+        """Per-attempt timeout, or None when the request budget can't fit another attempt."""
+        if deadline is None:
+            return self.retry_policy.timeout
+        if deadline.expired(margin=MIN_ATTEMPT_SECONDS):
+            return None
+        return deadline.timeout(self.retry_policy.timeout)
+
+    def _retry_delay(self, attempt, started, retry_after, deadline):
+        """Backoff before the next attempt, or None to give up (policy or request budget exhausted)."""
+        delay = self.retry_policy.next_delay(attempt, started, retry_after)
+        if delay is None:
+            return None
+        if deadline is not None and not deadline.has(delay + MIN_ATTEMPT_SECONDS):
+            return None
+        return delay
+
+    def call_groq_model(self, messages, max_tokens=200, temperature=0.7, deadline=None):
+        """Call Groq API - cloud-ready replacement for HF"""
+        payload = self._payload(messages, max_tokens, temperature)
+        cache_key, cached = self._cached_completion(payload)
+        if cached is not None:
+            return cached
+        started = time.monotonic()
         
-        for attempt in range(3):
+        for attempt in range(self.retry_policy.max_attempts):
+            timeout = self._attempt_timeout(deadline)
+            if timeout is None:
+                self.logger.warning(f"[Attempt {attempt+1}] Request deadline reached, skipping Groq call")
+                return DEADLINE_ERROR
+
+            # Fail fast with the usual fallback values while the upstream is unhealthy
+            if not self.breaker.allow_request():
+                self.logger.warning("Groq circuit open, skipping call")
+                return CIRCUIT_OPEN_ERROR
+
             try:
-                response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=30)
-                
-                if not response.content:
-                    self.logger.warning(f"[Attempt {attempt+1}] Empty response from model.")
-                    if attempt < 2:  # Don't sleep on last attempt
-                        time.sleep(3)
-                    continue
-
-                if response.status_code == 429:  # Rate limit
-                    self.logger.warning(f"[Attempt {attempt+1}] Rate limit hit, waiting...")
-                    if attempt < 2:  # Don't sleep on last attempt
-                        time.sleep(5)
-                    continue
-
-                if response.status_code != 200:
-                    self.logger.warning(f"[Attempt {attempt+1}] HTTP {response.status_code}: {response.text}")
-                    if attempt < 2:  # Don't sleep on last attempt
-                        time.sleep(3)
-                    continue
-
-                try:
-                    result = response.json()
-                    if "choices" in result and len(result["choices"]) > 0:
-                        return result["choices"][0]["message"]["content"].strip()
+                response = self.http.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+                text, retryable, retry_after = self._read_completion(response, attempt)
+            except Exception as e:
+                self.logger.error(f"[Attempt {attempt+1}] Request Error: {e}")
+                text, retryable, retry_after = None, True, None
+
+            self._record_outcome(text is not None, retryable)
+            if text is not None:
+                self._store_completion(cache_key, text)
+                return text
+            if not retryable:
+                break
+
+            delay = self._retry_delay(attempt, started, retry_after, deadline)
+            if delay is None:
+                break
+            time.sleep(delay)
+
+        return f"[Groq Error]: Failed after {attempt+1} attempts"
+
+
+    def call_groq_model_stream(self, messages, max_tokens=200, temperature=0.7, deadline=None):
+        """
+        Streaming variant of call_groq_model: yields reply text deltas as they arrive.
+
+        Attempts are retried only until the first token; once text has been
+        yielded a broken stream just ends. Yields the same "[Groq Error]" string
+        as call_groq_model when every attempt fails before any output.
+        """
+        payload = self._payload(messages, max_tokens, temperature, stream=True)
+        started = time.monotonic()
+
+        for attempt in range(self.retry_policy.max_attempts):
+            timeout = self._attempt_timeout(deadline)
+            if timeout is None:
+                self.logger.warning(f"[Attempt {attempt+1}] Request deadline reached, skipping Groq call")
+                yield DEADLINE_ERROR
+                return
+
+            if not self.breaker.allow_request():
+                self.logger.warning("Groq circuit open, skipping call")
+                yield CIRCUIT_OPEN_ERROR
+                return
+
+            emitted = False
+            retryable, retry_after = True, None
+            try:
+                with self.http.stream_post(self.api_url, headers=self.headers, json=payload, timeout=timeout) as response:
+                    if response.status_code != 200:
+                        retryable = response.status_code in RETRYABLE_STATUSES
+                        retry_after = retry_after_seconds(response.headers) if retryable else None
+                        self.logger.warning(f"[Attempt {attempt+1}] HTTP {response.status_code}: {response.read_text()}")
                     else:
-                        self.logger.warning(f"[Attempt {attempt+1}] Invalid response structure: {result}")
-                        if attempt < 2:
-                            time.sleep(3)
-                        continue
-                
-                except Exception as e:
-                    self.logger.error(f"[Attempt {attempt+1}] JSON parsing error: {e}")
-                    if attempt < 2:
-                        time.sleep(3)
-                    continue
+                        for line in response.iter_lines():
+                            delta, done = self._parse_stream_line(line, attempt)
+                            if done:
+                                break
+                            if delta:
+                                if not emitted:
+                                    self.breaker.record_success()
+                                emitted = True
+                                yield delta
+                        if not emitted:
+                            self.logger.warning(f"[Attempt {attempt+1}] Empty streamed response from model.")
 
             except Exception as e:
-                self.logger.error(f"[Attempt {attempt+1}] Request Error: {e}")
-                if attempt < 2:
-                    time.sleep(3)
+                self.logger.error(f"[Attempt {attempt+1}] Stream Error: {e}")
+
+            if emitted:
+                return
+            self._record_outcome(False, retryable)
+            if not retryable:
+                break
 
-        return "[Groq Error]: Failed after 3 attempts"
+            delay = self._retry_delay(attempt, started, retry_after, deadline)
+            if delay is None:
+                break
+            time.sleep(delay)
+
+        yield f"[Groq Error]: Failed after {attempt+1} attempts"
+
+
+    def _parse_stream_line(self, line, attempt):
+        """Server-sent events: "data: {...}" lines, terminated by "data: [DONE]". Returns (delta, done)."""
+        if not line or not line.startswith("data:"):
+            return None, False
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return None, True
+        try:
+            chunk = json.loads(data)
+            return chunk["choices"][0].get("delta", {}).get("content"), False
+        except (json.JSONDecodeError, KeyError, IndexError, AttributeError) as e:
+            self.logger.warning(f"[Attempt {attempt+1}] Bad stream chunk: {e}")
+            return None, False
 
 
-    @lru_cache(maxsize=128)
     def detect_intent_cached(self, user_input: str) -> str:
+        """Kept for callers of the old lru_cache wrapper; detect_intent is cached itself now."""
         return self.detect_intent(user_input)
 
 
-    def detect_intent(self, user_input: str) -> str:
-        messages = [
+    def _intent_messages(self, user_input: str) -> list:
+        return [
             {
                 "role": "system",
                 "content": "You are an intent detector. Respond with one word only: 'greeting', 'question', 'request', 'get_weather', 'emotional_support', 'manipulation_check', or 'unknown'."
@@ -104,14 +330,88 @@ class NLPEngine:
                 "content": user_input
             }
         ]
-        
-        result = self.call_groq_model(messages, max_tokens=10).lower().strip()
-        valid_intents = ["greeting", "question", "request", "get_weather", "emotional_support", "manipulation_check", "unknown"]
-        return result if result in valid_intents else "unknown"
 
+    @staticmethod
+    def _parse_intent(result: str) -> str:
+        result = result.lower().strip()
+        return result if result in VALID_INTENTS else "unknown"
+
+    def _local_intent(self, user_input: str):
+        """Local classifier's label when it is confident enough, else None (ask the LLM)."""
+        if not self.local_intent:
+            return None
+        # Local models (and numpy) are imported on first use, not at startup
+        from .local_intent import get_local_intent_classifier
+        classifier = get_local_intent_classifier()
+        if classifier is None:
+            return None
+        try:
+            label, confidence = classifier.predict(user_input)
+        except Exception as e:
+            self.logger.error(f"Local intent classifier failed: {e}")
+            return None
+        if confidence >= self.local_intent_threshold and label in VALID_INTENTS:
+            return label
+        return None
+
+    def _local_intent_batch(self, texts) -> list:
+        """_local_intent for many texts in one vectorized classifier pass."""
+        if not self.local_intent or not texts:
+            return [None] * len(texts)
+        from .local_intent import get_local_intent_classifier
+        classifier = get_local_intent_classifier()
+        if classifier is None:
+            return [None] * len(texts)
+        try:
+            predictions = classifier.predict_batch(texts)
+        except Exception as e:
+            self.logger.error(f"Local intent classifier failed: {e}")
+            return [None] * len(texts)
+        return [
+            label if confidence >= self.local_intent_threshold and label in VALID_INTENTS else None
+            for label, confidence in predictions
+        ]
+
+    def _cached_label(self, kind: str, user_input: str):
+        """Earlier LLM "intent" / "emotion" result for this text and model, or None."""
+        if not self.classify_cache:
+            return None
+        cache = get_classification_cache()
+        return cache.get(cache.key(kind, self.model_name, user_input))
+
+    def _remember_label(self, kind: str, user_input: str, value):
+        if self.classify_cache:
+            cache = get_classification_cache()
+            cache.set(cache.key(kind, self.model_name, user_input), value)
+
+    def _intent_result(self, user_input: str, result: str) -> str:
+        """Parse an intent reply, caching it only when the model gave a valid label (not an error fallback)."""
+        intent = self._parse_intent(result)
+        if intent == result.lower().strip():
+            self._remember_label("intent", user_input, intent)
+        return intent
+
+    def _emotion_result(self, user_input: str, result: str) -> dict:
+        emotion = self._parse_emotion_strict(result)
+        if emotion is None:
+            return {"emotion": "neutral", "sentiment": "neutral"}
+        self._remember_label("emotion", user_input, emotion)
+        return dict(emotion)
+
+    def detect_intent(self, user_input: str, deadline=None) -> str:
+        local = self._local_intent(user_input)
+        if local is not None:
+            return local
+        cached = self._cached_label("intent", user_input)
+        if cached is not None:
+            return cached
+
+        result = self.call_groq_model(self._intent_messages(user_input), max_tokens=10, deadline=deadline)
+        return self._intent_result(user_input, result)
 
-    def detect_emotion(self, user_input: str) -> dict:
-        messages = [
+
+    def _emotion_messages(self, user_input: str) -> list:
+        return [
             {
                 "role": "system", 
                 "content": "You are an emotion and sentiment detector. Reply ONLY with JSON like: {\"emotion\": \"sad\", \"sentiment\": \"negative\"}"
@@ -121,12 +421,15 @@ class NLPEngine:
                 "content": user_input
             }
         ]
-        
-        result = self.call_groq_model(messages, max_tokens=50)
-        
+
+    def _parse_emotion(self, result: str) -> dict:
+        return self._parse_emotion_strict(result) or {"emotion": "neutral", "sentiment": "neutral"}
+
+    def _parse_emotion_strict(self, result: str):
+        """The {"emotion", "sentiment"} in a detection reply, or None when it is an error or unparseable."""
         if result.startswith("[Groq Error]"):
             self.logger.warning(f"Groq API error in emotion detection: {result}")
-            return {"emotion": "neutral", "sentiment": "neutral"}
+            return None
 
         try:
             # Extract JSON from response
@@ -139,32 +442,156 @@ class NLPEngine:
                 # Validate required fields
                 if "emotion" in parsed_data and "sentiment" in parsed_data:
                     # Validate emotion and sentiment values
-                    valid_emotions = ["happy", "sad", "angry", "fear", "surprise", "disgust", "neutral"]
-                    valid_sentiments = ["positive", "negative", "neutral"]
-                    
                     emotion = parsed_data.get("emotion", "neutral")
                     sentiment = parsed_data.get("sentiment", "neutral")
                     
-                    if emotion not in valid_emotions:
+                    if emotion not in VALID_EMOTIONS:
                         emotion = "neutral"
-                    if sentiment not in valid_sentiments:
+                    if sentiment not in VALID_SENTIMENTS:
                         sentiment = "neutral"
                         
                     return {"emotion": emotion, "sentiment": sentiment}
                 else:
                     self.logger.warning(f"Missing required fields in emotion detection response: {parsed_data}")
-                    return {"emotion": "neutral", "sentiment": "neutral"}
+                    return None
             else:
                 self.logger.warning(f"No valid JSON found in emotion detection response: {result}")
-                return {"emotion": "neutral", "sentiment": "neutral"}
+                return None
             
         except json.JSONDecodeError as e:
             self.logger.error(f"[JSON Parsing Error]: {e}")
         except Exception as e:
             self.logger.error(f"[Unexpected Error in emotion detection]: {e}")
             
-        # Default fallback
-        return {"emotion": "neutral", "sentiment": "neutral"}
+        return None
+
+    def _local_emotion(self, user_input: str):
+        """
+        Lexicon detector's {"emotion", "sentiment"} when emotion_mode allows it
+        ("local" always, "prefilter" only when confident), else None (ask the LLM).
+        """
+        if self.emotion_mode not in ("local", "prefilter"):
+            return None
+        from .local_emotion import get_lexicon_emotion_detector
+        detector = get_lexicon_emotion_detector()
+        if detector is None:
+            return None
+        try:
+            result, confidence = detector.predict(user_input)
+        except Exception as e:
+            self.logger.error(f"Local emotion detector failed: {e}")
+            return None
+        if self.emotion_mode == "local" or confidence >= self.local_emotion_threshold:
+            return result
+        return None
+
+    def _local_emotion_batch(self, texts) -> list:
+        """_local_emotion for many texts in one vectorized lexicon pass."""
+        if self.emotion_mode not in ("local", "prefilter") or not texts:
+            return [None] * len(texts)
+        from .local_emotion import get_lexicon_emotion_detector
+        detector = get_lexicon_emotion_detector()
+        if detector is None:
+            return [None] * len(texts)
+        try:
+            predictions = detector.predict_batch(texts)
+        except Exception as e:
+            self.logger.error(f"Local emotion detector failed: {e}")
+            return [None] * len(texts)
+        return [
+            result if self.emotion_mode == "local" or confidence >= self.local_emotion_threshold else None
+            for result, confidence in predictions
+        ]
+
+    def detect_emotion(self, user_input: str, deadline=None) -> dict:
+        local = self._local_emotion(user_input)
+        if local is not None:
+            return local
+        cached = self._cached_label("emotion", user_input)
+        if cached is not None:
+            return dict(cached)
+
+        result = self.call_groq_model(self._emotion_messages(user_input), max_tokens=50, deadline=deadline)
+        return self._emotion_result(user_input, result)
+
+    def detect_intent_batch(self, texts, deadline=None) -> list:
+        """
+        detect_intent for many texts, packing numbered messages into as few
+        completions as the batch token budgets allow. Same order as texts.
+        """
+        return self._classify_batch("intent", texts, deadline=deadline)
+
+    def detect_emotion_batch(self, texts, deadline=None) -> list:
+        """detect_emotion for many texts, see detect_intent_batch()."""
+        return self._classify_batch("emotion", texts, deadline=deadline)
+
+    def _batch_prefill(self, kind: str, texts) -> list:
+        """Results the local models or the classification cache already have; None where the LLM is needed."""
+        local = self._local_intent_batch if kind == "intent" else self._local_emotion_batch
+        results = local(texts)
+        for i, result in enumerate(results):
+            if result is None:
+                results[i] = self._cached_label(kind, texts[i])
+        return results
+
+    def _batch_requests(self, kind: str, texts, pending, attempt: int) -> list:
+        """(chunk of indices, messages, max_tokens) per completion; retry rounds use smaller chunks."""
+        max_items = max(1, BATCH_MAX_ITEMS >> attempt)
+        requests = []
+        for chunk in batch.plan_chunks(kind, texts, pending, max_items=max_items):
+            messages = batch.batch_messages(kind, [texts[i] for i in chunk])
+            requests.append((chunk, messages, batch.max_tokens_for(kind, len(chunk))))
+        return requests
+
+    def _batch_collect(self, kind: str, texts, chunk, result: str, results: list) -> list:
+        """Store the labels a completion returned for its chunk; returns the indices it missed."""
+        labels = batch.parse_batch(kind, result, len(chunk))
+        missed = []
+        for number, index in enumerate(chunk, 1):
+            label = labels.get(number)
+            if label is None:
+                missed.append(index)
+            else:
+                results[index] = label
+                self._remember_label(kind, texts[index], label)
+        return missed
+
+    def _batch_finish(self, kind: str, results: list, pending) -> list:
+        if pending:
+            self.logger.warning(f"Batch {kind} detection gave up on {len(pending)} item(s), using fallbacks")
+        finished = []
+        for result in results:
+            if result is None:
+                result = batch.FALLBACKS[kind]
+            # Emotion results are dicts; hand out copies, never the cached objects
+            finished.append(dict(result) if isinstance(result, dict) else result)
+        return finished
+
+    def _classify_batch(self, kind: str, texts, deadline=None) -> list:
+        texts = list(texts)
+        results = self._batch_prefill(kind, texts)
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        for attempt in range(1 + BATCH_RETRY_ROUNDS):
+            if not pending:
+                break
+            requests = self._batch_requests(kind, texts, pending, attempt)
+
+            def run(request):
+                _, messages, max_tokens = request
+                return self.call_groq_model(messages, max_tokens=max_tokens, temperature=0.2, deadline=deadline)
+
+            # A private pool, so batches never queue behind (or block) the shared classification pool
+            with ThreadPoolExecutor(max_workers=max(1, min(BATCH_CONCURRENCY, len(requests)))) as executor:
+                outputs = list(executor.map(run, requests))
+
+            pending = []
+            for (chunk, _, _), result in zip(requests, outputs):
+                pending.extend(self._batch_collect(kind, texts, chunk, result, results))
+            if pending:
+                self.logger.info(f"Batch {kind} round {attempt+1}: {len(pending)} item(s) to retry")
+
+        return self._batch_finish(kind, results, pending)
 
     # def generate_response(self,intent: str , emotion: str , user_input: str) -> str:
     #     system_prompt = (
@@ -174,44 +601,318 @@ class NLPEngine:
     #     return self._call_llm(system_prompt, user_input, max_tokens=300)
 
 
-    def analyze(self, user_input: str, memory_manager=None) -> dict:
-        context = ""
-        if memory_manager:
-            context = memory_manager.get_context_text()
+    def _detect_intent_and_emotion(self, user_input: str, deadline=None):
+        """Run detect_intent and detect_emotion, concurrently when enabled."""
+        if not self.concurrent_classification:
+            return self.detect_intent(user_input, deadline=deadline), self.detect_emotion(user_input, deadline=deadline)
 
-        intent = self.detect_intent(user_input)
-        emotion_data = self.detect_emotion(user_input)
-        sentiment = emotion_data.get("sentiment", "neutral") if emotion_data else "neutral"
-        text = user_input
+        from ..deadline import Deadline
 
+        # Both calls share one wait budget so the phase costs a single round trip.
+        # A future that is already running can't be cancelled, so the budget is
+        # handed to the calls themselves: their HTTP timeouts and retries stop at
+        # it, and a worker whose result we stopped waiting for is free again
+        # moments later instead of holding the shared pool.
+        wait = self.classify_timeout if deadline is None else deadline.timeout(self.classify_timeout)
+        budget = Deadline(wait)
+        executor = _get_classify_executor()
+        intent_future = executor.submit(self.detect_intent, user_input, budget)
+        emotion_future = executor.submit(self.detect_emotion, user_input, budget)
+
+        try:
+            intent = intent_future.result(timeout=budget.remaining())
+        except FutureTimeoutError:
+            self.logger.warning(f"Intent detection timed out after {wait:.1f}s")
+            intent = "unknown"
+        try:
+            emotion_data = emotion_future.result(timeout=budget.remaining())
+        except FutureTimeoutError:
+            self.logger.warning(f"Emotion detection timed out after {wait:.1f}s")
+            emotion_data = {"emotion": "neutral", "sentiment": "neutral"}
+
+        return intent, emotion_data
+
+
+    def _reply_messages(self, user_input: str, intent: str, emotion: str, sentiment: str, context: str = "") -> list:
         # Inject context into system prompt for better LLM reply
         system_prompt = (
             f"You are Echo, a helpful AI assistant.\n"
-            f"User's emotion: {emotion_data['emotion']}\n"
+            f"User's emotion: {emotion}\n"
             f"User's intent: {intent}\n"
             f"Sentiment: {sentiment}\n"
-            f"User said: {text}\n"
+            f"User said: {user_input}\n"
             "Reply as Echo with empathy and understanding (2-3 sentences):"
         )
 
         if context:
             system_prompt += f"\nHere is the recent conversation:\n{context}\nRespond appropriately."
 
-        # Generate the response using chat format
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_input}
         ]
-        
-        response = self.call_groq_model(messages, max_tokens=150, temperature=0.8)
-        
+
+
+    @staticmethod
+    def _extract_json_object(text: str):
+        """Return the outermost {...} object in a model reply, or None."""
+        start_idx = text.find('{')
+        end_idx = text.rfind('}') + 1
+        if start_idx == -1 or end_idx <= start_idx:
+            return None
+        try:
+            parsed = json.loads(text[start_idx:end_idx])
+        except json.JSONDecodeError:
+            return None
+        return parsed if isinstance(parsed, dict) else None
+
+
+    def _fused_messages(self, user_input: str, context: str = "", include_response: bool = True) -> list:
+        system_prompt = (
+            "You are Echo, a helpful AI assistant. Analyse the user's message"
+            + (" and reply to it.\n" if include_response else ".\n")
+            + f"intent must be one of: {', '.join(VALID_INTENTS)}\n"
+            f"emotion must be one of: {', '.join(VALID_EMOTIONS)}\n"
+            f"sentiment must be one of: {', '.join(VALID_SENTIMENTS)}\n"
+        )
+        if include_response:
+            system_prompt += (
+                "response is your reply as Echo, with empathy and understanding (2-3 sentences).\n"
+                "Reply ONLY with JSON like: "
+                "{\"intent\": \"emotional_support\", \"emotion\": \"sad\", \"sentiment\": \"negative\", \"response\": \"...\"}"
+            )
+        else:
+            system_prompt += (
+                "Reply ONLY with JSON like: "
+                "{\"intent\": \"emotional_support\", \"emotion\": \"sad\", \"sentiment\": \"negative\"}"
+            )
+
+        if include_response and context:
+            system_prompt += f"\nHere is the recent conversation:\n{context}\nRespond appropriately."
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_input}
+        ]
+
+    @staticmethod
+    def _fused_params(include_response: bool) -> dict:
+        if include_response:
+            return {"max_tokens": 250, "temperature": 0.7}
+        return {"max_tokens": 60, "temperature": 0.2}
+
+    def _parse_fused(self, result: str, include_response: bool = True):
+        if result.startswith("[Groq Error]"):
+            self.logger.warning(f"Groq API error in fused analysis: {result}")
+            return None
+
+        parsed_data = self._extract_json_object(result)
+        if parsed_data is None:
+            self.logger.warning(f"No valid JSON found in fused analysis response: {result}")
+            return None
+
+        intent = str(parsed_data.get("intent", "unknown")).lower().strip()
+        emotion = str(parsed_data.get("emotion", "neutral")).lower().strip()
+        sentiment = str(parsed_data.get("sentiment", "neutral")).lower().strip()
+
+        analysis = {
+            "intent": intent if intent in VALID_INTENTS else "unknown",
+            "emotion": emotion if emotion in VALID_EMOTIONS else "neutral",
+            "sentiment": sentiment if sentiment in VALID_SENTIMENTS else "neutral"
+        }
+
+        if include_response:
+            response = parsed_data.get("response")
+            if not isinstance(response, str) or not response.strip():
+                self.logger.warning(f"Missing response in fused analysis: {parsed_data}")
+                return None
+            analysis["response"] = response.strip()
+
+        return analysis
+
+    def analyze_fused(self, user_input: str, context: str = "", include_response: bool = True, deadline=None):
+        """
+        Get intent, emotion, sentiment and (optionally) the reply from one structured completion.
+
+        Returns None when the completion can't be parsed, so the caller can fall
+        back to the separate detect_intent / detect_emotion calls.
+        """
+        messages = self._fused_messages(user_input, context, include_response)
+        result = self.call_groq_model(messages, deadline=deadline, **self._fused_params(include_response))
+        return self._parse_fused(result, include_response)
+
+
+    def _semantic_cache(self):
+        """The shared semantic cache when enabled (imported on first use), else None."""
+        if not self.semantic_cache:
+            return None
+        from .semantic_cache import get_semantic_cache
+        return get_semantic_cache()
+
+    def _semantic_lookup(self, user_input: str):
+        """Cached analysis of a near-identical earlier message from this model, or None."""
+        cache = self._semantic_cache()
+        if cache is None:
+            return None
+        cached, similarity = cache.lookup(user_input)
+        if cached is None or cached["model"] != self.model_name:
+            return None
+        self.logger.debug(f"Semantic cache hit ({similarity:.2f}) for: {user_input[:50]}")
+        return cached
+
+    def _semantic_store(self, user_input: str, result: dict, context: str = ""):
+        """
+        Remember a fresh analysis. The reply is only kept when it was generated
+        without conversation context; error replies and all-fallback
+        classifications (what a failed upstream produces) are never cached.
+        """
+        cache = self._semantic_cache()
+        if cache is None:
+            return
+        response = result.get("response")
+        if response is not None and str(response).startswith("[Groq Error]"):
+            return
+        if (result["intent"], result["emotion"], result["sentiment"]) == ("unknown", "neutral", "neutral"):
+            return
+        cache.store(user_input, {
+            "model": self.model_name,
+            "intent": result["intent"],
+            "emotion": result["emotion"],
+            "sentiment": result["sentiment"],
+            "response": None if context else response,
+        })
+
+    @staticmethod
+    def _cached_reply(cached, context: str):
+        """Full analyze() result from a cache entry when its reply can be reused as is."""
+        if cached is None or context or cached["response"] is None:
+            return None
+        return {key: cached[key] for key in ("intent", "emotion", "sentiment", "response")}
+
+    def classify(self, user_input: str, memory_manager=None, fused=None, deadline=None) -> dict:
+        """
+        Intent, emotion, sentiment and conversation context without generating a reply.
+
+        Meant for callers (e.g. personalities) that generate their own styled reply
+        from the analysis. Does not write to memory.
+        """
+        context = ""
+        if memory_manager:
+            context = memory_manager.get_context_text()
+
+        cached = self._semantic_lookup(user_input)
+        if cached is not None:
+            analysis = {key: cached[key] for key in ("intent", "emotion", "sentiment")}
+            analysis["context"] = context
+            return analysis
+
+        use_fused = self.fused_analysis if fused is None else fused
+        analysis = self.analyze_fused(user_input, include_response=False, deadline=deadline) if use_fused else None
+
+        if analysis is None:
+            intent, emotion_data = self._detect_intent_and_emotion(user_input, deadline=deadline)
+            analysis = {
+                "intent": intent,
+                "emotion": emotion_data["emotion"],
+                "sentiment": emotion_data["sentiment"]
+            }
+
+        self._semantic_store(user_input, analysis, context)
+        analysis["context"] = context
+        return analysis
+
+
+    def analyze(self, user_input: str, memory_manager=None, fused=None, deadline=None) -> dict:
+        """
+        Classify the message and generate Echo's reply.
+
+        deadline (Core_Brain.deadline.Deadline) bounds every model call made
+        here; calls that no longer fit the budget return their fallbacks.
+        """
+        context = ""
+        if memory_manager:
+            context = memory_manager.get_context_text()
+
+        cached = self._semantic_lookup(user_input)
+        result = self._cached_reply(cached, context)
+
+        use_fused = self.fused_analysis if fused is None else fused
+        if result is None and cached is None and use_fused:
+            result = self.analyze_fused(user_input, context, deadline=deadline)
+
+        if result is None:
+            if cached is not None:
+                intent, emotion_data = cached["intent"], {"emotion": cached["emotion"], "sentiment": cached["sentiment"]}
+            else:
+                intent, emotion_data = self._detect_intent_and_emotion(user_input, deadline=deadline)
+
+            # Generate the response using chat format
+            messages = self._reply_messages(
+                user_input, intent, emotion_data["emotion"], emotion_data["sentiment"], context
+            )
+            response = self.call_groq_model(messages, max_tokens=150, temperature=0.8, deadline=deadline)
+
+            result = {
+                "intent": intent,
+                "emotion": emotion_data["emotion"],
+                "sentiment": emotion_data["sentiment"],
+                "response": response
+            }
+
+        if cached is None or (cached["response"] is None and not context):
+            self._semantic_store(user_input, result, context)
+
         # Save memory
         if memory_manager:
-            memory_manager.add_memory(user_input, response)
+            memory_manager.add_memory(user_input, result["response"])
 
-        return {
-            "intent": intent,
-            "emotion": emotion_data["emotion"],
-            "sentiment": emotion_data["sentiment"],
-            "response": response
-        }
+        return result
+
+    def analyze_stream(self, user_input: str, memory_manager=None, fused=None, deadline=None):
+        """
+        Like analyze(), but the reply is streamed: returns (result, deltas) where
+        result holds intent / emotion / sentiment straight away and deltas yields
+        the reply as the model produces it. Once deltas is exhausted the full
+        reply is in result["response"] and memory / the semantic cache are updated.
+        """
+        context = ""
+        if memory_manager:
+            context = memory_manager.get_context_text()
+
+        cached = self._semantic_lookup(user_input)
+        result = self._cached_reply(cached, context)
+
+        if result is None:
+            if cached is not None:
+                result = {key: cached[key] for key in ("intent", "emotion", "sentiment")}
+            else:
+                use_fused = self.fused_analysis if fused is None else fused
+                result = self.analyze_fused(user_input, include_response=False, deadline=deadline) if use_fused else None
+            if result is None:
+                intent, emotion_data = self._detect_intent_and_emotion(user_input, deadline=deadline)
+                result = {
+                    "intent": intent,
+                    "emotion": emotion_data["emotion"],
+                    "sentiment": emotion_data["sentiment"]
+                }
+
+        def deltas():
+            if "response" in result:
+                # Reused reply: nothing to generate
+                yield result["response"]
+            else:
+                messages = self._reply_messages(
+                    user_input, result["intent"], result["emotion"], result["sentiment"], context
+                )
+                parts = []
+                for delta in self.call_groq_model_stream(messages, max_tokens=150, temperature=0.8, deadline=deadline):
+                    parts.append(delta)
+                    yield delta
+                result["response"] = "".join(parts)
+
+            if cached is None or (cached["response"] is None and not context):
+                self._semantic_store(user_input, result, context)
+            if memory_manager:
+                memory_manager.add_memory(user_input, result["response"])
+
+        return result, deltas()
@@ -1,15 +1,14 @@
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'echo_backend'))
-
 from echo_backend.personalities.Suzi import Suzi
 from echo_backend.personalities.EchoPersonality import EchoPersonality
+from Core_Brain.nlp_engine.nlp_engine import NLPEngine
 
 class PersonalityRouter:
-    def __init__(self):
+    def __init__(self, nlp=None):
+        # One engine (and connection pool) for every personality
+        self.nlp = nlp or NLPEngine()
         self.personalities = {
-            "echo": EchoPersonality(),
-            "Suzi": Suzi(),
+            "echo": EchoPersonality(nlp=self.nlp),
+            "Suzi": Suzi(nlp=self.nlp),
             # "mentor": MentorPersonality(),
             # "therapist": TherapistPersonality(),
             # "coach": CoachPersonality()
@@ -24,13 +23,26 @@ class PersonalityRouter:
         else:
             raise ValueError(f"Personality '{personality_name}' not found.")
 
-    def get_response(self, user_input, memory):
+    def get_response(self, user_input, memory, analysis=None):
         try:
             if self.active in self.personalities:
-                return self.personalities[self.active].respond(user_input, memory)
+                return self.personalities[self.active].respond(user_input, memory, analysis=analysis)
             else:
                 # Fallback to echo personality if active personality not found
-                return self.personalities["echo"].respond(user_input, memory)
+                return self.personalities["echo"].respond(user_input, memory, analysis=analysis)
+        except Exception as e:
+            # Return a safe fallback response
+            return "I'm having trouble processing your request right now. Please try again."
+
+    def get_response_stream(self, user_input, memory, analysis=None):
+        """Like get_response(), but yields the reply incrementally."""
+        personality = self.personalities.get(self.active, self.personalities["echo"])
+        emitted = False
+        try:
+            for delta in personality.respond_stream(user_input, memory, analysis=analysis):
+                emitted = True
+                yield delta
         except Exception as e:
             # Return a safe fallback response
-            return "I'm having trouble processing your request right now. Please try again."
\ No newline at end of file
+            if not emitted:
+                yield "I'm having trouble processing your request right now. Please try again."
\ No newline at end of file
@@ -0,0 +1,197 @@
+# Retry policy and circuit breaker for upstream model calls
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .config import (
+    GROQ_MAX_ATTEMPTS, GROQ_TIMEOUT, GROQ_BACKOFF_BASE, GROQ_BACKOFF_MAX, GROQ_RETRY_BUDGET,
+    BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT
+)
+
+# Statuses worth retrying: throttling, timeouts and server-side failures
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value):
+    """Parse "7.66s", "2m59.56s", "120ms" or a bare number of seconds; None if unparseable."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value.replace(" ", ""):
+        return None
+    return sum(float(number) * _DURATION_SECONDS[unit] for number, unit in parts)
+
+
+def retry_after_seconds(headers):
+    """
+    Seconds the server asked us to wait, from Retry-After (seconds or HTTP date)
+    or the x-ratelimit-reset-* headers. None when no hint is present.
+    """
+    if not headers:
+        return None
+
+    retry_after = headers.get("retry-after") or headers.get("Retry-After")
+    if retry_after:
+        seconds = parse_duration(retry_after)
+        if seconds is not None:
+            return seconds
+        try:
+            when = parsedate_to_datetime(retry_after)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+
+    resets = [
+        parse_duration(headers.get(name))
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    resets = [seconds for seconds in resets if seconds is not None]
+    return max(resets) if resets else None
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, bounded by a total retry budget.
+
+    Server hints (Retry-After / rate-limit reset headers) replace the computed
+    backoff; if honouring one would blow the budget the call gives up instead
+    of hammering a provider that is already throttling us.
+    """
+
+    def __init__(self, max_attempts=GROQ_MAX_ATTEMPTS, timeout=GROQ_TIMEOUT, base_delay=GROQ_BACKOFF_BASE,
+                 max_delay=GROQ_BACKOFF_MAX, budget=GROQ_RETRY_BUDGET):
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def backoff(self, attempt):
+        """Full-jitter delay before retry number attempt+1."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def next_delay(self, attempt, started, retry_after=None):
+        """
+        Seconds to sleep before the next attempt, or None to stop retrying.
+
+        attempt is the zero-based attempt that just failed and started the
+        time.monotonic() value when the call began.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        elapsed = time.monotonic() - started
+        # Leave room for the next attempt itself to run
+        if elapsed + delay >= self.budget:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half-open circuit breaker.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail fast for recovery_timeout seconds; then a single probe is let through
+    and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, recovery_timeout=BREAKER_RECOVERY_TIMEOUT):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._rejected = 0
+        self._times_opened = 0
+
+    def allow_request(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def snapshot(self):
+        """Current state for health endpoints and dashboards."""
+        with self._lock:
+            retry_in = None
+            if self._state == self.OPEN:
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": retry_in,
+                "times_opened": self._times_opened,
+                "rejected_calls": self._rejected
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name="groq"):
+    """Process-wide breaker for one upstream, shared by every engine."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name)
+            _breakers[name] = breaker
+        return breaker
+
+
+def circuit_breaker_states():
+    """Snapshot of every breaker created in this process."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -0,0 +1,192 @@
+# Near-duplicate message cache: local hashed embeddings + an in-memory cosine index
+import re
+import threading
+import time
+import zlib
+
+from .features import np, normalize_text
+from .local_emotion import EMOTION_WORDS, POLARITY_WORDS, NEGATORS
+from .config import SEMANTIC_CACHE_SIZE, SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_THRESHOLD
+
+# Embedding width; hashed features folded into 2048 columns keep a full index
+# of 1024 entries at 8 MB
+EMBED_DIM = 2 ** 11
+
+_WORD = re.compile(r"[a-z']+")
+# Words that don't change what a message is about: function words, linking verbs
+# ("I feel sad" ~ "I am sad") and intensifiers ("so sad" ~ "sad"). Negators are
+# dropped too; whether a message is negated is the signature's job.
+_STOPWORDS = {
+    "a", "an", "the", "i", "i'm", "im", "me", "my", "mine", "myself", "you", "you're", "your", "we", "our", "us",
+    "it", "it's", "its", "this", "that", "these", "those", "am", "is", "are", "was", "were", "be", "been", "being",
+    "feel", "feels", "feeling", "felt", "get", "gets", "getting", "got", "so", "very", "really", "just", "quite",
+    "too", "pretty", "kinda", "kind", "of", "sort", "bit", "little", "lot", "much", "such", "and", "or", "but",
+    "to", "at", "in", "on", "for", "with", "by", "from", "as", "up", "out", "about", "like", "do", "does", "did",
+    "have", "has", "had", "having", "will", "would", "can", "could", "should", "may", "might", "must", "right", "now",
+}
+_SUFFIXES = ("ing", "ed", "es", "s", "ly")
+# Weight of a content word's character trigrams next to the word itself (1.0):
+# enough to pull inflections the suffix stripping misses together, little
+# enough that two messages sharing most letters but not words stay apart
+_TRIGRAM_WEIGHT = 0.25
+_AFFECT_WORDS = {w for words in EMOTION_WORDS.values() for w in words} | {
+    w for words in POLARITY_WORDS.values() for w in words
+}
+
+
+def _signature(key: str) -> int:
+    """
+    Hash of the message's emotion words and whether it is negated. "I had a long
+    day and I feel sad" vs "... happy", or "I'm happy" vs "I'm not happy", embed
+    close together; entries only match when their signatures are equal.
+    """
+    words = _WORD.findall(key)
+    affect = sorted(set(w for w in words if w in _AFFECT_WORDS))
+    negated = any(w in NEGATORS or w.endswith("n't") for w in words)
+    return zlib.crc32(f"{negated}|{' '.join(affect)}".encode("utf-8"))
+
+
+def _stem(word: str) -> str:
+    word = word.replace("'", "")
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def _content_words(key: str) -> list:
+    """Stemmed words left after stopwords and negators; every word when that leaves none ("how are you")."""
+    words = [w for w in _WORD.findall(key) if w not in NEGATORS]
+    return [_stem(w) for w in words if w not in _STOPWORDS] or [_stem(w) for w in words]
+
+
+def embed_message(key: str, dim: int = EMBED_DIM):
+    """
+    Unit-length bag of a message's content words (plus their character
+    trigrams), hashed into dim columns. Unlike features.hash_features, which
+    feeds the classifiers, function words and word order are left out:
+    "feeling so sad today" and "I am sad today" both reduce to "sad today".
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in _content_words(key):
+        vector[zlib.crc32(f"w:{word}".encode("utf-8")) % dim] += 1.0
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(f"c:{padded[i:i + 3]}".encode("utf-8")) % dim] += _TRIGRAM_WEIGHT
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Fixed-size matrix of unit-length embeddings; a lookup is one matrix-vector
+    product. Entries are evicted least-recently-used when full and ignored
+    (then overwritten) once older than ttl seconds.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, threshold=None, dim=EMBED_DIM):
+        if np is None:
+            raise ImportError("numpy is required for SemanticCache")
+        self.max_entries = SEMANTIC_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl = SEMANTIC_CACHE_TTL if ttl is None else ttl
+        self.threshold = SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.dim = dim
+
+        self._matrix = np.zeros((self.max_entries, dim), dtype=np.float32)
+        self._values = [None] * self.max_entries
+        self._keys = [None] * self.max_entries
+        self._signatures = np.zeros(self.max_entries, dtype=np.int64)
+        self._created = np.full(self.max_entries, -np.inf)
+        self._last_used = np.full(self.max_entries, -np.inf)
+        self._slots = {}  # normalized text -> slot
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _embed(self, key: str):
+        return embed_message(key, self.dim)
+
+    def _live(self, now):
+        return self._created > now - self.ttl
+
+    def lookup(self, text: str):
+        """(cached value, similarity) for the closest live entry above threshold, else (None, best similarity)."""
+        key = normalize_text(text)
+        vector = self._embed(key)
+        signature = _signature(key)
+        now = time.monotonic()
+        with self._lock:
+            scores = self._matrix @ vector
+            scores[~self._live(now) | (self._signatures != signature)] = -1.0
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity >= self.threshold and self._values[best] is not None:
+                self._last_used[best] = now
+                self.hits += 1
+                return self._values[best], similarity
+            self.misses += 1
+            return None, max(similarity, 0.0)
+
+    def store(self, text: str, value: dict):
+        key = normalize_text(text)
+        vector = self._embed(key)
+        now = time.monotonic()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                live = self._live(now)
+                if not live.all():
+                    # Reuse an expired or never-used slot first
+                    slot = int(np.argmin(np.where(live, np.inf, self._created)))
+                else:
+                    slot = int(np.argmin(self._last_used))
+                    self.evictions += 1
+                old_key = self._keys[slot]
+                if old_key is not None:
+                    self._slots.pop(old_key, None)
+                self._slots[key] = slot
+                self._keys[slot] = key
+            self._matrix[slot] = vector
+            self._signatures[slot] = _signature(key)
+            self._values[slot] = value
+            self._created[slot] = now
+            self._last_used[slot] = now
+
+    def clear(self):
+        with self._lock:
+            self._matrix[:] = 0.0
+            self._values = [None] * self.max_entries
+            self._keys = [None] * self.max_entries
+            self._created[:] = -np.inf
+            self._last_used[:] = -np.inf
+            self._slots.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": int(self._live(time.monotonic()).sum()),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": int(self._matrix.nbytes),
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache():
+    """Process-wide cache shared by every NLPEngine, or None when numpy is missing."""
+    global _cache
+    if np is None:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SemanticCache()
+        return _cache
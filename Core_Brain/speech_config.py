@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+
+def _env_flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Binary used to decode non-WAV audio in memory (audio.py).
+FFMPEG = os.getenv("ECHO_FFMPEG", "ffmpeg")
+
+# Speech-to-text engine (stt_backends.py): "whisper" (PyTorch), "faster-whisper"
+# (CTranslate2, int8 on CPU) or "worker" (the STT worker process). For
+# faster-whisper: a local converted model directory, the CTranslate2 compute
+# type, and CPU threads (0 lets CTranslate2 decide).
+STT_BACKEND = os.getenv("ECHO_STT_BACKEND", "whisper").strip().lower()
+STT_MODEL_PATH = os.getenv("ECHO_STT_MODEL_PATH") or None
+STT_COMPUTE_TYPE = os.getenv("ECHO_STT_COMPUTE_TYPE", "int8")
+STT_CPU_THREADS = int(os.getenv("ECHO_STT_CPU_THREADS", "0"))
+
+# Model tiering (stt_tiers.py): when SpeechToText / the worker get no explicit
+# model name, these Whisper sizes stay resident within STT_MEMORY_MB and each
+# clip goes to one of them by duration, queue depth and latency profile
+# (fast | balanced | accurate). Queue depth at which clips step down a tier,
+# and seconds of request budget below which the "fast" profile is forced.
+STT_TIERS = [tier.strip() for tier in os.getenv("ECHO_STT_TIERS", "tiny,base,small").split(",") if tier.strip()]
+STT_MEMORY_MB = float(os.getenv("ECHO_STT_MEMORY_MB", "2048"))
+STT_PRELOAD = _env_flag("ECHO_STT_PRELOAD", default=True)
+STT_PROFILE = os.getenv("ECHO_STT_PROFILE", "balanced").strip().lower()
+STT_PRESSURE_DEPTH = int(os.getenv("ECHO_STT_PRESSURE_DEPTH", "4"))
+STT_FAST_DEADLINE = float(os.getenv("ECHO_STT_FAST_DEADLINE", "8"))
+
+# Voice activity detection in front of Whisper (vad.py): trims leading and
+# trailing silence, shortens pauses longer than VAD_MAX_PAUSE_MS, and skips
+# the model entirely when nothing louder than VAD_FLOOR_DB (dBFS) is found.
+# Speech is padded by VAD_PAD_MS on each side; bursts shorter than
+# VAD_MIN_SPEECH_MS (clicks, pops) are ignored.
+VAD = _env_flag("ECHO_VAD", default=True)
+VAD_FLOOR_DB = float(os.getenv("ECHO_VAD_FLOOR_DB", "-45"))
+VAD_PAD_MS = int(os.getenv("ECHO_VAD_PAD_MS", "200"))
+VAD_MAX_PAUSE_MS = int(os.getenv("ECHO_VAD_MAX_PAUSE_MS", "600"))
+VAD_MIN_SPEECH_MS = int(os.getenv("ECHO_VAD_MIN_SPEECH_MS", "90"))
+
+
+def _default_worker_socket():
+    """Per-user private directory for the STT worker's socket."""
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "echo-stt", "stt.sock")
+    user = os.getuid() if hasattr(os, "getuid") else os.getenv("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"echo-stt-{user}", "stt.sock")
+
+
+# Dedicated STT inference worker (stt_worker.py): with ECHO_STT_WORKER on (same
+# as ECHO_STT_BACKEND=worker), SpeechToText sends decoded, VAD-trimmed samples to the worker process on
+# ECHO_STT_WORKER_SOCKET instead of loading Whisper itself. Worker side:
+# batches run at once, clips per batched decode, milliseconds a job waits for
+# batch mates, and queued jobs before new ones are rejected as busy.
+# Jobs travel pickled, so the socket lives in a directory only this user can
+# enter ($XDG_RUNTIME_DIR/echo-stt, else a per-user one under the temp dir)
+# and connections must present an authkey: ECHO_STT_WORKER_AUTHKEY, or one the
+# worker generates into <socket>.key (mode 0600) for clients to read.
+STT_WORKER = _env_flag("ECHO_STT_WORKER")
+STT_WORKER_SOCKET = os.getenv("ECHO_STT_WORKER_SOCKET") or _default_worker_socket()
+STT_WORKER_AUTHKEY = os.getenv("ECHO_STT_WORKER_AUTHKEY", "").encode() or None
+STT_WORKER_CONCURRENCY = int(os.getenv("ECHO_STT_WORKER_CONCURRENCY", "1"))
+STT_WORKER_MAX_BATCH = int(os.getenv("ECHO_STT_WORKER_MAX_BATCH", "8"))
+STT_WORKER_BATCH_WINDOW_MS = float(os.getenv("ECHO_STT_WORKER_BATCH_WINDOW_MS", "20"))
+STT_WORKER_QUEUE = int(os.getenv("ECHO_STT_WORKER_QUEUE", "64"))
+# Seconds a client waits for a transcription when the request has no deadline.
+STT_WORKER_TIMEOUT = float(os.getenv("ECHO_STT_WORKER_TIMEOUT", "60"))
+
+# Speech synthesis engine (tts_backends.py): "gtts" (Google, MP3, needs
+# network), "espeak" (espeak-ng run locally, WAV) or "pyttsx3" (the platform's
+# own engine). Voice is engine-specific (an espeak voice such as "en-us+f3", a
+# pyttsx3 voice id; empty picks one by language) and rate is words per minute
+# (0 keeps the engine default).
+TTS_BACKEND = os.getenv("ECHO_TTS_BACKEND", "gtts").strip().lower()
+TTS_VOICE = os.getenv("ECHO_TTS_VOICE", "")
+TTS_RATE = int(os.getenv("ECHO_TTS_RATE", "0"))
+ESPEAK = os.getenv("ECHO_ESPEAK", "espeak-ng")
+
+# Synthesized speech cache (tts_cache.py): audio keyed by a hash of the text,
+# language and TTS backend, kept in memory (TTS_CACHE_MEMORY_MB) and as files
+# in TTS_CACHE_DIR (TTS_CACHE_DISK_MB), least recently used first out. With
+# TTS_PREWARM on, the canned replies and error messages are synthesized in the
+# background at startup, plus one phrase per line of TTS_PREWARM_FILE.
+TTS_CACHE = _env_flag("ECHO_TTS_CACHE", default=True)
+TTS_CACHE_DIR = os.getenv("ECHO_TTS_CACHE_DIR", os.path.join("~", ".cache", "echo", "tts"))
+TTS_CACHE_MEMORY_MB = float(os.getenv("ECHO_TTS_CACHE_MEMORY_MB", "32"))
+TTS_CACHE_DISK_MB = float(os.getenv("ECHO_TTS_CACHE_DISK_MB", "256"))
+TTS_PREWARM = _env_flag("ECHO_TTS_PREWARM", default=True)
+TTS_PREWARM_FILE = os.getenv("ECHO_TTS_PREWARM_FILE") or None
+
+# Incremental synthesis (TextToSpeech.speak_stream): replies are spoken
+# sentence by sentence while they are generated, with up to TTS_PARALLEL
+# sentences synthesized at once (engines that aren't thread-safe use one).
+TTS_PARALLEL = int(os.getenv("ECHO_TTS_PARALLEL", "2"))
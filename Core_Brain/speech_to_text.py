@@ -1,49 +1,88 @@
 
 # speech_to_text.py - Cloud deployment ready
-import whisper
-from pydub import AudioSegment
+# whisper (and torch) and pydub are imported where they are used, so importing
+# this module stays cheap for processes that never transcribe
 import tempfile 
 import logging
 import io
 import base64
 
+from .audio import decode_audio, normalize_peak, segment_to_array
+from .speech_config import VAD
+from .stt_tiers import resolve_profile, profile_options
+from .vad import VoiceActivityDetector
+
+# Longest ffmpeg may take to decode one clip when no deadline is given
+DECODE_TIMEOUT = 30.0
+
 class SpeechToText:
-    def __init__(self, model_name="small", sample_rate=16000):
-        self.model = whisper.load_model(model_name)
+    def __init__(self, model_name=None, sample_rate=16000, vad=None, backend=None):
+        from .stt_backends import load_backend
+        # "whisper", "faster-whisper" or "worker" (ECHO_STT_BACKEND by default);
+        # with the worker the model lives in that process and this one only decodes and trims audio.
+        # Without model_name the tiered models (ECHO_STT_TIERS) are used, picked per clip.
+        self.backend = load_backend(backend, model_name)
+        self.model = getattr(self.backend, "model", None)
         self.sample_rate = sample_rate
+        use_vad = VAD if vad is None else vad
+        self.vad = VoiceActivityDetector(sample_rate) if use_vad else None
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
 
-    def process_audio_bytes(self, audio_bytes: bytes) -> str:
+    def _out_of_time(self, deadline, stage):
+        if deadline is not None and deadline.expired():
+            self.logger.warning(f"Request deadline reached, skipping {stage}")
+            return True
+        return False
+
+    def load_audio(self, source, deadline=None):
+        """Decode bytes or a file path to 16 kHz mono float32 samples in memory"""
+        timeout = DECODE_TIMEOUT if deadline is None else deadline.timeout(DECODE_TIMEOUT)
+        # Normalised after VAD, so quiet noise isn't boosted to full scale first
+        return decode_audio(source, sample_rate=self.sample_rate, normalize=False, timeout=timeout)
+
+    def preprocess(self, audio):
+        """Samples ready for Whisper: silence trimmed, peak normalised; None if there is no speech"""
+        if hasattr(audio, "get_array_of_samples"):
+            audio = segment_to_array(audio, self.sample_rate)
+        if self.vad is not None:
+            audio, info = self.vad.process(audio)
+            if not info["speech"]:
+                self.logger.info(f"No speech in {info['input_seconds']:.1f}s of audio, skipping transcription")
+                return None
+            self.logger.debug(
+                f"VAD kept {info['output_seconds']:.1f}s of {info['input_seconds']:.1f}s "
+                f"({info['speech_seconds']:.1f}s speech)"
+            )
+        return normalize_peak(audio)
+
+    def process_audio_bytes(self, audio_bytes: bytes, deadline=None, profile=None) -> str:
         """Process audio bytes directly (from web upload or API)"""
+        if self._out_of_time(deadline, "audio decoding"):
+            return ""
         try:
-            # Create temporary file from bytes
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-                temp_file.write(audio_bytes)
-                temp_file_path = temp_file.name
-            
-            # Process and transcribe
-            audio = self.process_audio(temp_file_path)
-            return self.transcribe(audio)
+            audio = self.load_audio(audio_bytes, deadline=deadline)
+            return self.transcribe(audio, deadline=deadline, profile=profile)
             
         except Exception as e:
             self.logger.error(f"Error processing audio bytes: {e}")
             return ""
 
-    def process_base64_audio(self, base64_audio: str) -> str:
+    def process_base64_audio(self, base64_audio: str, deadline=None, profile=None) -> str:
         """Process base64 encoded audio (from web frontend)"""
         try:
             # Decode base64 to bytes
             audio_bytes = base64.b64decode(base64_audio)
-            return self.process_audio_bytes(audio_bytes)
+            return self.process_audio_bytes(audio_bytes, deadline=deadline, profile=profile)
             
         except Exception as e:
             self.logger.error(f"Error processing base64 audio: {e}")
             return ""
 
-    def process_audio(self, audio_path: str) -> AudioSegment:
-        """Process audio file to correct format"""
+    def process_audio(self, audio_path: str) -> "AudioSegment":
+        """Process audio file to correct format (pydub; load_audio is the faster in-memory path)"""
         try:
+            from pydub import AudioSegment
             audio = AudioSegment.from_file(audio_path)
             audio = audio.set_frame_rate(16000)
             audio = audio.set_channels(1)
@@ -54,25 +93,40 @@ class SpeechToText:
             self.logger.error(f"Error processing audio: {e}")
             return None
 
-    def transcribe(self, audio_segment: AudioSegment) -> str:
-        """Transcribe audio segment to text"""
+    def transcribe(self, audio, deadline=None, profile=None) -> str:
+        """
+        Transcribe float32 samples (from load_audio) or an AudioSegment to text.
+
+        profile is "fast", "balanced" or "accurate" (ECHO_STT_PROFILE by
+        default) and sets the decoding options and, with tiered models, the
+        model size; a request close to its deadline always runs "fast".
+        """
+        # Whisper can't be interrupted, so only start when budget is left
+        if self._out_of_time(deadline, "transcription"):
+            return ""
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp:
-                audio_segment.export(temp.name, format="wav")
-                result = self.model.transcribe(temp.name, language="en", task="transcribe")
-                return result['text'].strip()
+            if audio is None:
+                return ""
+            audio = self.preprocess(audio)
+            if audio is None:
+                return ""
+            profile = resolve_profile(profile, deadline)
+            # The backend takes the array as-is: no WAV export and no second ffmpeg decode
+            return self.backend.transcribe(
+                audio, options=profile_options(profile), deadline=deadline, profile=profile
+            )
                 
         except Exception as e:
             self.logger.error(f"Error during transcription: {e}")
             return ""
 
-    def transcribe_file(self, file_path: str) -> str:
+    def transcribe_file(self, file_path: str, deadline=None, profile=None) -> str:
         """Transcribe audio file directly"""
-        try:
-            audio = self.process_audio(file_path)
-            if audio:
-                return self.transcribe(audio)
+        if self._out_of_time(deadline, "audio decoding"):
             return ""
+        try:
+            audio = self.load_audio(file_path, deadline=deadline)
+            return self.transcribe(audio, deadline=deadline, profile=profile)
         except Exception as e:
             self.logger.error(f"Error during file transcription: {e}")
             return ""
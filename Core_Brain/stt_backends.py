@@ -0,0 +1,173 @@
+# Speech-to-text engines behind SpeechToText: all take 16 kHz mono float32
+# samples and return text, so the caller doesn't care which one runs
+import os
+
+from .speech_config import STT_BACKEND, STT_MODEL_PATH, STT_COMPUTE_TYPE, STT_CPU_THREADS, STT_WORKER
+
+SAMPLE_RATE = 16000
+DEFAULT_OPTIONS = {"language": "en", "task": "transcribe"}
+# Clips up to one Whisper window can share a batched decode; longer ones run alone
+BATCH_MAX_SECONDS = 30.0
+# Batched results this repetitive or unsure are redone with transcribe()'s temperature fallback
+COMPRESSION_RATIO_LIMIT = 2.4
+LOGPROB_LIMIT = -1.0
+
+
+class STTBackend:
+    """
+    Interface every engine implements. transcribe() takes samples plus
+    decoding options (language, task, beam_size, temperature, ...) and the
+    latency profile they came from, which only routing backends use;
+    capabilities() says what the engine is and what the caller may rely on.
+    """
+
+    name = "base"
+
+    def transcribe(self, samples, options=None, deadline=None, profile=None) -> str:
+        raise NotImplementedError
+
+    def transcribe_batch(self, batch, options=None) -> list:
+        """Texts for several clips decoded with the same options; one at a time unless overridden."""
+        return [self.transcribe(samples, options) for samples in batch]
+
+    def capabilities(self) -> dict:
+        """
+        name / model / device / compute_type, plus:
+        batching     transcribe_batch decodes clips together
+        thread_safe  transcribe may be called from several threads at once
+        """
+        raise NotImplementedError
+
+
+class WhisperBackend(STTBackend):
+    """OpenAI Whisper on PyTorch (fp32 on CPU, fp16 on CUDA)."""
+
+    name = "whisper"
+
+    def __init__(self, model_name="small"):
+        import whisper
+        self.whisper = whisper
+        self.model_name = model_name
+        self.model = whisper.load_model(model_name)
+        self.fp16 = self.model.device.type == "cuda"
+
+    def transcribe(self, samples, options=None, deadline=None, profile=None) -> str:
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        return self.model.transcribe(samples, fp16=self.fp16, **options)["text"].strip()
+
+    def transcribe_batch(self, batch, options=None) -> list:
+        """Clips within one 30 s window go through whisper.decode as a single padded log-mel batch."""
+        import torch
+
+        if len(batch) < 2 or any(len(samples) > BATCH_MAX_SECONDS * SAMPLE_RATE for samples in batch):
+            return super().transcribe_batch(batch, options)
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        whisper = self.whisper
+        n_mels = self.model.dims.n_mels
+        mels = torch.stack([
+            whisper.pad_or_trim(whisper.log_mel_spectrogram(samples, n_mels=n_mels), whisper.audio.N_FRAMES)
+            for samples in batch
+        ]).to(self.model.device)
+        # One decode pass: the first temperature only, and best_of is for sampling, not beam search
+        decode_options = {k: v for k, v in options.items() if k in ("language", "task", "beam_size", "best_of")}
+        temperature = options.get("temperature", 0.0)
+        decode_options["temperature"] = temperature[0] if isinstance(temperature, (tuple, list)) else temperature
+        if decode_options.get("beam_size") or decode_options["temperature"] == 0.0:
+            decode_options.pop("best_of", None)
+        results = whisper.decode(
+            self.model, mels, whisper.DecodingOptions(fp16=self.fp16, without_timestamps=True, **decode_options)
+        )
+        texts = []
+        for samples, result in zip(batch, results):
+            if result.compression_ratio > COMPRESSION_RATIO_LIMIT or result.avg_logprob < LOGPROB_LIMIT:
+                texts.append(self.transcribe(samples, options))
+            else:
+                texts.append(result.text.strip())
+        return texts
+
+    def capabilities(self) -> dict:
+        return {
+            "name": self.name, "model": self.model_name, "device": self.model.device.type,
+            "compute_type": "float16" if self.fp16 else "float32", "batching": True, "thread_safe": False,
+        }
+
+
+class FasterWhisperBackend(STTBackend):
+    """
+    CTranslate2 Whisper (faster-whisper) with int8 weights on CPU. model_path
+    is a converted model directory (ct2-transformers-converter); without one
+    the model name is resolved through faster-whisper's own download cache.
+    """
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name="small", model_path=None, compute_type=None, cpu_threads=None):
+        from faster_whisper import WhisperModel
+        path = model_path if model_path is not None else STT_MODEL_PATH
+        if path and "{model}" in path:
+            # One converted directory per size, e.g. models/whisper-{model}-ct2, for tiering
+            path = path.format(model=model_name)
+        self.model_name = path or model_name
+        self.compute_type = compute_type or STT_COMPUTE_TYPE
+        self.model = WhisperModel(
+            self.model_name, device="cpu", compute_type=self.compute_type,
+            cpu_threads=STT_CPU_THREADS if cpu_threads is None else cpu_threads,
+            local_files_only=bool(path) and os.path.isdir(path),
+        )
+
+    def transcribe(self, samples, options=None, deadline=None, profile=None) -> str:
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        segments, _ = self.model.transcribe(samples, **options)
+        # segments is a generator; decoding happens while it is consumed
+        return "".join(segment.text for segment in segments).strip()
+
+    def capabilities(self) -> dict:
+        return {
+            "name": self.name, "model": self.model_name, "device": "cpu",
+            "compute_type": self.compute_type, "batching": False, "thread_safe": True,
+        }
+
+
+class WorkerBackend(STTBackend):
+    """The shared STT worker process (stt_worker.py), which owns whichever engine it was started with."""
+
+    name = "worker"
+
+    def __init__(self, address=None):
+        from .stt_worker import STTClient
+        self.client = STTClient(address)
+
+    def transcribe(self, samples, options=None, deadline=None, profile=None) -> str:
+        return self.client.transcribe(samples, deadline=deadline, options=options, profile=profile)["text"]
+
+    def capabilities(self) -> dict:
+        # Queueing and batching happen in the worker, so callers may send concurrently
+        return {
+            "name": self.name, "model": None, "device": None, "compute_type": None,
+            "address": self.client.address, "batching": False, "thread_safe": True,
+        }
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    WorkerBackend.name: WorkerBackend,
+}
+
+
+def load_backend(name=None, model_name=None) -> STTBackend:
+    """
+    Build the named backend (ECHO_STT_BACKEND by default; ECHO_STT_WORKER=true
+    means "worker"). Without a model name a local engine runs the tiered
+    models of stt_tiers.py; with one it runs just that model.
+    """
+    if name is None:
+        name = WorkerBackend.name if STT_WORKER else STT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown STT backend {name!r}; choose from {', '.join(BACKENDS)}")
+    if name == WorkerBackend.name:
+        return WorkerBackend()
+    if model_name is None:
+        from .stt_tiers import TieredBackend
+        return TieredBackend(name)
+    return BACKENDS[name](model_name)
@@ -0,0 +1,162 @@
+# Several Whisper sizes kept resident under a memory cap, with each clip
+# routed to one by its duration, the current queue depth and a latency profile
+import logging
+import threading
+from collections import OrderedDict
+
+from .speech_config import (
+    STT_TIERS, STT_MEMORY_MB, STT_PRELOAD, STT_PROFILE, STT_PRESSURE_DEPTH, STT_FAST_DEADLINE, STT_COMPUTE_TYPE
+)
+from .stt_backends import STTBackend, SAMPLE_RATE, load_backend
+
+# Smallest to largest; ".en" variants sort with their base size
+MODEL_ORDER = ["tiny", "base", "small", "medium", "large"]
+# Approximate resident size of the fp32 PyTorch weights in MB
+MODEL_MB = {"tiny": 150, "base": 290, "small": 970, "medium": 3000, "large": 6200}
+# int8 CTranslate2 weights are roughly this fraction of that
+INT8_FACTOR = 0.3
+
+# Per profile: the tier for clips up to each duration (seconds), how many
+# tiers queue pressure may step it down, and the decoding options it uses
+PROFILES = {
+    "fast": {
+        "tiers": [(float("inf"), "tiny")],
+        "max_step_down": 0,
+        "options": {"beam_size": 1, "temperature": 0.0, "condition_on_previous_text": False},
+    },
+    "balanced": {
+        "tiers": [(3.0, "tiny"), (10.0, "base"), (float("inf"), "small")],
+        "max_step_down": 2,
+        "options": {"beam_size": 1, "temperature": (0.0, 0.2, 0.4, 0.6)},
+    },
+    "accurate": {
+        "tiers": [(3.0, "base"), (float("inf"), "small")],
+        "max_step_down": 1,
+        "options": {"beam_size": 5, "best_of": 5, "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)},
+    },
+}
+
+
+def resolve_profile(profile=None, deadline=None) -> str:
+    """The requested profile (ECHO_STT_PROFILE by default), or "fast" when the request is nearly out of time."""
+    profile = (profile or STT_PROFILE).lower()
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown STT profile {profile!r}; choose from {', '.join(PROFILES)}")
+    if deadline is not None and not deadline.has(STT_FAST_DEADLINE):
+        return "fast"
+    return profile
+
+
+def profile_options(profile) -> dict:
+    return dict(PROFILES[profile]["options"])
+
+
+def _rank(tier):
+    return MODEL_ORDER.index(tier.split(".")[0])
+
+
+class TieredBackend(STTBackend):
+    """
+    Keeps the configured tiers of one engine (whisper or faster-whisper)
+    loaded, least recently used first out when a load would exceed memory_mb.
+
+    route() picks the tier: the profile's tier for the clip's duration, one
+    tier smaller per pressure_depth requests waiting (up to the profile's
+    max_step_down), then the largest configured tier at or below that which
+    fits the memory cap on its own.
+    """
+
+    name = "tiered"
+
+    def __init__(self, engine="whisper", tiers=None, memory_mb=None, preload=None, pressure_depth=None):
+        self.logger = logging.getLogger(__name__)
+        self.engine = engine
+        self.memory_mb = STT_MEMORY_MB if memory_mb is None else memory_mb
+        self.pressure_depth = max(1, STT_PRESSURE_DEPTH if pressure_depth is None else pressure_depth)
+        self.tiers = sorted(tiers or STT_TIERS, key=_rank)
+        self.fitting = [tier for tier in self.tiers if self.model_mb(tier) <= self.memory_mb]
+        if not self.fitting:
+            raise ValueError(f"No STT tier in {self.tiers} fits in {self.memory_mb:.0f} MB")
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {tier: threading.Lock() for tier in self.tiers}
+        self._in_flight = 0
+        self.routed = {tier: 0 for tier in self.tiers}
+
+        if STT_PRELOAD if preload is None else preload:
+            # Largest first, so the smaller tiers are the ones that stay most recently used
+            budget = self.memory_mb
+            for tier in reversed(self.fitting):
+                if self.model_mb(tier) <= budget:
+                    self.tier(tier)
+                    budget -= self.model_mb(tier)
+
+    def model_mb(self, tier) -> float:
+        mb = MODEL_MB[tier.split(".")[0]]
+        if self.engine == "faster-whisper" and "int8" in STT_COMPUTE_TYPE:
+            mb *= INT8_FACTOR
+        return mb
+
+    def resident_mb(self) -> float:
+        return sum(self.model_mb(tier) for tier in self._loaded)
+
+    def route(self, duration_s, profile=None, queue_depth=None) -> str:
+        settings = PROFILES[resolve_profile(profile)]
+        wanted = next(tier for limit, tier in settings["tiers"] if duration_s <= limit)
+        depth = self._in_flight if queue_depth is None else queue_depth
+        step_down = min(settings["max_step_down"], depth // self.pressure_depth)
+        rank = max(0, _rank(wanted) - step_down)
+        candidates = [tier for tier in self.fitting if _rank(tier) <= rank]
+        return candidates[-1] if candidates else self.fitting[0]
+
+    def tier(self, name) -> STTBackend:
+        """The backend for one tier, loading it (and evicting others past the memory cap) if needed."""
+        with self._lock:
+            backend = self._loaded.get(name)
+            if backend is not None:
+                self._loaded.move_to_end(name)
+                return backend
+        with self._load_locks[name]:
+            with self._lock:
+                if name in self._loaded:
+                    return self._loaded[name]
+            backend = load_backend(self.engine, name)
+            with self._lock:
+                self._loaded[name] = backend
+                # Evicted models are freed once calls still using them finish
+                while self.resident_mb() > self.memory_mb and len(self._loaded) > 1:
+                    evicted = next(tier for tier in self._loaded if tier != name)
+                    del self._loaded[evicted]
+                    self.logger.info(f"Unloaded STT tier {evicted} to stay within {self.memory_mb:.0f} MB")
+            self.logger.info(f"Loaded STT tier {name} ({self.engine}, ~{self.model_mb(name):.0f} MB)")
+            return backend
+
+    def select(self, duration_s, profile=None, queue_depth=None):
+        """(tier name, its backend) for one clip, counted in routed."""
+        name = self.route(duration_s, profile, queue_depth)
+        with self._lock:
+            self.routed[name] += 1
+        return name, self.tier(name)
+
+    def transcribe(self, samples, options=None, deadline=None, profile=None) -> str:
+        with self._lock:
+            depth = self._in_flight
+            self._in_flight += 1
+        try:
+            _, backend = self.select(len(samples) / SAMPLE_RATE, profile, depth)
+            return backend.transcribe(samples, options)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def capabilities(self) -> dict:
+        with self._lock:
+            loaded = list(self._loaded)
+            engine = self._loaded[loaded[-1]].capabilities() if loaded else {}
+        return {
+            "name": self.name, "engine": self.engine, "model": ",".join(loaded) or None,
+            "device": engine.get("device"), "compute_type": engine.get("compute_type"),
+            "tiers": self.tiers, "resident": loaded, "resident_mb": round(self.resident_mb()),
+            "memory_cap_mb": self.memory_mb, "routed": dict(self.routed),
+            "batching": engine.get("batching", False), "thread_safe": engine.get("thread_safe", False),
+        }
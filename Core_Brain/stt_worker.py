@@ -0,0 +1,415 @@
+# Whisper inference service: one process owns the model and serves
+# transcription jobs from any number of web workers over a Unix socket
+import argparse
+import logging
+import os
+import queue
+import signal
+import stat
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from .speech_config import (
+    STT_BACKEND, STT_WORKER_SOCKET, STT_WORKER_AUTHKEY, STT_WORKER_CONCURRENCY, STT_WORKER_MAX_BATCH,
+    STT_WORKER_BATCH_WINDOW_MS, STT_WORKER_QUEUE, STT_WORKER_TIMEOUT
+)
+from .stt_backends import BATCH_MAX_SECONDS, DEFAULT_OPTIONS, SAMPLE_RATE
+from .stt_tiers import PROFILES
+
+
+class STTWorkerError(RuntimeError):
+    pass
+
+
+def _authkey_path(address):
+    return address + ".key"
+
+
+def _private_directory(address):
+    """Create the socket's directory (mode 0700) and refuse one that other users can reach into."""
+    directory = os.path.dirname(os.path.abspath(address))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise STTWorkerError(
+            f"{directory} must be a directory owned by this user and closed to others (mode 0700); "
+            "point ECHO_STT_WORKER_SOCKET at a private directory"
+        )
+    return directory
+
+
+def _read_authkey(address):
+    """The key a worker without ECHO_STT_WORKER_AUTHKEY generated next to its socket, or None."""
+    try:
+        with open(_authkey_path(address), "rb") as f:
+            return f.read() or None
+    except OSError:
+        return None
+
+
+class _Job:
+    __slots__ = ("id", "audio", "options", "profile", "reply", "received", "expires")
+
+    def __init__(self, job_id, audio, options, profile, reply, timeout):
+        self.id = job_id
+        self.audio = audio
+        self.options = options
+        self.profile = profile
+        self.reply = reply
+        self.received = time.monotonic()
+        self.expires = None if timeout is None else self.received + timeout
+
+    @property
+    def batchable(self):
+        return len(self.audio) <= BATCH_MAX_SECONDS * SAMPLE_RATE
+
+    @property
+    def options_key(self):
+        return tuple(sorted(self.options.items()))
+
+
+class STTWorker:
+    """
+    Owns the STT backend (stt_backends.py) and runs jobs from a bounded queue.
+
+    Each of `concurrency` inference threads takes a job, waits up to
+    batch_window_ms for more (up to max_batch), and hands clips that share
+    decoding options and fit one 30 s window to the backend as one batch
+    (a single padded mel batch for Whisper). With tiered models (no model
+    name) each job is first routed to a tier by its duration, profile and
+    the worker's own queue depth, and batches never mix tiers.
+    A full queue rejects new jobs straight away ("busy") instead of letting
+    latency grow without bound; jobs whose deadline passed while queued are
+    dropped unrun.
+    """
+
+    def __init__(self, model_name=None, backend=None, address=None, authkey=None, concurrency=None,
+                 max_batch=None, batch_window_ms=None, queue_size=None):
+        from .stt_backends import load_backend
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(level=logging.INFO)
+        if backend is None:
+            backend = STT_BACKEND if STT_BACKEND != "worker" else "whisper"
+        self.backend = load_backend(backend, model_name)
+        self.model_name = model_name
+        self.address = address or STT_WORKER_SOCKET
+        self.authkey = authkey if authkey is not None else STT_WORKER_AUTHKEY
+        self.concurrency = max(1, concurrency or STT_WORKER_CONCURRENCY)
+        self.max_batch = max(1, max_batch or STT_WORKER_MAX_BATCH)
+        self.batch_window = (STT_WORKER_BATCH_WINDOW_MS if batch_window_ms is None else batch_window_ms) / 1000
+        self.jobs = queue.Queue(maxsize=queue_size or STT_WORKER_QUEUE)
+        self._stats_lock = threading.Lock()
+        self._service_ms = deque(maxlen=512)
+        self._queue_ms = deque(maxlen=512)
+        self._counts = {"completed": 0, "failed": 0, "rejected": 0, "expired": 0, "batches": 0, "batched_jobs": 0}
+        self._in_flight = 0
+        self._started = time.time()
+        self._listener = None
+        self._generated_authkey = False
+
+    # ---- inference ----
+
+    def _take_batch(self):
+        batch = [self.jobs.get()]
+        until = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.jobs.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, backend, jobs):
+        started = time.monotonic()
+        try:
+            if len(jobs) > 1:
+                texts = backend.transcribe_batch([job.audio for job in jobs], jobs[0].options)
+            else:
+                texts = [backend.transcribe(jobs[0].audio, jobs[0].options)]
+            error = None
+        except Exception as e:
+            self.logger.error(f"STT batch of {len(jobs)} failed: {e}")
+            texts, error = [None] * len(jobs), str(e)
+        service_ms = (time.monotonic() - started) * 1000
+
+        with self._stats_lock:
+            self._counts["batches"] += 1
+            self._counts["batched_jobs"] += len(jobs)
+            self._counts["failed" if error else "completed"] += len(jobs)
+            self._service_ms.append(service_ms)
+        for job, text in zip(jobs, texts):
+            reply = {"id": job.id, "service_ms": round(service_ms, 1), "batch_size": len(jobs),
+                     "queue_ms": round((started - job.received) * 1000, 1)}
+            if error:
+                reply["error"] = error
+            else:
+                reply["text"] = text.strip()
+            job.reply(reply)
+
+    def _inference_loop(self):
+        while True:
+            batch = self._take_batch()
+            now = time.monotonic()
+            live = []
+            for job in batch:
+                if job.expires is not None and job.expires <= now:
+                    with self._stats_lock:
+                        self._counts["expired"] += 1
+                    job.reply({"id": job.id, "error": "deadline expired in queue"})
+                else:
+                    with self._stats_lock:
+                        self._queue_ms.append((now - job.received) * 1000)
+                    live.append(job)
+
+            with self._stats_lock:
+                self._in_flight += len(live)
+                depth = self.jobs.qsize() + self._in_flight
+            try:
+                # Batch what decodes together; long clips and odd options go alone
+                groups = {}
+                for job in live:
+                    tier, backend = None, self.backend
+                    try:
+                        if hasattr(self.backend, "select"):
+                            tier, backend = self.backend.select(len(job.audio) / SAMPLE_RATE, job.profile, depth)
+                        batching = backend.capabilities()["batching"]
+                    except Exception as e:
+                        # A tier that can't load (or a bad request) fails this job, not the inference thread
+                        self.logger.error(f"STT routing failed for job {job.id}: {e}")
+                        with self._stats_lock:
+                            self._counts["failed"] += 1
+                        job.reply({"id": job.id, "error": str(e)})
+                        continue
+                    if batching and job.batchable:
+                        key = (tier, job.options_key)
+                    else:
+                        key = ("solo", id(job))
+                    groups.setdefault(key, (backend, []))[1].append(job)
+                for backend, jobs in groups.values():
+                    self._run(backend, jobs)
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= len(live)
+
+    # ---- serving ----
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            service = sorted(self._service_ms)
+            waits = sorted(self._queue_ms)
+            pick = lambda values, q: round(values[min(len(values) - 1, int(q * len(values)))], 1) if values else None
+            batches = self._counts["batches"]
+            return {
+                "backend": self.backend.capabilities(),
+                "queue_depth": self.jobs.qsize(),
+                "queue_capacity": self.jobs.maxsize,
+                "in_flight": self._in_flight,
+                "concurrency": self.concurrency,
+                **self._counts,
+                "avg_batch_size": round(self._counts["batched_jobs"] / batches, 2) if batches else 0.0,
+                "service_ms_p50": pick(service, 0.5),
+                "service_ms_p95": pick(service, 0.95),
+                "queue_ms_p50": pick(waits, 0.5),
+                "queue_ms_p95": pick(waits, 0.95),
+                "uptime_s": round(time.time() - self._started),
+            }
+
+    def _serve_connection(self, conn):
+        send_lock = threading.Lock()
+
+        def reply(message):
+            with send_lock:
+                try:
+                    conn.send(message)
+                except (OSError, EOFError):
+                    pass
+
+        try:
+            while True:
+                request = conn.recv()
+                op = request.get("op")
+                if op == "stats":
+                    reply({"id": request.get("id"), "stats": self.stats()})
+                    continue
+                if op != "transcribe":
+                    reply({"id": request.get("id"), "error": f"unknown op {op!r}"})
+                    continue
+                profile = request.get("profile")
+                if profile is not None and str(profile).lower() not in PROFILES:
+                    reply({"id": request.get("id"),
+                           "error": f"Unknown STT profile {profile!r}; choose from {', '.join(PROFILES)}"})
+                    continue
+                options = {**DEFAULT_OPTIONS, **(request.get("options") or {})}
+                job = _Job(request.get("id"), request["audio"], options, profile, reply,
+                           request.get("timeout"))
+                try:
+                    self.jobs.put_nowait(job)
+                except queue.Full:
+                    with self._stats_lock:
+                        self._counts["rejected"] += 1
+                    reply({"id": job.id, "error": "busy", "queue_depth": self.jobs.qsize()})
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def _write_authkey(self):
+        path = _authkey_path(self.address)
+        if os.path.exists(path):
+            os.remove(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.authkey)
+
+    def _listen(self):
+        """
+        Bind the socket. Jobs arrive pickled, so only this user may connect:
+        the socket sits in a private directory, is created owner-only (no
+        window between bind and chmod) and every connection must present the
+        authkey, generated and written to <socket>.key when none is configured.
+        """
+        _private_directory(self.address)
+        if not self.authkey:
+            self.authkey = os.urandom(32)
+            self._generated_authkey = True
+            self._write_authkey()
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        umask = os.umask(0o077)
+        try:
+            return Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self):
+        self._listener = self._listen()
+        for n in range(self.concurrency):
+            threading.Thread(target=self._inference_loop, name=f"stt-infer-{n}", daemon=True).start()
+        self.logger.info(
+            f"STT worker serving {self.backend.name} {self.backend.capabilities()['model']} on {self.address} "
+            f"(concurrency {self.concurrency}, batches up to {self.max_batch})"
+        )
+        try:
+            while True:
+                try:
+                    conn = self._listener.accept()
+                except Exception as e:
+                    # Failed handshakes (wrong authkey) must not stop the service
+                    self.logger.warning(f"Rejected STT worker connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            self._listener.close()
+            paths = [self.address] + ([_authkey_path(self.address)] if self._generated_authkey else [])
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class STTClient:
+    """
+    Web-worker side of the STT service. Each calling thread keeps its own
+    connection, so concurrent requests reach the worker together and can share a batch.
+    """
+
+    def __init__(self, address=None, authkey=None, timeout=None):
+        self.address = address or STT_WORKER_SOCKET
+        self.authkey = authkey if authkey is not None else STT_WORKER_AUTHKEY
+        self.timeout = STT_WORKER_TIMEOUT if timeout is None else timeout
+        self._local = threading.local()
+        self._ids = iter(range(1, 1 << 62))
+        self._ids_lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Re-read per connection: a restarted worker generates a new key
+            authkey = self.authkey or _read_authkey(self.address)
+            if not authkey:
+                raise STTWorkerError(
+                    f"STT worker unavailable at {self.address}: no {_authkey_path(self.address)} "
+                    "(worker not running) and no ECHO_STT_WORKER_AUTHKEY"
+                )
+            try:
+                conn = Client(self.address, family="AF_UNIX", authkey=authkey)
+            except (OSError, EOFError, AuthenticationError) as e:
+                raise STTWorkerError(f"STT worker unavailable at {self.address}: {e}")
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def _call(self, request, timeout):
+        with self._ids_lock:
+            request["id"] = next(self._ids)
+        conn = self._connection()
+        try:
+            conn.send(request)
+            if not conn.poll(timeout):
+                # The answer may still arrive later; a fresh connection keeps replies in step
+                self._drop_connection()
+                raise STTWorkerError(f"STT worker did not answer within {timeout:.1f}s")
+            response = conn.recv()
+        except (OSError, EOFError) as e:
+            self._drop_connection()
+            raise STTWorkerError(f"STT worker connection lost: {e}")
+        if "error" in response:
+            raise STTWorkerError(response["error"])
+        return response
+
+    def transcribe(self, samples, deadline=None, options=None, profile=None) -> dict:
+        """{"text", "queue_ms", "service_ms", "batch_size"} for 16 kHz mono float32 samples."""
+        timeout = self.timeout if deadline is None else deadline.timeout(self.timeout)
+        request = {"op": "transcribe", "audio": samples, "options": options, "profile": profile, "timeout": timeout}
+        return self._call(request, timeout)
+
+    def stats(self) -> dict:
+        return self._call({"op": "stats"}, min(self.timeout, 5.0))["stats"]
+
+    def close(self):
+        self._drop_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Whisper transcription to local web workers.")
+    parser.add_argument("--model", help="serve this one model (default: the tiers in ECHO_STT_TIERS)")
+    parser.add_argument("--backend", choices=("whisper", "faster-whisper"),
+                        help="engine to run (default: ECHO_STT_BACKEND, else whisper)")
+    parser.add_argument("--socket", default=STT_WORKER_SOCKET, help="Unix socket path")
+    parser.add_argument("--concurrency", type=int, default=STT_WORKER_CONCURRENCY, help="batches run at once")
+    parser.add_argument("--max-batch", type=int, default=STT_WORKER_MAX_BATCH, help="clips per batched decode")
+    parser.add_argument("--batch-window-ms", type=float, default=STT_WORKER_BATCH_WINDOW_MS,
+                        help="how long a job waits for batch mates")
+    parser.add_argument("--queue", type=int, default=STT_WORKER_QUEUE, help="jobs waiting before new ones are rejected")
+    parser.add_argument("--threads", type=int, help="torch CPU threads")
+    parser.add_argument("--stats", action="store_true", help="print a running worker's stats and exit")
+    args = parser.parse_args()
+
+    if args.stats:
+        import json
+        print(json.dumps(STTClient(args.socket).stats(), indent=2))
+        return
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+    # Exit through serve_forever's cleanup (removing the socket) on SIGTERM too
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    STTWorker(
+        model_name=args.model, backend=args.backend, address=args.socket, concurrency=args.concurrency,
+        max_batch=args.max_batch, batch_window_ms=args.batch_window_ms, queue_size=args.queue,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
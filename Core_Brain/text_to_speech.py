@@ -1,36 +1,165 @@
-from gtts import gTTS
 import tempfile
 import logging
 import base64
-import io
+import itertools
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .speech_config import TTS_CACHE, TTS_PREWARM_FILE, TTS_PARALLEL
+
+# Per-reply synthesis timeout, and the least budget worth starting a synthesis with
+SYNTHESIS_TIMEOUT = 10
+MIN_SYNTHESIS_SECONDS = 1.0
+
+# Fixed lines the app speaks over and over, synthesized once by prewarm()
+CANNED_PHRASES = [
+    "Sorry, that took too long. Please try again.",
+    "I'm having trouble processing your request right now. Please try again.",
+    "I hear you. I'm here for you, always.",
+    "Analysis component not available.",
+]
+
+
+def default_prewarm_phrases():
+    """CANNED_PHRASES, Suzi's fallback replies (as spoken, with her suffix) and ECHO_TTS_PREWARM_FILE lines."""
+    phrases = list(CANNED_PHRASES)
+    try:
+        from echo_backend.personalities.Suzi import Suzi
+        phrases += [reply + Suzi.REPLY_SUFFIX for reply in Suzi.FALLBACK_REPLIES]
+    except Exception:
+        pass
+    if TTS_PREWARM_FILE:
+        with open(TTS_PREWARM_FILE, encoding="utf-8") as f:
+            phrases += [line.strip() for line in f if line.strip()]
+    return phrases
+
+# Sentence ends for incremental synthesis: terminal punctuation (Latin, ellipsis,
+# Devanagari danda) with any closing quotes / brackets, then whitespace; or a line break
+_SENTENCE_END = re.compile(r"[.!?\u2026\u0964]+[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e"}
+# Shorter sentences are joined to the next one, since every chunk pays a request's overhead
+MIN_CHUNK_CHARS = 20
+# Longer stretches without a sentence end are cut at a comma or space
+MAX_CHUNK_CHARS = 250
+
+
+class SentenceChunker:
+    """Turns streamed reply deltas into speakable chunks: feed() each delta, flush() at the end."""
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, delta: str) -> list:
+        self.buffer += delta
+        return self._split(final=False)
+
+    def flush(self) -> list:
+        return self._split(final=True)
+
+    def _split(self, final):
+        chunks = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            sentence = self.buffer[start:match.end()].strip()
+            words = self.buffer[start:match.start()].split()
+            if match.group().startswith(".") and words and words[-1].lower() in _ABBREVIATIONS:
+                continue
+            if len(sentence) < MIN_CHUNK_CHARS:
+                continue
+            chunks.append(sentence)
+            start = match.end()
+        rest = self.buffer[start:]
+        while len(rest) > MAX_CHUNK_CHARS:
+            # After the last comma in reach (keeping the comma), else at the last space
+            comma = rest.rfind(", ", 0, MAX_CHUNK_CHARS)
+            cut = comma + 1 if comma > 0 else rest.rfind(" ", 0, MAX_CHUNK_CHARS)
+            if cut <= 0:
+                cut = MAX_CHUNK_CHARS
+            chunks.append(rest[:cut].strip())
+            rest = rest[cut:]
+        if final and rest.strip():
+            chunks.append(rest.strip())
+            rest = ""
+        self.buffer = rest
+        return [chunk for chunk in chunks if chunk]
+
 
 class TextToSpeech:
-    def __init__(self, lang="en"):
+    def __init__(self, lang="en", cache=None, backend=None):
+        from .tts_backends import load_tts_backend
         self.lang = lang
+        # An engine name from tts_backends.BACKENDS, or a TTSBackend instance
+        self.backend = backend if hasattr(backend, "synthesize") else load_tts_backend(backend)
+        self.audio_format = self.backend.audio_format
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO)
+        if cache is None and TTS_CACHE:
+            from .tts_cache import get_tts_cache
+            cache = get_tts_cache()
+        self.cache = cache or None
+
+    def _synthesis_timeout(self, deadline):
+        """Synthesis timeout sized from the request budget; None when synthesis should be skipped."""
+        if deadline is None:
+            return SYNTHESIS_TIMEOUT
+        if not deadline.has(MIN_SYNTHESIS_SECONDS):
+            self.logger.warning("Request deadline reached, skipping speech synthesis")
+            return None
+        return deadline.timeout(SYNTHESIS_TIMEOUT)
+
+    def _cache_key(self, text):
+        from .tts_cache import cache_key
+        return cache_key(text, self.lang, self.backend.name, self.backend.voice)
 
-    def text_to_audio_bytes(self, text: str) -> bytes:
+    def _synthesize(self, text, timeout) -> bytes:
+        return self.backend.synthesize(text, lang=self.lang, timeout=timeout)
+
+    def _from_cache(self, method, *args):
+        """Call a cache method; a cache that fails (e.g. an unusable directory) counts as a miss."""
+        try:
+            return getattr(self.cache, method)(*args)
+        except Exception as e:
+            self.logger.warning(f"TTS cache {method} failed, synthesizing without it: {e}")
+            return None
+
+    def _cached_or_synthesize(self, text, deadline):
+        """(cache key or None, audio bytes) with the cache checked first; empty bytes when skipped."""
+        key = self._cache_key(text) if self.cache is not None else None
+        if key is not None:
+            audio = self._from_cache("get", key)
+            if audio:
+                return key, audio
+        timeout = self._synthesis_timeout(deadline)
+        if timeout is None:
+            return key, b""
+        audio = self._synthesize(text, timeout)
+        if key is not None:
+            self._from_cache("put", key, audio, self.audio_format)
+        return key, audio
+
+    def text_to_audio_bytes(self, text: str, deadline=None) -> bytes:
         """Convert text to audio bytes (for API responses)"""
         if not text.strip():
             self.logger.warning("No text provided for speech synthesis.")
             return b""
 
         try:
-            tts = gTTS(text=text, lang=self.lang)
-            audio_buffer = io.BytesIO()
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
-            return audio_buffer.read()
-            
+            return self._cached_or_synthesize(text, deadline)[1]
         except Exception as e:
-            self.logger.error(f"GTTS error: {e}")
+            self.logger.error(f"{self.backend.name} TTS error: {e}")
             return b""
 
-    def text_to_base64_audio(self, text: str) -> str:
+    def text_to_base64_audio(self, text: str, deadline=None) -> str:
         """Convert text to base64 encoded audio (for web frontend)"""
         try:
-            audio_bytes = self.text_to_audio_bytes(text)
+            if self.cache is not None and text.strip():
+                # Cached entries keep their base64 form, so repeats skip encoding too
+                encoded = self._from_cache("get_base64", self._cache_key(text))
+                if encoded:
+                    return encoded
+            audio_bytes = self.text_to_audio_bytes(text, deadline=deadline)
             if audio_bytes:
                 return base64.b64encode(audio_bytes).decode('utf-8')
             return ""
@@ -38,30 +167,112 @@ class TextToSpeech:
             self.logger.error(f"Base64 encoding error: {e}")
             return ""
 
-    def speak(self, text: str) -> str:
-        """Generate speech file (for local development)"""
+    def speak(self, text: str, deadline=None) -> str:
+        """
+        Generate speech file (for local development). With the cache on the
+        path is the cache's own file: check owns_file() before deleting it.
+        """
         if not text.strip():
             self.logger.warning("No text provided for speech synthesis.")
             return ""
 
         try:
-            tts = gTTS(text=text, lang=self.lang)
-            temp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-            tts.save(temp.name)
+            key, audio = self._cached_or_synthesize(text, deadline)
+            if not audio:
+                return ""
+            path = self._from_cache("path", key) if key is not None else None
+            if path:
+                return path
+            # No cache, or it couldn't store a file: a temp file the caller deletes
+            temp = tempfile.NamedTemporaryFile(delete=False, suffix=f".{self.audio_format}")
+            with temp:
+                temp.write(audio)
             return temp.name
         except Exception as e:
-            self.logger.error(f"GTTS error: {e}")
+            self.logger.error(f"{self.backend.name} TTS error: {e}")
             return "[TTS Error]: Failed to generate speech"
 
-    def speak_to_response(self, text: str) -> dict:
+    def speak_stream(self, deltas, deadline=None, max_parallel=None):
+        """
+        Speak a reply while it is still being generated. deltas is an iterable
+        of text pieces (e.g. from NLPEngine.analyze_stream); every sentence is
+        synthesized as soon as it is complete, up to max_parallel
+        (ECHO_TTS_PARALLEL) at once, and yielded in reply order as
+        {"index", "text", "path", "cached"}. path is None for a sentence that
+        couldn't be synthesized; as with speak(), only files that aren't
+        cached are the caller's to delete.
+        """
+        if isinstance(deltas, str):
+            deltas = [deltas]
+        workers = max(1, max_parallel or TTS_PARALLEL)
+        if not self.backend.capabilities().get("thread_safe"):
+            workers = 1
+        chunker = SentenceChunker()
+        indexes = itertools.count()
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-stream")
+
+        def submit(sentences):
+            for sentence in sentences:
+                pending.append((next(indexes), sentence, executor.submit(self.speak, sentence, deadline)))
+
+        def finished(drain):
+            # Finished sentences in order; waits on the oldest when too many are queued
+            while pending and (drain or pending[0][2].done() or len(pending) > 2 * workers):
+                index, sentence, future = pending.popleft()
+                path = future.result()
+                if not path or path.startswith("[TTS Error]"):
+                    path = None
+                yield {"index": index, "text": sentence, "path": path, "cached": self.owns_file(path)}
+
+        try:
+            for delta in deltas:
+                submit(chunker.feed(delta))
+                yield from finished(drain=False)
+            submit(chunker.flush())
+            yield from finished(drain=True)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def owns_file(self, path) -> bool:
+        """True when path is a cached file that must stay on disk after playback."""
+        return self.cache is not None and self.cache.owns(path)
+
+    def prewarm(self, phrases=None, background=False) -> int:
+        """
+        Synthesize phrases (default_prewarm_phrases() by default) into the
+        cache ahead of time; returns how many were added (0 when backgrounded).
+        """
+        if self.cache is None:
+            return 0
+
+        def run():
+            added = 0
+            for phrase in default_prewarm_phrases() if phrases is None else phrases:
+                try:
+                    key = self._cache_key(phrase)
+                    if key not in self.cache:
+                        self.cache.put(key, self._synthesize(phrase, SYNTHESIS_TIMEOUT), self.audio_format)
+                        added += 1
+                except Exception as e:
+                    self.logger.warning(f"TTS prewarm failed for {phrase[:40]!r}: {e}")
+            self.logger.info(f"TTS cache prewarmed with {added} new phrases")
+            return added
+
+        if background:
+            threading.Thread(target=run, name="tts-prewarm", daemon=True).start()
+            return 0
+        return run()
+
+    def speak_to_response(self, text: str, deadline=None) -> dict:
         """Generate speech and return as API response format"""
         try:
-            audio_base64 = self.text_to_base64_audio(text)
+            audio_base64 = self.text_to_base64_audio(text, deadline=deadline)
             if audio_base64:
                 return {
                     "success": True,
                     "audio": audio_base64,
-                    "format": "mp3",
+                    "format": self.audio_format,
                     "text": text
                 }
             else:
@@ -0,0 +1,164 @@
+# Speech synthesis engines behind TextToSpeech: all turn text into encoded
+# audio bytes in memory, so the caller doesn't care which one runs
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+
+from .speech_config import TTS_BACKEND, TTS_VOICE, TTS_RATE, ESPEAK
+
+
+class TTSBackend:
+    """
+    Interface every engine implements. synthesize() returns audio encoded as
+    audio_format (the file extension it should be saved with), or raises;
+    timeout is in seconds and None means the engine's own default.
+    """
+
+    name = "base"
+    audio_format = "wav"
+
+    def __init__(self, voice=None, rate=None):
+        # Engine-specific voice name ("" = pick by language) and words per minute (0 = engine default)
+        self.voice = TTS_VOICE if voice is None else voice
+        self.rate = TTS_RATE if rate is None else rate
+
+    def synthesize(self, text, lang="en", timeout=None) -> bytes:
+        raise NotImplementedError
+
+    def capabilities(self) -> dict:
+        """
+        name / voice / format, plus:
+        offline      no network needed
+        thread_safe  synthesize may be called from several threads at once
+        """
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate's speech endpoint through gTTS (MP3; needs network access)."""
+
+    name = "gtts"
+    audio_format = "mp3"
+
+    def synthesize(self, text, lang="en", timeout=None) -> bytes:
+        import io
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, timeout=timeout).write_to_fp(buffer)
+        return buffer.getvalue()
+
+    def capabilities(self) -> dict:
+        return {"name": self.name, "voice": None, "format": self.audio_format, "offline": False, "thread_safe": True}
+
+
+def _fix_wav_sizes(audio: bytes) -> bytes:
+    """
+    WAV written to a pipe carries placeholder RIFF / data sizes, since the
+    writer can't seek back to fill them in; set them from the actual length.
+    """
+    if len(audio) < 12 or audio[:4] != b"RIFF" or audio[8:12] != b"WAVE":
+        return audio
+    data = audio.find(b"data", 12)
+    if data < 0:
+        return audio
+    fixed = bytearray(audio)
+    struct.pack_into("<I", fixed, 4, len(audio) - 8)
+    struct.pack_into("<I", fixed, data + 4, len(audio) - data - 8)
+    return bytes(fixed)
+
+
+class EspeakBackend(TTSBackend):
+    """
+    espeak-ng (or classic espeak) run locally, WAV read straight from its
+    stdout. Text goes in on stdin, so replies starting with "-" or holding
+    quotes need no escaping. Robotic next to gTTS, but ~tens of milliseconds
+    and no network.
+    """
+
+    name = "espeak"
+    audio_format = "wav"
+
+    def __init__(self, voice=None, rate=None, binary=None):
+        super().__init__(voice, rate)
+        binary = binary or ESPEAK
+        self.binary = shutil.which(binary) or (binary == "espeak-ng" and shutil.which("espeak"))
+        if not self.binary:
+            raise RuntimeError(f"{binary} not found; install espeak-ng or set ECHO_ESPEAK")
+
+    def synthesize(self, text, lang="en", timeout=None) -> bytes:
+        command = [self.binary, "--stdout", "--stdin", "-b", "1", "-v", self.voice or lang]
+        if self.rate:
+            command += ["-s", str(self.rate)]
+        result = subprocess.run(command, input=text.encode("utf-8"), capture_output=True, timeout=timeout)
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(result.stderr.decode(errors="replace").strip() or f"exit code {result.returncode}")
+        return _fix_wav_sizes(result.stdout)
+
+    def capabilities(self) -> dict:
+        return {
+            "name": self.name, "voice": self.voice or None, "format": self.audio_format,
+            "binary": self.binary, "offline": True, "thread_safe": True,
+        }
+
+
+class Pyttsx3Backend(TTSBackend):
+    """
+    The platform's own engine through pyttsx3 (SAPI5 on Windows, NSSpeech on
+    macOS, espeak on Linux). pyttsx3 only writes files, so each reply goes
+    through a temporary file that is read back and removed; one engine is
+    shared and calls are serialised. timeout is not enforced.
+    """
+
+    name = "pyttsx3"
+
+    def __init__(self, voice=None, rate=None):
+        super().__init__(voice, rate)
+        import pyttsx3
+        self.engine = pyttsx3.init()
+        if self.voice:
+            self.engine.setProperty("voice", self.voice)
+        if self.rate:
+            self.engine.setProperty("rate", self.rate)
+        # NSSpeechSynthesizer writes AIFF; SAPI5 and espeak write WAV
+        self.audio_format = "aiff" if sys.platform == "darwin" else "wav"
+        self._lock = threading.Lock()
+
+    def synthesize(self, text, lang="en", timeout=None) -> bytes:
+        fd, path = tempfile.mkstemp(suffix=f".{self.audio_format}")
+        os.close(fd)
+        try:
+            with self._lock:
+                self.engine.save_to_file(text, path)
+                self.engine.runAndWait()
+            with open(path, "rb") as f:
+                audio = f.read()
+        finally:
+            os.remove(path)
+        if not audio:
+            raise RuntimeError("pyttsx3 produced no audio")
+        return audio
+
+    def capabilities(self) -> dict:
+        return {
+            "name": self.name, "voice": self.voice or None, "format": self.audio_format,
+            "offline": True, "thread_safe": False,
+        }
+
+
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    EspeakBackend.name: EspeakBackend,
+    Pyttsx3Backend.name: Pyttsx3Backend,
+}
+
+
+def load_tts_backend(name=None) -> TTSBackend:
+    """Build the named backend (ECHO_TTS_BACKEND by default)."""
+    name = (name or TTS_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TTS backend {name!r}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,238 @@
+# Synthesized speech keyed by what was said and how, so repeated phrases
+# (greetings, error messages, canned fallbacks) are synthesized only once
+import base64
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .speech_config import TTS_CACHE_DIR, TTS_CACHE_MEMORY_MB, TTS_CACHE_DISK_MB
+
+
+def cache_key(text: str, lang: str, backend: str, voice: str = "") -> str:
+    """sha256 of backend / voice / language / text (whitespace-collapsed, case kept: it changes prosody)."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256("\0".join((backend, voice, lang, normalized)).encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Two tiers of encoded audio (MP3 / WAV bytes exactly as synthesized):
+    an in-memory LRU bounded by memory_mb, and a directory of <key>.<ext>
+    files bounded by disk_mb, oldest-used first out. Disk hits are promoted
+    to memory; file modification times record use, so the disk tier's LRU
+    order survives restarts. Files handed out by path() belong to the cache
+    and must not be deleted by callers (see owns()).
+    """
+
+    def __init__(self, directory=None, memory_mb=None, disk_mb=None):
+        self.logger = logging.getLogger(__name__)
+        self.directory = os.path.expanduser(directory or TTS_CACHE_DIR)
+        self.memory_budget = int((TTS_CACHE_MEMORY_MB if memory_mb is None else memory_mb) * 1024 * 1024)
+        self.disk_budget = int((TTS_CACHE_DISK_MB if disk_mb is None else disk_mb) * 1024 * 1024)
+        self._memory = OrderedDict()  # key -> [audio bytes, extension, base64 or None]
+        self._memory_bytes = 0
+        self._disk = None  # key -> (path, size), loaded on first use
+        self._disk_bytes = 0
+        # Why the disk tier is off (directory unusable), or None
+        self.disk_error = None
+        self._lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    # ---- disk tier ----
+
+    def _disk_index(self):
+        if self._disk is None:
+            self._disk = OrderedDict()
+            entries = []
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                for name in os.listdir(self.directory):
+                    key, _, ext = name.partition(".")
+                    path = os.path.join(self.directory, name)
+                    if ext and len(key) == 64 and not name.endswith(".tmp"):
+                        stat = os.stat(path)
+                        entries.append((stat.st_mtime, key, path, stat.st_size))
+            except OSError as e:
+                # An unusable directory costs the disk tier, never synthesis itself
+                self.disk_error = str(e)
+                self.logger.warning(f"TTS cache directory {self.directory} unusable, caching in memory only: {e}")
+                return self._disk
+            for _, key, path, size in sorted(entries):
+                self._disk[key] = (path, size)
+                self._disk_bytes += size
+        return self._disk
+
+    def _touch(self, key):
+        path, _ = self._disk[key]
+        self._disk.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write_disk(self, key, audio, ext):
+        disk = self._disk_index()
+        if self.disk_error or key in disk or len(audio) > self.disk_budget:
+            return
+        path = os.path.join(self.directory, f"{key}.{ext}")
+        # Write then rename, so a reader never sees half a file
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(audio)
+                os.replace(tmp, path)
+            except OSError:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+        except OSError as e:
+            self.logger.warning(f"TTS cache couldn't write to {self.directory}: {e}")
+            return
+        disk[key] = (path, len(audio))
+        self._disk_bytes += len(audio)
+        while self._disk_bytes > self.disk_budget and len(disk) > 1:
+            old_key, (old_path, old_size) = disk.popitem(last=False)
+            self._disk_bytes -= old_size
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    # ---- memory tier ----
+
+    def _remember(self, key, audio, ext):
+        if len(audio) > self.memory_budget:
+            return
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = [audio, ext, None]
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_budget:
+            _, (old_audio, _, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_audio)
+
+    def _lookup(self, key):
+        """Memory entry for key (promoting a disk hit), or None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.hits["memory"] += 1
+            return entry
+        disk = self._disk_index()
+        if key in disk:
+            path, size = disk[key]
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+            except OSError:
+                # Removed behind our back; forget it
+                del disk[key]
+                self._disk_bytes -= size
+            else:
+                self._touch(key)
+                self.hits["disk"] += 1
+                ext = os.path.splitext(path)[1][1:]
+                self._remember(key, audio, ext)
+                return self._memory.get(key) or [audio, ext, None]
+        self.misses += 1
+        return None
+
+    # ---- public API ----
+
+    def get(self, key):
+        """Cached audio bytes, or None."""
+        with self._lock:
+            entry = self._lookup(key)
+            return None if entry is None else entry[0]
+
+    def get_base64(self, key):
+        """Cached audio as base64 text, encoded once per memory entry; None on a miss."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return None
+            if entry[2] is None:
+                entry[2] = base64.b64encode(entry[0]).decode("ascii")
+            return entry[2]
+
+    def path(self, key):
+        """Path of the cached file (owned by the cache, don't delete it), or None."""
+        with self._lock:
+            disk = self._disk_index()
+            if key in disk:
+                self._touch(key)
+                return disk[key][0]
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._write_disk(key, entry[0], entry[1])
+            return disk[key][0] if key in disk else None
+
+    def put(self, key, audio: bytes, ext: str = "mp3"):
+        if not audio:
+            return
+        with self._lock:
+            self._remember(key, audio, ext)
+            self._write_disk(key, audio, ext)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._memory or key in self._disk_index()
+
+    def owns(self, path) -> bool:
+        """True for files inside the cache directory, which callers must leave in place."""
+        if not path:
+            return False
+        directory = os.path.realpath(self.directory)
+        return os.path.dirname(os.path.realpath(path)) == directory
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path, _ in self._disk_index().values():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            disk = self._disk_index()
+            lookups = self.hits["memory"] + self.hits["disk"] + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_budget": self.memory_budget,
+                "disk_entries": len(disk),
+                "disk_bytes": self._disk_bytes,
+                "disk_budget": self.disk_budget,
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+                "directory": self.directory,
+                "disk_error": self.disk_error,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> AudioCache:
+    """The cache shared by every TextToSpeech in the process."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AudioCache()
+    return _cache
@@ -0,0 +1,120 @@
+# Energy / zero-crossing voice activity detection, run on the decoded samples
+# before Whisper so silence is never encoded and silent clips skip the model
+from .speech_config import VAD_FLOOR_DB, VAD_PAD_MS, VAD_MAX_PAUSE_MS, VAD_MIN_SPEECH_MS
+
+FRAME_MS = 30
+# A frame counts as speech this many dB above the clip's noise floor ...
+NOISE_MARGIN_DB = 12
+# ... unless that is more than this far below the loudest frame (all-speech clips)
+DYNAMIC_RANGE_DB = 18
+# Quieter frames with a high zero-crossing rate are unvoiced consonants (s, f, th)
+FRICATIVE_ZCR = 0.3
+FRICATIVE_DB = 10
+# Below this much contrast between the loudest frame and the noise floor, speech
+# can't be told from background (a tightly cropped clip, talk over steady noise),
+# so loud clips are passed through untrimmed rather than guessed at
+MIN_CONTRAST_DB = 6
+
+
+class VoiceActivityDetector:
+    """
+    Finds speech in mono float samples from frame energy and zero-crossing
+    rate, all in vectorised NumPy (a few milliseconds per minute of audio).
+
+    The threshold adapts to the clip: NOISE_MARGIN_DB over its 10th-percentile
+    frame energy, capped DYNAMIC_RANGE_DB under its loudest frame, and never
+    below floor_db. Only clips with nothing above floor_db are rejected:
+    loud clips with too little contrast to segment are kept whole.
+    process() returns the samples with leading / trailing silence cut and
+    long pauses shortened, plus what it found.
+    """
+
+    def __init__(self, sample_rate=16000, floor_db=None, pad_ms=None, max_pause_ms=None, min_speech_ms=None):
+        self.sample_rate = sample_rate
+        self.floor_db = VAD_FLOOR_DB if floor_db is None else floor_db
+        self.frame = int(sample_rate * FRAME_MS / 1000)
+        self.pad_frames = (VAD_PAD_MS if pad_ms is None else pad_ms) // FRAME_MS
+        self.max_pause_frames = (VAD_MAX_PAUSE_MS if max_pause_ms is None else max_pause_ms) // FRAME_MS
+        self.min_speech_frames = max(1, (VAD_MIN_SPEECH_MS if min_speech_ms is None else min_speech_ms) // FRAME_MS)
+
+    def frame_features(self, samples):
+        """(energy in dBFS, zero-crossing rate) per FRAME_MS frame; the last partial frame is zero-padded."""
+        import numpy as np
+
+        count = -(-len(samples) // self.frame)
+        frames = np.zeros(count * self.frame, dtype=np.float32)
+        frames[:len(samples)] = samples
+        frames = frames.reshape(count, self.frame)
+        energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame - 1)
+        return energy_db, zcr
+
+    def speech_mask(self, samples):
+        """Boolean speech flag per frame, before padding."""
+        import numpy as np
+
+        energy_db, zcr = self.frame_features(samples)
+        if not energy_db.size:
+            return np.zeros(0, dtype=bool)
+        noise_db = float(np.percentile(energy_db, 10))
+        loudest_db = float(energy_db.max())
+        if loudest_db < self.floor_db:
+            return np.zeros(len(energy_db), dtype=bool)
+        if loudest_db - noise_db < MIN_CONTRAST_DB:
+            # Fail open: too flat to segment, so let Whisper hear all of it
+            return np.ones(len(energy_db), dtype=bool)
+        threshold = max(self.floor_db, min(noise_db + NOISE_MARGIN_DB, loudest_db - DYNAMIC_RANGE_DB))
+        voiced = energy_db >= threshold
+        unvoiced = (
+            (energy_db >= threshold - FRICATIVE_DB) & (zcr >= FRICATIVE_ZCR) & (energy_db >= noise_db + MIN_CONTRAST_DB)
+        )
+        return self._drop_short_runs(voiced | unvoiced)
+
+    def _drop_short_runs(self, mask):
+        import numpy as np
+
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        keep = np.zeros(len(mask) + 1, dtype=np.int32)
+        long_runs = (ends - starts) >= self.min_speech_frames
+        np.add.at(keep, starts[long_runs], 1)
+        np.add.at(keep, ends[long_runs], -1)
+        return np.cumsum(keep[:-1]) > 0
+
+    def keep_mask(self, speech):
+        """
+        Frames to keep: speech padded by pad_frames, plus the first
+        max_pause_frames of every pause between speech (longer pauses are cut short).
+        """
+        import numpy as np
+
+        if not speech.any():
+            return speech
+        padded = np.convolve(speech, np.ones(2 * self.pad_frames + 1), mode="same") > 0
+        first, last = np.flatnonzero(padded)[[0, -1]]
+        keep = np.zeros_like(padded)
+        inner = padded[first:last + 1]
+        # Position of every frame within its own pause: index minus the index the pause started at
+        index = np.arange(len(inner))
+        run_start = np.maximum.accumulate(np.where(inner, index + 1, 0))
+        keep[first:last + 1] = inner | (index - run_start < self.max_pause_frames)
+        return keep
+
+    def process(self, samples):
+        """
+        (trimmed samples, info). info["speech"] is False when nothing rose
+        above floor_db, in which case the samples are empty.
+        """
+        import numpy as np
+
+        speech = self.speech_mask(samples)
+        keep = self.keep_mask(speech)
+        info = {
+            "speech": bool(speech.any()),
+            "input_seconds": len(samples) / self.sample_rate,
+            "speech_seconds": int(speech.sum()) * FRAME_MS / 1000,
+        }
+        trimmed = samples[np.repeat(keep, self.frame)[:len(samples)]]
+        info["output_seconds"] = len(trimmed) / self.sample_rate
+        return trimmed, info
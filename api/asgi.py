@@ -0,0 +1,125 @@
+"""
+ASGI entry point for the chat API.
+
+Runs on AsyncNLPEngine, so each in-flight conversation is a coroutine waiting
+on the network instead of a pinned worker thread. Serve with:
+
+    uvicorn api.asgi:app --host 0.0.0.0 --port 8000
+"""
+
+import os
+import sys
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from Core_Brain.nlp_engine.async_engine import AsyncNLPEngine
+from Core_Brain.nlp_engine.resilience import circuit_breaker_states
+from Core_Brain.memory_manager import MemoryManager
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Conversations kept in memory; the least recently active one is dropped first
+MAX_SESSIONS = int(os.getenv("ECHO_MAX_SESSIONS", "1000"))
+
+nlp = AsyncNLPEngine()
+_sessions = OrderedDict()
+
+
+def _session_memory(session_id):
+    """Per-conversation MemoryManager, so concurrent users don't share context."""
+    if not session_id:
+        return None
+    memory = _sessions.get(session_id)
+    if memory is None:
+        memory = MemoryManager()
+        _sessions[session_id] = memory
+        if len(_sessions) > MAX_SESSIONS:
+            _sessions.popitem(last=False)
+    else:
+        _sessions.move_to_end(session_id)
+    return memory
+
+
+async def _read_body(receive):
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def chat(receive, send):
+    try:
+        data = json.loads(await _read_body(receive) or b"{}")
+        user_message = data.get("message", "")
+
+        if not user_message.strip():
+            await _send_json(send, {"response": "Please enter a message."})
+            return
+
+        result = await nlp.analyze(user_message, _session_memory(data.get("session_id")))
+        await _send_json(send, result)
+
+    except Exception as e:
+        logger.error(f"Chat error: {e}")
+        await _send_json(send, {
+            "response": "I encountered an error processing your message. Please try again."
+        })
+
+
+async def health(receive, send):
+    await _send_json(send, {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "sessions": len(_sessions),
+        "upstreams": circuit_breaker_states(),
+        "caches": nlp.cache_stats()
+    })
+
+
+ROUTES = {
+    ("POST", "/api/chat"): chat,
+    ("GET", "/api/health"): health,
+}
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    handler = ROUTES.get((scope["method"], scope["path"]))
+    if handler is None:
+        await _send_json(send, {"error": "Not found"}, status=404)
+        return
+    await handler(receive, send)
@@ -3,7 +3,10 @@ import sys
 import json
 import logging
 from datetime import datetime
-from flask import Flask, request, jsonify
+import random
+import threading
+from collections import OrderedDict
+from flask import Flask, request, jsonify, Response, stream_with_context
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -11,6 +14,58 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Make Core_Brain / echo_backend importable from the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+FALLBACK_RESPONSES = [
+    "I understand you're feeling that way. I'm here to listen and support you.",
+    "That sounds challenging. How can I help you work through this?",
+    "I hear you. Your feelings are valid and important.",
+    "Thank you for sharing that with me. I'm here for you.",
+    "That's a lot to process. Take your time, I'm listening."
+]
+
+# Conversations kept in memory; the least recently active one is dropped first
+MAX_SESSIONS = int(os.getenv("ECHO_MAX_SESSIONS", "1000"))
+
+_backend = None
+_backend_lock = threading.Lock()
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def get_backend():
+    """Build the personality router on first use; None if the backend can't be imported."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            try:
+                from Core_Brain.nlp_engine.personality_router import PersonalityRouter
+                _backend = {'router': PersonalityRouter()}
+            except Exception as e:
+                logger.error(f"Backend unavailable, using fallback responses: {e}")
+                _backend = {}
+        return _backend or None
+
+
+def _session_memory(session_id):
+    """Per-conversation MemoryManager, so concurrent users don't share context."""
+    if not session_id:
+        return None
+    from Core_Brain.memory_manager import MemoryManager
+    with _sessions_lock:
+        memory = _sessions.get(session_id)
+        if memory is None:
+            memory = MemoryManager()
+            _sessions[session_id] = memory
+            if len(_sessions) > MAX_SESSIONS:
+                _sessions.popitem(last=False)
+        else:
+            _sessions.move_to_end(session_id)
+        return memory
+
 # Simple HTML response
 HTML_RESPONSE = """
 <!DOCTYPE html>
@@ -47,6 +102,9 @@ HTML_RESPONSE = """
     </div>
 
     <script>
+        // One conversation per page load; the server keys its memory by this id
+        const sessionId = window.crypto && crypto.randomUUID ? crypto.randomUUID() : String(Math.random()).slice(2);
+
         function handleKeyPress(event) {
             if (event.key === 'Enter') sendMessage();
         }
@@ -61,28 +119,43 @@ HTML_RESPONSE = """
             input.value = '';
             
             // Add loading message
-            addMessage('Thinking...', 'echo');
+            const replyDiv = addMessage('Thinking...', 'echo');
+            const replyText = document.createElement('span');
+            let received = '';
             
-            // Send to API
-            fetch('/api/chat', {
+            // Send to API and render tokens as they arrive
+            fetch('/api/chat/stream', {
                 method: 'POST',
                 headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({message: message})
+                body: JSON.stringify({message: message, session_id: sessionId})
             })
-            .then(response => response.json())
-            .then(data => {
-                // Remove loading message
-                const chatContainer = document.getElementById('chatContainer');
-                chatContainer.removeChild(chatContainer.lastChild);
+            .then(response => {
+                if (!response.ok || !response.body) throw new Error('HTTP ' + response.status);
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
                 
-                // Add response
-                addMessage(data.response || 'Sorry, I encountered an error.', 'echo');
+                function read() {
+                    return reader.read().then(({done, value}) => {
+                        if (done) {
+                            if (!received) replyText.textContent = 'Sorry, I encountered an error.';
+                            return;
+                        }
+                        if (!received) {
+                            // Replace the loading message with the streamed reply
+                            replyDiv.innerHTML = '<strong>Echo:</strong> ';
+                            replyDiv.appendChild(replyText);
+                        }
+                        received += decoder.decode(value, {stream: true});
+                        replyText.textContent = received;
+                        const chatContainer = document.getElementById('chatContainer');
+                        chatContainer.scrollTop = chatContainer.scrollHeight;
+                        return read();
+                    });
+                }
+                return read();
             })
             .catch(error => {
-                // Remove loading message
-                const chatContainer = document.getElementById('chatContainer');
-                chatContainer.removeChild(chatContainer.lastChild);
-                addMessage('Sorry, I encountered an error. Please try again.', 'echo');
+                replyDiv.innerHTML = '<strong>Echo:</strong> Sorry, I encountered an error. Please try again.';
             });
         }
         
@@ -93,6 +166,7 @@ HTML_RESPONSE = """
             messageDiv.innerHTML = `<strong>${sender === 'user' ? 'You' : 'Echo'}:</strong> ${text}`;
             chatContainer.appendChild(messageDiv);
             chatContainer.scrollTop = chatContainer.scrollHeight;
+            return messageDiv;
         }
     </script>
 </body>
@@ -113,16 +187,7 @@ def chat():
             return jsonify({'response': 'Please enter a message.'})
         
         # Simple response without heavy AI processing for now
-        responses = [
-            "I understand you're feeling that way. I'm here to listen and support you.",
-            "That sounds challenging. How can I help you work through this?",
-            "I hear you. Your feelings are valid and important.",
-            "Thank you for sharing that with me. I'm here for you.",
-            "That's a lot to process. Take your time, I'm listening."
-        ]
-        
-        import random
-        response = random.choice(responses)
+        response = random.choice(FALLBACK_RESPONSES)
         
         return jsonify({
             'response': response,
@@ -137,12 +202,47 @@ def chat():
             'response': 'I encountered an error processing your message. Please try again.'
         })
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Stream the personality reply as plain-text chunks while it is generated."""
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('message', '')
+
+    if not user_message.strip():
+        return Response('Please enter a message.', mimetype='text/plain')
+
+    backend = get_backend()
+
+    def generate():
+        if backend is None:
+            yield random.choice(FALLBACK_RESPONSES)
+            return
+        try:
+            memory = _session_memory(data.get('session_id'))
+            yield from backend['router'].get_response_stream(user_message, memory)
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield 'I encountered an error processing your message. Please try again.'
+
+    # No buffering between tokens: disable proxy buffering where supported
+    return Response(stream_with_context(generate()), mimetype='text/plain',
+                    headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'})
+
 @app.route('/api/health')
 def health():
-    return jsonify({
+    payload = {
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
-    })
+        'timestamp': datetime.now().isoformat(),
+        'sessions': len(_sessions)
+    }
+    # Only report upstream breakers once the backend is loaded; health checks stay cheap
+    resilience = sys.modules.get('Core_Brain.nlp_engine.resilience')
+    if resilience is not None:
+        payload['upstreams'] = resilience.circuit_breaker_states()
+    cache = sys.modules.get('Core_Brain.nlp_engine.classification_cache')
+    if cache is not None:
+        payload['classification_cache'] = cache.get_classification_cache().stats()
+    return jsonify(payload)
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
@@ -1,40 +1,25 @@
 # Connects APIs, services, etc.
 import logging
-import sys
 import os
 
-# Add the Core_Brain path to sys.path if not already there
-current_dir = os.path.dirname(os.path.abspath(__file__))
-core_brain_path = os.path.join(current_dir, '..', 'Core_Brain')
-if core_brain_path not in sys.path:
-    sys.path.append(core_brain_path)
-
-# Add the project root to sys.path for proper imports
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.append(project_root)
-
 logger = logging.getLogger(__name__)
 
+# End-to-end budget for one voice request (STT + NLP + TTS), in seconds
+PIPELINE_BUDGET = float(os.getenv("ECHO_PIPELINE_BUDGET", "45"))
+
 def initialize_components():
-    """Initialize all components with proper error handling"""
+    """Import the Core_Brain accessors; the components themselves load on first use"""
     try:
-        # Try to import Core_Brain components
-        from Core_Brain import stt, tts, nlp, memory, get_core_status, is_core_ready        
-        # Verify components are initialized
-        if not is_core_ready():
-            logger.warning("Some core components failed to initialize")
-            status = get_core_status()
-            failed = [name for name, ready in status.items() if not ready]
-            logger.warning(f"Failed components: {failed}")
-        
+        from Core_Brain import get_stt, get_tts, get_nlp, get_memory, get_core_status, is_core_ready, warmup
+
         return {
-            'stt': stt,
-            'tts': tts, 
-            'nlp': nlp,
-            'memory': memory,
+            'get_stt': get_stt,
+            'get_tts': get_tts,
+            'get_nlp': get_nlp,
+            'get_memory': get_memory,
             'get_core_status': get_core_status,
-            'is_core_ready': is_core_ready
+            'is_core_ready': is_core_ready,
+            'warmup': warmup
         }
         
     except ImportError as e:
@@ -44,24 +29,81 @@ def initialize_components():
 # Initialize components
 _components = initialize_components()
 
-# Export components (with None fallbacks)
+# Export accessors (with None fallbacks)
 if _components:
-    stt = _components['stt']
-    tts = _components['tts'] 
-    nlp = _components['nlp']
-    memory = _components['memory']
+    get_stt = _components['get_stt']
+    get_tts = _components['get_tts']
+    get_nlp = _components['get_nlp']
+    get_memory = _components['get_memory']
     get_core_status = _components['get_core_status']
     is_core_ready = _components['is_core_ready']
+    warmup = _components['warmup']
 else:
-    stt = None
-    tts = None
-    nlp = None 
-    memory = None
+    get_stt = get_tts = get_nlp = get_memory = lambda: None
     get_core_status = lambda: {}
     is_core_ready = lambda: False
+    warmup = lambda *args, **kwargs: {}
+
+_LAZY_COMPONENTS = {'stt': 'get_stt', 'tts': 'get_tts', 'nlp': 'get_nlp', 'memory': 'get_memory'}
+
+
+def __getattr__(name):
+    # `from echo_backend.integration import nlp` still works; it loads the component
+    if name in _LAZY_COMPONENTS:
+        return globals()[_LAZY_COMPONENTS[name]]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _transcribe(audio_file_path, deadline, stt_profile):
+    """(text, None) for usable speech, else ("", the result to return instead)."""
+    # Validate audio file exists
+    if not os.path.exists(audio_file_path):
+        return "", {
+            "error": "Audio file not found",
+            "transcribed_text": "",
+            "intent": "unknown",
+            "emotion": "neutral",
+            "sentiment": "neutral",
+            "response_text": "Audio file not found."
+        }
+
+    # Transcribe audio
+    stt = get_stt()
+    if stt is None:
+        raise Exception("Speech-to-Text component not available")
+
+    text = stt.transcribe_file(audio_file_path, deadline=deadline, profile=stt_profile)
+
+    if (not text or text.strip() == "") and deadline.expired():
+        return "", {
+            "error": "Deadline exceeded",
+            "transcribed_text": "",
+            "intent": "unknown",
+            "emotion": "neutral",
+            "sentiment": "neutral",
+            "response_text": "Sorry, that took too long. Please try again."
+        }
+
+    if not text or text.strip() == "":
+        return "", {
+            "transcribed_text": "",
+            "intent": "unknown",
+            "emotion": "neutral",
+            "sentiment": "neutral", 
+            "response_text": "No speech detected in audio file."
+        }
+
+    return text, None
+
+def pipeline(audio_file_path: str, deadline=None, stt_profile=None) -> dict:
+    """
+    Process audio through the complete pipeline.
 
-def pipeline(audio_file_path: str) -> dict:
-    """Process audio through the complete pipeline"""
+    deadline (Core_Brain.deadline.Deadline) bounds the whole request; it
+    defaults to ECHO_PIPELINE_BUDGET seconds from now. Every stage sizes its
+    timeouts from what is left and speech synthesis is skipped when the
+    budget has run out. stt_profile ("fast", "balanced", "accurate") trades
+    transcription accuracy for latency.
+    """
     
     if not _components:
         return {
@@ -73,34 +115,17 @@ def pipeline(audio_file_path: str) -> dict:
             "response_text": "Backend integration failed. Components not initialized."
         }
     
+    if deadline is None:
+        from Core_Brain.deadline import Deadline
+        deadline = Deadline(PIPELINE_BUDGET)
+
     try:
-        # Validate audio file exists
-        if not os.path.exists(audio_file_path):
-            return {
-                "error": "Audio file not found",
-                "transcribed_text": "",
-                "intent": "unknown",
-                "emotion": "neutral",
-                "sentiment": "neutral",
-                "response_text": "Audio file not found."
-            }
-        
-        # Transcribe audio
-        if stt is None:
-            raise Exception("Speech-to-Text component not available")
-        
-        text = stt.transcribe_file(audio_file_path)
-        
-        if not text or text.strip() == "":
-            return {
-                "transcribed_text": "",
-                "intent": "unknown",
-                "emotion": "neutral",
-                "sentiment": "neutral", 
-                "response_text": "No speech detected in audio file."
-            }
-        
+        text, early_result = _transcribe(audio_file_path, deadline, stt_profile)
+        if early_result is not None:
+            return early_result
+
         # Analyze with NLP
+        nlp = get_nlp()
         if nlp is None:
             result = {
                 'intent': 'unknown',
@@ -109,15 +134,19 @@ def pipeline(audio_file_path: str) -> dict:
                 'response': 'Analysis component not available.'
             }
         else:
-            result = nlp.analyze(text, memory_manager=memory)
+            result = nlp.analyze(text, memory_manager=get_memory(), deadline=deadline)
         
-        # Generate speech response
+        # Generate speech response (optional: skipped by tts when the budget is spent)
         audio_response_path = None
+        audio_cached = False
+        tts = get_tts()
         if tts is not None:
             try:
-                audio_response = tts.speak(result["response"])
+                audio_response = tts.speak(result["response"], deadline=deadline)
                 if audio_response and not "[TTS Error]" in str(audio_response):
                     audio_response_path = audio_response
+                    # Cached files are shared between requests; callers must not delete them
+                    audio_cached = tts.owns_file(audio_response)
             except Exception as e:
                 logger.warning(f"Text-to-speech failed: {e}")
         
@@ -127,7 +156,8 @@ def pipeline(audio_file_path: str) -> dict:
             "emotion": result['emotion'],
             "sentiment": result['sentiment'], 
             "response_text": result['response'],
-            "response_audio_path": audio_response_path
+            "response_audio_path": audio_response_path,
+            "response_audio_cached": audio_cached
         }
         
     except Exception as e:
@@ -140,3 +170,86 @@ def pipeline(audio_file_path: str) -> dict:
             "sentiment": "neutral",
             "response_text": f"Pipeline failed: {str(e)}"
         }
+
+def pipeline_stream(audio_file_path: str, deadline=None, stt_profile=None):
+    """
+    Incremental variant of pipeline(): a generator of events, so playback of
+    the first sentence can start while later ones are still being generated
+    and synthesized.
+
+        {"type": "analysis", "transcribed_text", "intent", "emotion", "sentiment"}
+        {"type": "audio", "index", "text", "path", "cached"}    one per sentence, in order
+        {"type": "done", ...pipeline()'s keys, "response_audio_chunks": [paths]}
+
+    Early exits and failures end with a "done" event carrying the same result
+    pipeline() returns for them. Audio files with "cached" false are the
+    caller's to delete.
+    """
+    if not _components:
+        # pipeline() returns its "not available" result without doing any work
+        yield {"type": "done", **pipeline(audio_file_path, deadline, stt_profile)}
+        return
+
+    if deadline is None:
+        from Core_Brain.deadline import Deadline
+        deadline = Deadline(PIPELINE_BUDGET)
+
+    try:
+        text, early_result = _transcribe(audio_file_path, deadline, stt_profile)
+        if early_result is not None:
+            yield {"type": "done", **early_result}
+            return
+
+        nlp = get_nlp()
+        if nlp is None:
+            result = {
+                'intent': 'unknown',
+                'emotion': 'neutral',
+                'sentiment': 'neutral',
+                'response': 'Analysis component not available.'
+            }
+            deltas = [result['response']]
+        else:
+            result, deltas = nlp.analyze_stream(text, memory_manager=get_memory(), deadline=deadline)
+
+        yield {
+            "type": "analysis",
+            "transcribed_text": text,
+            "intent": result['intent'],
+            "emotion": result['emotion'],
+            "sentiment": result['sentiment']
+        }
+
+        # Sentences are synthesized while the reply is still streaming in
+        chunks = []
+        tts = get_tts()
+        if tts is None:
+            # Still read the whole reply: it is only remembered once complete
+            for _ in deltas:
+                pass
+        else:
+            for chunk in tts.speak_stream(deltas, deadline=deadline):
+                chunks.append(chunk)
+                yield {"type": "audio", **chunk}
+
+        yield {
+            "type": "done",
+            "transcribed_text": text,
+            "intent": result['intent'],
+            "emotion": result['emotion'],
+            "sentiment": result['sentiment'],
+            "response_text": result['response'],
+            "response_audio_chunks": [chunk["path"] for chunk in chunks if chunk["path"]]
+        }
+
+    except Exception as e:
+        logger.error(f"Pipeline error: {e}")
+        yield {
+            "type": "done",
+            "error": str(e),
+            "transcribed_text": "",
+            "intent": "unknown",
+            "emotion": "neutral",
+            "sentiment": "neutral",
+            "response_text": f"Pipeline failed: {str(e)}"
+        }
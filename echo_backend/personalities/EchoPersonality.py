@@ -3,12 +3,14 @@ from Core_Brain.nlp_engine import NLPEngine
 
 
 class EchoPersonality(BasePersonality):
-    def __init__(self):
+    def __init__(self, nlp=None):
         super().__init__(name="Echo", style="caring, empathetic", goals="help user emotionally and give supportive replies")
-        self.nlp = NLPEngine() 
+        self.nlp = nlp or NLPEngine()
 
-    def respond(self, user_input, memory):
-        analysis = self.nlp.analyze(user_input, memory)
+    def _messages(self, user_input, memory, analysis):
+        # Reuse the caller's analysis; only classify here (no extra reply, no memory write) when missing
+        if analysis is None:
+            analysis = self.nlp.classify(user_input, memory)
         intent = analysis.get("intent", "unknown")
         emotion = analysis.get("emotion", "neutral")
         sentiment = analysis.get("sentiment", "neutral")
@@ -26,12 +28,15 @@ class EchoPersonality(BasePersonality):
             "Reply in 2–3 empathetic, supportive sentences."
         )
 
-        # Call LLM
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_input}
         ]
 
+    def respond(self, user_input, memory, analysis=None):
+        messages = self._messages(user_input, memory, analysis)
+
+        # Call LLM
         response = self.nlp.call_groq_model(messages, max_tokens=150, temperature=0.7)
 
         if not response:
@@ -41,4 +46,22 @@ class EchoPersonality(BasePersonality):
         if memory:
             memory.add_memory(user_input, response)
 
-        return response
\ No newline at end of file
+        return response
+
+    def respond_stream(self, user_input, memory, analysis=None):
+        """Generator variant of respond(): yields reply deltas as the model produces them."""
+        messages = self._messages(user_input, memory, analysis)
+
+        parts = []
+        for delta in self.nlp.call_groq_model_stream(messages, max_tokens=150, temperature=0.7):
+            parts.append(delta)
+            yield delta
+        response = "".join(parts)
+
+        if not response:
+            response = "I hear you. I'm here for you, always."
+            yield response
+
+        # Save memory
+        if memory:
+            memory.add_memory(user_input, response)
\ No newline at end of file
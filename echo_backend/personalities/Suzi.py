@@ -1,14 +1,27 @@
+import random
+
 from .base_personality import BasePersonality
 from Core_Brain.nlp_engine import NLPEngine
 
 
 class Suzi(BasePersonality):
-    def __init__(self):
+    # Agar empty reply aaya to inme se ek
+    FALLBACK_REPLIES = [
+        "uff, tum to bada naughty nikle 😏",
+        "bas bas, zyada sharmao mat 😜",
+        "badi hi mast baat keh di tumne 😉",
+        "acha lagta hai tumhe thoda tang karna 😌"
+    ]
+    REPLY_SUFFIX = " 😏 (waise mujhe sunna acha lagta hai, aur bolo...)"
+
+    def __init__(self, nlp=None):
         super().__init__(name="Suzi", style="naughty, playful, bold", goals="make conversation fun, teasing, and a little tharki but caring")
-        self.nlp = NLPEngine() 
+        self.nlp = nlp or NLPEngine()
 
-    def respond(self, user_input, memory):
-        analysis = self.nlp.analyze(user_input, memory)  
+    def _messages(self, user_input, memory, analysis):
+        # Reuse the caller's analysis; only classify here (no extra reply, no memory write) when missing
+        if analysis is None:
+            analysis = self.nlp.classify(user_input, memory)
         intent = analysis.get("intent", "unknown")
         emotion = analysis.get("emotion", "neutral")
         sentiment = analysis.get("sentiment", "neutral")
@@ -35,26 +48,45 @@ class Suzi(BasePersonality):
             "Use light flirting and double-meaning jokes where appropriate, without being vulgar."
         )
 
-        # Model call
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_input}
         ]
+
+    def respond(self, user_input, memory, analysis=None):
+        messages = self._messages(user_input, memory, analysis)
+
+        # Model call
         response = self.nlp.call_groq_model(messages, max_tokens=150, temperature=0.95) 
 
         # Agar empty reply aaya to fallback
         if not response:
-            import random
-            response = random.choice([
-                "uff, tum to bada naughty nikle 😏",
-                "bas bas, zyada sharmao mat 😜",
-                "badi hi mast baat keh di tumne 😉",
-                "acha lagta hai tumhe thoda tang karna 😌"
-            ])
+            response = random.choice(self.FALLBACK_REPLIES)
+
+        # Save memory
+        if memory:
+            memory.add_memory(user_input, response)
+
+        return response + self.REPLY_SUFFIX
+
+    def respond_stream(self, user_input, memory, analysis=None):
+        """Generator variant of respond(): yields reply deltas as the model produces them."""
+        messages = self._messages(user_input, memory, analysis)
+
+        parts = []
+        for delta in self.nlp.call_groq_model_stream(messages, max_tokens=150, temperature=0.95):
+            parts.append(delta)
+            yield delta
+        response = "".join(parts)
+
+        # Agar empty reply aaya to fallback
+        if not response:
+            response = random.choice(self.FALLBACK_REPLIES)
+            yield response
 
         # Save memory
         if memory:
             memory.add_memory(user_input, response)
 
-        return response + " 😏 (waise mujhe sunna acha lagta hai, aur bolo...)"
+        yield self.REPLY_SUFFIX
 
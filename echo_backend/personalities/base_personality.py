@@ -4,7 +4,16 @@ class BasePersonality:
         self.style = style
         self.goals = goals
 
-    def respond(self,user_input, memory):
-        """Default response if child personality doesn't override."""
+    def respond(self, user_input, memory, analysis=None):
+        """
+        Default response if child personality doesn't override.
+
+        analysis is an already computed NLPEngine.classify()/analyze() result
+        (intent/emotion/sentiment/context); personalities only compute one
+        themselves when it isn't given.
+        """
         return f"{self.name} says: I am still learning how to respond."
 
+    def respond_stream(self, user_input, memory, analysis=None):
+        """Generator variant of respond(); personalities that can stream override it."""
+        yield self.respond(user_input, memory, analysis=analysis)
\ No newline at end of file
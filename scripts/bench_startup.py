@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Measure import-time cost of each entry point and fail when a budget is exceeded.
+
+Every entry point is imported in a fresh interpreter under `python -X
+importtime`, a few times, keeping the fastest run. The report shows total
+import time, process wall time and the packages that cost the most. An
+entry also fails if it pulls in a module it must not (Whisper / torch,
+pydub, gTTS, cryptography, numpy on the text-only paths). Entries whose
+third-party dependencies aren't installed are reported as skipped.
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --only api asgi --repeat 5 --json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies a text-only process should never import
+HEAVY_MODULES = ["whisper", "torch", "pydub", "gtts", "cryptography", "numpy"]
+
+# name -> (modules imported, import budget in ms, modules that must not be imported)
+ENTRY_POINTS = {
+    "core": (["Core_Brain"], 150, HEAVY_MODULES),
+    "nlp": (["Core_Brain.nlp_engine.nlp_engine"], 600, HEAVY_MODULES),
+    "api": (["api.index"], 800, HEAVY_MODULES),
+    "asgi": (["api.asgi"], 800, HEAVY_MODULES),
+    "streamlit": (
+        ["streamlit", "echo_backend.integration", "Core_Brain.nlp_engine.personality_router",
+         "Core_Brain.memory_manager"],
+        4000, HEAVY_MODULES,
+    ),
+    "cli": (["scripts.bulk_analyze", "Core_Brain.nlp_engine.nlp_engine"], 800, HEAVY_MODULES),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def measure(modules):
+    """One cold import in a fresh interpreter: (import ms, wall ms, rows) or raises RuntimeError."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    code = "; ".join(f"import {module}" for module in modules)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(lines[-1] if lines else f"exit code {proc.returncode}")
+    rows = parse_importtime(proc.stderr)
+    import_ms = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+    return import_ms, wall_ms, rows
+
+
+def bench(name, repeat):
+    modules, budget_ms, forbidden = ENTRY_POINTS[name]
+    result = {"entry": name, "modules": modules, "budget_ms": budget_ms}
+    best = None
+    try:
+        for _ in range(repeat):
+            run = measure(modules)
+            if best is None or run[0] < best[0]:
+                best = run
+    except RuntimeError as e:
+        message = str(e)
+        result["status"] = "skip" if message.startswith("ModuleNotFoundError") else "error"
+        result["error"] = message
+        return result
+
+    import_ms, wall_ms, rows = best
+    loaded = {module for module, _, _, _ in rows}
+    banned = sorted(m for m in forbidden if m in loaded)
+    # Self time summed per top-level package shows who is actually expensive
+    per_package = {}
+    for module, self_us, _, _ in rows:
+        root = module.split(".")[0]
+        per_package[root] = per_package.get(root, 0) + self_us
+    top = sorted(per_package.items(), key=lambda item: -item[1])[:6]
+    result.update({
+        "import_ms": round(import_ms, 1),
+        "wall_ms": round(wall_ms, 1),
+        "modules_loaded": len(loaded),
+        "heaviest": [(package, round(self_us / 1000, 1)) for package, self_us in top],
+        "forbidden_imports": banned,
+        "status": "ok" if import_ms <= budget_ms and not banned else "fail",
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(ENTRY_POINTS), help="entry points to measure")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point; the fastest is kept")
+    parser.add_argument("--budget", action="append", default=[], metavar="ENTRY=MS", help="override a budget")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    for override in args.budget:
+        name, _, ms = override.partition("=")
+        modules, _, forbidden = ENTRY_POINTS[name]
+        ENTRY_POINTS[name] = (modules, float(ms), forbidden)
+
+    results = [bench(name, max(1, args.repeat)) for name in (args.only or ENTRY_POINTS)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            if r["status"] in ("skip", "error"):
+                print(f"{r['entry']:<10} {r['status'].upper():<5} {r['error']}")
+                continue
+            print(f"{r['entry']:<10} {r['status'].upper():<5} import {r['import_ms']:>7.1f} ms "
+                  f"(budget {r['budget_ms']:.0f}), wall {r['wall_ms']:>7.1f} ms, {r['modules_loaded']} modules")
+            print("           heaviest: " + ", ".join(f"{m} {ms:.0f} ms" for m, ms in r["heaviest"]))
+            if r["forbidden_imports"]:
+                print(f"           must not import: {', '.join(r['forbidden_imports'])}")
+
+    sys.exit(1 if any(r["status"] in ("fail", "error") for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Compare STT backends side by side on the same clips: real-time factor and WER.
+
+Every clip is decoded and VAD-trimmed once, then transcribed by each backend
+(--repeat times, keeping the fastest). Real-time factor is processing time
+divided by audio duration (below 1 is faster than real time). WER is word
+error rate against a reference transcript: a .txt file next to each clip
+(call.wav -> call.txt) or a --refs JSONL of {"audio": "call.wav", "text": ...}.
+Without references the first backend's output is used as the reference.
+
+    python scripts/bench_stt_backends.py --audio clips/*.wav
+    ECHO_STT_MODEL_PATH=models/whisper-small-ct2 \\
+        python scripts/bench_stt_backends.py --audio clips/*.wav --backends whisper faster-whisper --model small
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from Core_Brain.audio import decode_audio, normalize_peak, SAMPLE_RATE
+from Core_Brain.stt_backends import BACKENDS, load_backend
+from Core_Brain.vad import VoiceActivityDetector
+
+
+def words(text):
+    """Lower-case words without punctuation, the usual WER normalisation."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def edit_distance(reference, hypothesis):
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def load_references(paths, refs_file):
+    refs = {}
+    if refs_file:
+        with open(refs_file, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    refs[os.path.basename(row["audio"])] = row["text"]
+    for path in paths:
+        sidecar = os.path.splitext(path)[0] + ".txt"
+        if os.path.basename(path) not in refs and os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                refs[os.path.basename(path)] = f.read().strip()
+    return refs
+
+
+def prepare(paths, use_vad):
+    vad = VoiceActivityDetector() if use_vad else None
+    clips = []
+    for path in paths:
+        samples = decode_audio(path, normalize=False)
+        if vad is not None:
+            samples, info = vad.process(samples)
+            if not info["speech"]:
+                print(f"skipping {path}: no speech", file=sys.stderr)
+                continue
+        clips.append((os.path.basename(path), normalize_peak(samples)))
+    return clips
+
+
+def bench_backend(name, model_name, clips, repeat):
+    started = time.perf_counter()
+    backend = load_backend(name, model_name)
+    load_s = time.perf_counter() - started
+    backend.transcribe(clips[0][1])  # warm-up, not timed
+    outputs = {}
+    for clip, samples in clips:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = backend.transcribe(samples)
+            elapsed = time.perf_counter() - started
+            if best is None or elapsed < best[0]:
+                best = (elapsed, text)
+        outputs[clip] = best
+    return backend.capabilities(), load_s, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--audio", nargs="+", required=True, help="clips to transcribe")
+    parser.add_argument("--refs", help="JSONL with reference transcripts")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "faster-whisper"],
+                        choices=sorted(BACKENDS), help="backends to compare")
+    parser.add_argument("--model", default="small", help="model size / name for every backend")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per clip; the fastest is kept")
+    parser.add_argument("--no-vad", action="store_true", help="transcribe clips untrimmed")
+    parser.add_argument("--per-clip", action="store_true", help="also print every clip's result")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    clips = prepare(args.audio, not args.no_vad)
+    if not clips:
+        sys.exit("no clips with speech")
+    refs = load_references(args.audio, args.refs)
+    audio_s = sum(len(samples) for _, samples in clips) / SAMPLE_RATE
+
+    results = []
+    for name in args.backends:
+        try:
+            capabilities, load_s, outputs = bench_backend(name, args.model, clips, max(1, args.repeat))
+        except ImportError as e:
+            results.append({"backend": name, "status": "skip", "error": str(e)})
+            continue
+        if not refs and name == args.backends[0]:
+            # No references: everything is scored against the first backend
+            refs = {clip: text for clip, (_, text) in outputs.items()}
+            reference = f"{name} output"
+        else:
+            reference = "reference transcripts"
+        errors = ref_words = 0
+        per_clip = []
+        for clip, samples in clips:
+            elapsed, text = outputs[clip]
+            row = {"clip": clip, "seconds": round(len(samples) / SAMPLE_RATE, 2),
+                   "rtf": round(elapsed / (len(samples) / SAMPLE_RATE), 3), "text": text}
+            if clip in refs:
+                ref = words(refs[clip])
+                edits = edit_distance(ref, words(text))
+                errors += edits
+                ref_words += len(ref)
+                row["wer"] = round(edits / max(1, len(ref)), 3)
+            per_clip.append(row)
+        processing_s = sum(elapsed for elapsed, _ in outputs.values())
+        results.append({
+            "backend": name, "status": "ok", "capabilities": capabilities, "load_s": round(load_s, 2),
+            "audio_s": round(audio_s, 2), "processing_s": round(processing_s, 2),
+            "rtf": round(processing_s / audio_s, 3),
+            "wer": round(errors / ref_words, 3) if ref_words else None, "wer_against": reference,
+            "clips": per_clip,
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(clips)} clips, {audio_s:.1f}s of speech")
+    for r in results:
+        if r["status"] != "ok":
+            print(f"{r['backend']:<16} SKIP  {r['error']}")
+            continue
+        caps = r["capabilities"]
+        wer = "n/a" if r["wer"] is None else f"{r['wer'] * 100:.1f}%"
+        print(f"{r['backend']:<16} {caps['compute_type'] or '':<8} load {r['load_s']:>6.2f}s  "
+              f"RTF {r['rtf']:.3f}  ({r['processing_s']:.1f}s)  WER {wer} vs {r['wer_against']}")
+        if args.per_clip:
+            for row in r["clips"]:
+                wer = f"  WER {row['wer'] * 100:.0f}%" if "wer" in row else ""
+                print(f"    {row['clip']:<24} RTF {row['rtf']:.3f}{wer}  {row['text'][:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Compare the old temp-file audio path with the in-memory decode in front of Whisper.
+
+The legacy path is what SpeechToText.process_audio_bytes used to do: write
+the upload to a temp file, decode and normalise it with pydub, export a
+second temp WAV and let Whisper decode that again with ffmpeg. The new path
+is Core_Brain.audio.decode_audio on the bytes. Both are timed per input
+(median of --repeat runs), with the disk bytes written and the largest
+sample difference between the two outputs. --model also runs Whisper on
+both results end to end. Without --audio a tone clip is generated in
+several formats with ffmpeg.
+
+    python scripts/bench_stt_decode.py
+    python scripts/bench_stt_decode.py --audio upload.webm call.m4a --repeat 10 --model tiny
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+
+from Core_Brain.audio import FFMPEG, SAMPLE_RATE, decode_audio, _ffmpeg_decode
+
+GENERATED_FORMATS = {
+    "clip-16k-mono.wav": ["-ar", "16000", "-ac", "1", "-f", "wav"],
+    "clip-44k-stereo.wav": ["-ar", "44100", "-ac", "2", "-f", "wav"],
+    "clip.mp3": ["-ar", "44100", "-ac", "2", "-b:a", "128k", "-f", "mp3"],
+    "clip.webm": ["-ar", "48000", "-ac", "1", "-c:a", "libopus", "-f", "webm"],
+}
+
+
+def synth_clip(seconds):
+    """A speech-like test signal (gliding tones with pauses) as 16 kHz mono WAV bytes."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = 0.4 * np.sin(2 * np.pi * (180 + 60 * np.sin(2 * np.pi * 0.7 * t)) * t)
+    signal *= (np.sin(2 * np.pi * 0.5 * t) > -0.3)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((signal * 32767).astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def generated_inputs(seconds):
+    clip = synth_clip(seconds)
+    inputs = {}
+    for name, args in GENERATED_FORMATS.items():
+        proc = subprocess.run([FFMPEG, "-i", "pipe:0", *args, "pipe:1"], input=clip, capture_output=True)
+        if proc.returncode == 0:
+            inputs[name] = proc.stdout
+        else:
+            print(f"skipping {name}: this ffmpeg can't encode it", file=sys.stderr)
+    return inputs
+
+
+def legacy_decode(audio_bytes, suffix):
+    """The old path: returns (samples, bytes written to disk)."""
+    from pydub import AudioSegment
+
+    written = 0
+    paths = []
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as upload:
+            upload.write(audio_bytes)
+            paths.append(upload.name)
+        written += len(audio_bytes)
+        audio = AudioSegment.from_file(paths[0])
+        audio = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2).normalize()
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as export:
+            paths.append(export.name)
+        audio.export(paths[1], format="wav")
+        written += os.path.getsize(paths[1])
+        # What whisper.transcribe(path) does with the exported file
+        return _ffmpeg_decode(paths[1], SAMPLE_RATE), written
+    finally:
+        # The old code leaked both files; the benchmark cleans up after itself
+        for path in paths:
+            os.remove(path)
+
+
+def timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), result
+
+
+def bench_input(name, audio_bytes, suffix, repeat, model):
+    row = {"input": name, "bytes": len(audio_bytes)}
+    new_ms, new = timed(lambda: decode_audio(audio_bytes), repeat)
+    row.update({"new_ms": round(new_ms, 2), "seconds": round(len(new) / SAMPLE_RATE, 2)})
+    try:
+        old_ms, (old, written) = timed(lambda: legacy_decode(audio_bytes, suffix), repeat)
+    except ImportError:
+        row["legacy"] = "skipped: pydub not installed"
+        old = None
+    except Exception as e:
+        row["legacy"] = f"failed: {e}"
+        old = None
+    else:
+        length = min(len(old), len(new))
+        row.update({
+            "legacy_ms": round(old_ms, 2),
+            "speedup": round(old_ms / max(new_ms, 1e-9), 1),
+            "legacy_disk_bytes": written,
+            "max_sample_diff": float(np.abs(old[:length] - new[:length]).max()) if length else 0.0,
+            "length_diff": len(old) - len(new),
+        })
+    if model is not None:
+        transcribe = lambda audio: model.transcribe(audio, language="en", task="transcribe")["text"].strip()
+        new_total, text = timed(lambda: transcribe(decode_audio(audio_bytes)), 1)
+        row.update({"new_total_ms": round(new_total, 1), "text": text})
+        if old is not None:
+            old_total, old_text = timed(lambda: transcribe(legacy_decode(audio_bytes, suffix)[0]), 1)
+            row.update({"legacy_total_ms": round(old_total, 1), "same_text": old_text == text})
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--audio", nargs="+", help="audio files to decode (default: generated clips)")
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of the generated clip")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per path; the median is reported")
+    parser.add_argument("--model", help="also transcribe with this Whisper model (e.g. tiny)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.audio:
+        inputs = {}
+        for path in args.audio:
+            with open(path, "rb") as f:
+                inputs[os.path.basename(path)] = f.read()
+    else:
+        inputs = generated_inputs(args.seconds)
+
+    model = None
+    if args.model:
+        import whisper
+        model = whisper.load_model(args.model)
+
+    results = []
+    for name, audio_bytes in inputs.items():
+        suffix = os.path.splitext(name)[1] or ".wav"
+        results.append(bench_input(name, audio_bytes, suffix, max(1, args.repeat), model))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        line = f"{r['input']:<20} {r['seconds']:>6.1f}s audio  in-memory {r['new_ms']:>8.2f} ms"
+        if "legacy_ms" in r:
+            line += (f"  temp-file {r['legacy_ms']:>8.2f} ms  x{r['speedup']:<5}"
+                     f" disk {r['legacy_disk_bytes'] / 1024:.0f} KiB  max diff {r['max_sample_diff']:.2e}")
+        else:
+            line += f"  ({r['legacy']})"
+        print(line)
+        if "new_total_ms" in r:
+            print(f"{'':<20} with Whisper: in-memory {r['new_total_ms']:.0f} ms, "
+                  f"temp-file {r.get('legacy_total_ms', float('nan')):.0f} ms, same text: {r.get('same_text')}")
+
+
+if __name__ == "__main__":
+    main()
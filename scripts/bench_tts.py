@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compare TTS backends on the same replies: latency, real-time factor and size.
+
+Each backend synthesizes every phrase (--repeat times, keeping the fastest)
+straight through its engine, with the audio cache out of the way. Reported
+per backend: load time, the first (cold) synthesis, median and p95 latency,
+milliseconds per character, real-time factor (synthesis time over audio
+duration; below 1 is faster than playback, needs ffmpeg for MP3) and output
+size. Phrases are the canned replies TextToSpeech prewarms plus a few longer
+sentences, or one per line of --texts.
+
+    python scripts/bench_tts.py
+    python scripts/bench_tts.py --backends espeak pyttsx3 --texts replies.txt --repeat 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from Core_Brain.audio import decode_audio, SAMPLE_RATE
+from Core_Brain.text_to_speech import CANNED_PHRASES, SYNTHESIS_TIMEOUT
+from Core_Brain.tts_backends import BACKENDS, load_tts_backend
+
+LONGER_PHRASES = [
+    "That sounds like a really long day. Do you want to talk about what made it so hard?",
+    "I remember you mentioned your exam last week. How did it go in the end, and how are you feeling about it now?",
+]
+
+
+def load_phrases(path):
+    if not path:
+        return CANNED_PHRASES + LONGER_PHRASES
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def audio_seconds(audio):
+    try:
+        return len(decode_audio(audio, normalize=False)) / SAMPLE_RATE
+    except Exception:
+        return None
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def bench_backend(name, phrases, lang, repeat):
+    started = time.perf_counter()
+    backend = load_tts_backend(name)
+    load_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    backend.synthesize(phrases[0], lang=lang, timeout=SYNTHESIS_TIMEOUT)
+    cold_s = time.perf_counter() - started
+
+    rows = []
+    for phrase in phrases:
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            audio = backend.synthesize(phrase, lang=lang, timeout=SYNTHESIS_TIMEOUT)
+            elapsed = time.perf_counter() - started
+            if best is None or elapsed < best[0]:
+                best = (elapsed, audio)
+        elapsed, audio = best
+        duration = audio_seconds(audio)
+        rows.append({
+            "text": phrase, "chars": len(phrase), "ms": round(elapsed * 1000, 1), "bytes": len(audio),
+            "audio_s": None if duration is None else round(duration, 2),
+            "rtf": round(elapsed / duration, 3) if duration else None,
+        })
+    latencies = [row["ms"] for row in rows]
+    timed = [row for row in rows if row["rtf"] is not None]
+    return {
+        "backend": name, "status": "ok", "capabilities": backend.capabilities(),
+        "load_ms": round(load_s * 1000, 1), "cold_ms": round(cold_s * 1000, 1),
+        "p50_ms": round(statistics.median(latencies), 1), "p95_ms": round(percentile(latencies, 0.95), 1),
+        "ms_per_char": round(sum(latencies) / sum(row["chars"] for row in rows), 2),
+        "rtf": round(sum(row["ms"] for row in timed) / 1000 / sum(row["audio_s"] for row in timed), 3)
+        if timed else None,
+        "kb_per_s": round(sum(row["bytes"] for row in timed) / 1024 / sum(row["audio_s"] for row in timed), 1)
+        if timed else None,
+        "phrases": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS), choices=sorted(BACKENDS),
+                        help="backends to compare")
+    parser.add_argument("--texts", help="phrases to synthesize, one per line")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per phrase; the fastest is kept")
+    parser.add_argument("--per-phrase", action="store_true", help="also print every phrase's result")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    phrases = load_phrases(args.texts)
+    results = []
+    for name in args.backends:
+        try:
+            results.append(bench_backend(name, phrases, args.lang, max(1, args.repeat)))
+        except Exception as e:
+            # Missing package / binary, or no network for gTTS
+            results.append({"backend": name, "status": "skip", "error": str(e)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(phrases)} phrases, {sum(len(p) for p in phrases)} characters")
+    for r in results:
+        if r["status"] != "ok":
+            print(f"{r['backend']:<8} SKIP  {r['error']}")
+            continue
+        rtf = "n/a" if r["rtf"] is None else f"{r['rtf']:.3f}"
+        print(f"{r['backend']:<8} {r['capabilities']['format']:<4} load {r['load_ms']:>7.1f}ms  "
+              f"cold {r['cold_ms']:>7.1f}ms  p50 {r['p50_ms']:>7.1f}ms  p95 {r['p95_ms']:>7.1f}ms  "
+              f"{r['ms_per_char']:.2f}ms/char  RTF {rtf}")
+        if args.per_phrase:
+            for row in r["phrases"]:
+                print(f"    {row['ms']:>7.1f}ms  {row['bytes'] / 1024:>6.1f}KB  {row['text'][:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Re-label stored conversations offline: texts or audio through STT and NLPEngine.
+
+Reads a JSONL of {"id": ..., "text": ...} rows (--texts) or every audio file
+in a directory (--audio-dir) and appends one JSON result per item to --out
+as soon as it is done. Items already in --out are skipped, so an
+interrupted run resumes where it stopped. Texts are classified with the
+batched detectors (many items per completion); audio, --mode analyze and
+--no-batch go item by item on --concurrency worker threads. A throughput
+and latency summary is printed at the end.
+
+    python scripts/bulk_analyze.py --texts sessions.jsonl --out labels.jsonl
+    python scripts/bulk_analyze.py --audio-dir recordings/ --out labels.jsonl --mode analyze
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".ogg", ".flac", ".webm")
+
+
+def read_texts(path, id_field, text_field):
+    """(id, text) per JSONL row; rows without an id use their line number."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            yield str(row.get(id_field, line_no)), row[text_field]
+
+
+def list_audio(directory, recursive):
+    """(id, path) per audio file, id being the path relative to directory."""
+    if recursive:
+        paths = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+    else:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+    for path in sorted(p for p in paths if p.lower().endswith(AUDIO_EXTENSIONS)):
+        yield os.path.relpath(path, directory), path
+
+
+def load_checkpoint(out_path):
+    """
+    Ids already written to out_path. A partial last line (the run was killed
+    mid-write) is cut off so appending continues on a clean line.
+    """
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, "rb+") as f:
+        good_until = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError):
+                break
+            good_until += len(line)
+        f.truncate(good_until)
+    return done
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    def add(self, seconds, error=False):
+        self.latencies.append(seconds)
+        self.errors += int(error)
+
+    def report(self, skipped):
+        wall = time.perf_counter() - self.started
+        done = len(self.latencies)
+        print(f"\n{done} items in {wall:.1f}s ({done / max(wall, 1e-9):.2f} items/s), "
+              f"{self.errors} errors, {skipped} skipped (already in output)", file=sys.stderr)
+        if done:
+            ordered = sorted(self.latencies)
+            pick = lambda q: ordered[min(done - 1, int(q * done))] * 1000
+            print(f"latency per item: p50 {pick(0.5):.0f} ms, p95 {pick(0.95):.0f} ms, "
+                  f"max {ordered[-1] * 1000:.0f} ms", file=sys.stderr)
+
+
+class Writer:
+    """Appends result rows and flushes each one, so the output doubles as the checkpoint."""
+
+    def __init__(self, path, stats):
+        self.file = open(path, "a", encoding="utf-8")
+        self.stats = stats
+
+    def write(self, row, seconds):
+        row["latency_ms"] = round(seconds * 1000, 1)
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.stats.add(seconds, error="error" in row)
+
+    def close(self):
+        self.file.close()
+
+
+def chunked(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batched(nlp, items, writer, batch_size):
+    """Classify texts batch_size at a time with detect_intent_batch / detect_emotion_batch."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for chunk in chunked(items, batch_size):
+            texts = [text for _, text in chunk]
+            started = time.perf_counter()
+            intents = executor.submit(nlp.detect_intent_batch, texts)
+            emotions = executor.submit(nlp.detect_emotion_batch, texts)
+            intents, emotions = intents.result(), emotions.result()
+            # Amortised per-item latency of the chunk
+            seconds = (time.perf_counter() - started) / len(chunk)
+            for (item_id, text), intent, emotion in zip(chunk, intents, emotions):
+                writer.write({"id": item_id, "text": text, "intent": intent, **emotion}, seconds)
+
+
+def make_worker(nlp, stt, mode, timeout, stt_profile=None):
+    from Core_Brain.deadline import Deadline
+
+    # Backends that can't share their model across threads (PyTorch Whisper)
+    # transcribe in turns while NLP calls overlap
+    concurrent_stt = stt is not None and stt.backend.capabilities()["thread_safe"]
+    stt_lock = contextlib.nullcontext() if concurrent_stt else threading.Lock()
+
+    def work(item):
+        item_id, source = item
+        started = time.perf_counter()
+        deadline = Deadline(timeout)
+        row = {"id": item_id}
+        try:
+            if stt is not None:
+                row["audio"] = source
+                with stt_lock:
+                    text = stt.transcribe_file(source, deadline=deadline, profile=stt_profile)
+            else:
+                text = source
+            row["text"] = text
+            if not text or not text.strip():
+                row["error"] = "No speech detected"
+            elif mode == "analyze":
+                row.update(nlp.analyze(text, deadline=deadline))
+            else:
+                analysis = nlp.classify(text, deadline=deadline)
+                analysis.pop("context", None)
+                row.update(analysis)
+        except Exception as e:
+            row["error"] = str(e)
+        return row, time.perf_counter() - started
+
+    return work
+
+
+def run_items(work, items, writer, concurrency):
+    """Run work over items with at most 2 x concurrency in flight, writing results as they finish."""
+    window = max(1, concurrency) * 2
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for item in items:
+            pending.add(executor.submit(work, item))
+            if len(pending) >= window:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    writer.write(*future.result())
+        for future in pending:
+            writer.write(*future.result())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--texts", help="JSONL file with one message per row")
+    source.add_argument("--audio-dir", help="directory of audio files to transcribe first")
+    parser.add_argument("--out", required=True, help="JSONL results, appended to and used to resume")
+    parser.add_argument("--mode", choices=("classify", "analyze"), default="classify",
+                        help="classify: intent/emotion/sentiment only; analyze: also generate Echo's reply")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--recursive", action="store_true", help="include audio in subdirectories")
+    parser.add_argument("--concurrency", type=int, default=4, help="items processed at once (item-by-item paths)")
+    parser.add_argument("--batch-size", type=int, default=200, help="texts per batched classification round")
+    parser.add_argument("--no-batch", action="store_true", help="classify texts one by one")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds allowed per item")
+    parser.add_argument("--stt-model", help="one Whisper model for --audio-dir (default: the ECHO_STT_TIERS tiers)")
+    parser.add_argument("--stt-profile", choices=("fast", "balanced", "accurate"),
+                        help="STT latency profile (default: ECHO_STT_PROFILE)")
+    parser.add_argument("--stt-backend", choices=("whisper", "faster-whisper", "worker"),
+                        help="STT engine for --audio-dir (default: ECHO_STT_BACKEND)")
+    parser.add_argument("--restart", action="store_true", help="ignore and overwrite existing output")
+    args = parser.parse_args()
+
+    if args.restart and os.path.exists(args.out):
+        os.remove(args.out)
+    done = load_checkpoint(args.out)
+    if done:
+        print(f"Resuming: {len(done)} items already in {args.out}", file=sys.stderr)
+
+    if args.texts:
+        items = read_texts(args.texts, args.id_field, args.text_field)
+    else:
+        items = list_audio(args.audio_dir, args.recursive)
+
+    skipped = 0
+
+    def remaining(items):
+        nonlocal skipped
+        for item_id, payload in items:
+            if item_id in done:
+                skipped += 1
+                continue
+            yield item_id, payload
+
+    from Core_Brain.nlp_engine.nlp_engine import NLPEngine
+    nlp = NLPEngine()
+    stt = None
+    if args.audio_dir:
+        from Core_Brain.speech_to_text import SpeechToText
+        stt = SpeechToText(model_name=args.stt_model, backend=args.stt_backend)
+
+    stats = Stats()
+    writer = Writer(args.out, stats)
+    try:
+        if args.texts and args.mode == "classify" and not args.no_batch:
+            run_batched(nlp, remaining(items), writer, args.batch_size)
+        else:
+            work = make_worker(nlp, stt, args.mode, args.timeout, args.stt_profile)
+            run_items(work, remaining(items), writer, args.concurrency)
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun the same command to resume", file=sys.stderr)
+    finally:
+        writer.close()
+        stats.report(skipped)
+
+
+if __name__ == "__main__":
+    main()
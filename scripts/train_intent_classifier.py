@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the local intent classifier used by NLPEngine.detect_intent.
+
+Reads a JSONL file of {"text": ..., "intent": ...} rows, holds out a test
+split, and reports accuracy, per-threshold coverage (share of messages the
+local model would answer without the LLM) and per-message latency. With
+--llm-labels the texts are first labelled by the LLM detector, so the report
+measures agreement with the LLM; --compare-llm also times the LLM on the
+test split. The final model is trained on all rows and written to --out.
+
+    python scripts/train_intent_classifier.py
+    python scripts/train_intent_classifier.py --data sessions.jsonl --llm-labels --compare-llm
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from Core_Brain.nlp_engine.config import LOCAL_INTENT_MODEL
+from Core_Brain.nlp_engine.local_intent import LocalIntentClassifier
+from Core_Brain.nlp_engine.nlp_engine import VALID_INTENTS
+
+DEFAULT_DATA = os.path.join(PROJECT_ROOT, "Core_Brain", "nlp_engine", "data", "intent_seed.jsonl")
+THRESHOLDS = [0.0, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def load_rows(path):
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                rows.append((row["text"], row.get("intent")))
+    return rows
+
+
+def llm_label(texts):
+    """Label texts with the LLM intent detector; returns (labels, seconds per call)."""
+    from Core_Brain.nlp_engine.nlp_engine import NLPEngine
+
+    nlp = NLPEngine()
+    labels = []
+    started = time.perf_counter()
+    for text in texts:
+        labels.append(nlp._parse_intent(nlp.call_groq_model(nlp._intent_messages(text), max_tokens=10)))
+    return labels, (time.perf_counter() - started) / max(1, len(texts))
+
+
+def evaluate(model, texts, labels):
+    started = time.perf_counter()
+    predictions = model.predict_batch(texts)
+    batch_us = (time.perf_counter() - started) / max(1, len(texts)) * 1e6
+
+    started = time.perf_counter()
+    for text in texts:
+        model.predict(text)
+    single_us = (time.perf_counter() - started) / max(1, len(texts)) * 1e6
+
+    correct = sum(pred == label for (pred, _), label in zip(predictions, labels))
+    print(f"\nTest accuracy: {correct}/{len(labels)} = {correct / max(1, len(labels)):.1%}")
+    print(f"Local latency: {single_us:.0f} us/message single, {batch_us:.0f} us/message batched")
+
+    print("\nthreshold  coverage  accuracy(local)  LLM calls saved")
+    for threshold in THRESHOLDS:
+        covered = [(pred, label) for (pred, conf), label in zip(predictions, labels) if conf >= threshold]
+        coverage = len(covered) / max(1, len(labels))
+        accuracy = sum(p == l for p, l in covered) / max(1, len(covered))
+        print(f"{threshold:9.2f}  {coverage:8.1%}  {accuracy:15.1%}  {len(covered):>5}/{len(labels)}")
+    return single_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data", default=DEFAULT_DATA, help="JSONL with text and intent fields")
+    parser.add_argument("--out", default=LOCAL_INTENT_MODEL, help="where to write the .npz model")
+    parser.add_argument("--llm-labels", action="store_true", help="label the texts with the LLM detector first")
+    parser.add_argument("--compare-llm", action="store_true", help="also time the LLM detector on the test split")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-save", action="store_true", help="evaluate only")
+    args = parser.parse_args()
+
+    rows = load_rows(args.data)
+    texts = [text for text, _ in rows]
+    if args.llm_labels:
+        labels, seconds = llm_label(texts)
+        print(f"Labelled {len(texts)} texts with the LLM ({seconds * 1000:.0f} ms/message)")
+    else:
+        labels = [label or "unknown" for _, label in rows]
+
+    unknown = sorted(set(labels) - set(VALID_INTENTS))
+    if unknown:
+        sys.exit(f"Labels not in VALID_INTENTS: {unknown}")
+
+    order = list(range(len(texts)))
+    random.Random(args.seed).shuffle(order)
+    n_test = int(len(order) * args.test_size)
+    test, train = order[:n_test], order[n_test:]
+    print(f"{len(train)} training / {len(test)} test examples")
+
+    model = LocalIntentClassifier(VALID_INTENTS).fit(
+        [texts[i] for i in train], [labels[i] for i in train], epochs=args.epochs
+    )
+    if test:
+        test_texts = [texts[i] for i in test]
+        local_us = evaluate(model, test_texts, [labels[i] for i in test])
+        if args.compare_llm:
+            llm_labels, seconds = llm_label(test_texts)
+            agreement = sum(p == l for (p, _), l in zip(model.predict_batch(test_texts), llm_labels))
+            print(f"\nLLM: {seconds * 1000:.0f} ms/message ({seconds * 1e6 / max(local_us, 1e-9):.0f}x local), "
+                  f"local/LLM agreement {agreement / len(test_texts):.1%}")
+
+    if not args.no_save:
+        final = LocalIntentClassifier(VALID_INTENTS).fit(texts, labels, epochs=args.epochs)
+        final.save(args.out)
+        print(f"\nSaved model trained on all {len(texts)} examples to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import Core_Brain / echo_backend the way the app does, from the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
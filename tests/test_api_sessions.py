@@ -0,0 +1,49 @@
+import unittest
+from unittest import mock
+
+import api.index as index
+
+
+class _RecordingRouter:
+    def __init__(self):
+        self.memories = []
+
+    def get_response_stream(self, user_input, memory, analysis=None):
+        self.memories.append(memory)
+        yield "ok"
+
+
+class ChatStreamSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.router = _RecordingRouter()
+        patches = [
+            mock.patch.object(index, "_backend", {"router": self.router}),
+            mock.patch.object(index, "_sessions", index.OrderedDict()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = index.app.test_client()
+
+    def _chat(self, session_id=None):
+        body = {"message": "hello"}
+        if session_id is not None:
+            body["session_id"] = session_id
+        return self.client.post("/api/chat/stream", json=body).get_data(as_text=True)
+
+    def test_sessions_do_not_share_memory(self):
+        self.assertEqual(self._chat("alice"), "ok")
+        self._chat("bob")
+        self._chat("alice")
+        alice, bob, alice_again = self.router.memories
+        self.assertIsNotNone(alice)
+        self.assertIsNot(alice, bob)
+        self.assertIs(alice, alice_again)
+
+    def test_no_session_means_no_memory(self):
+        self._chat()
+        self.assertEqual(self.router.memories, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+
+import httpx
+
+from Core_Brain.nlp_engine import http_client
+from Core_Brain.nlp_engine.async_engine import AsyncNLPEngine
+from Core_Brain.nlp_engine.resilience import CircuitBreaker
+
+
+def _engine():
+    engine = AsyncNLPEngine(semantic_cache=False, classify_cache=False)
+    engine.breaker = CircuitBreaker("test")
+    return engine
+
+
+class AsyncStreamTest(unittest.IsolatedAsyncioTestCase):
+    def _mock_client(self, status):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(status, json={"error": {"message": "nope"}})
+
+        loop = asyncio.get_running_loop()
+        http_client._async_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return calls
+
+    async def test_client_error_is_not_retried(self):
+        calls = self._mock_client(401)
+        engine = _engine()
+        deltas = [delta async for delta in engine.call_groq_model_stream([{"role": "user", "content": "hi"}])]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(deltas, ["[Groq Error]: Failed after 1 attempts"])
+        # A rejected request says nothing about upstream health
+        self.assertEqual(engine.breaker._failures, 0)
+
+
+class _Memory:
+    def __init__(self):
+        self.saved = []
+
+    def get_context_text(self):
+        return ""
+
+    def add_memory(self, user_input, response):
+        self.saved.append((user_input, response))
+
+
+class AsyncOverridesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.engine = _engine()
+        self.engine.fused_analysis = False
+        self.engine.concurrent_classification = False
+        self.engine.local_intent = False
+        self.engine.emotion_mode = "llm"
+
+        async def call_groq_model(messages, max_tokens=200, temperature=0.7, deadline=None):
+            return "greeting" if max_tokens == 10 else '{"emotion": "joy", "sentiment": "positive"}'
+
+        async def call_groq_model_stream(messages, max_tokens=200, temperature=0.7, deadline=None):
+            for delta in ["Hello ", "there."]:
+                yield delta
+
+        self.engine.call_groq_model = call_groq_model
+        self.engine.call_groq_model_stream = call_groq_model_stream
+
+    async def test_analyze_stream_is_async(self):
+        memory = _Memory()
+        result, deltas = await self.engine.analyze_stream("hi", memory_manager=memory)
+        self.assertEqual(result["intent"], "greeting")
+        self.assertEqual([delta async for delta in deltas], ["Hello ", "there."])
+        self.assertEqual(result["response"], "Hello there.")
+        self.assertEqual(memory.saved, [("hi", "Hello there.")])
+
+    async def test_detect_intent_cached_is_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(self.engine.detect_intent_cached))
+        self.assertEqual(await self.engine.detect_intent_cached("hi"), "greeting")
+
+    def test_no_sync_wrapper_of_a_coroutine_is_inherited(self):
+        # Sync NLPEngine methods that call these would hand back un-awaited coroutines
+        for name in ("detect_intent_cached", "detect_intent_batch", "detect_emotion_batch",
+                     "_classify_batch", "classify", "analyze", "analyze_stream"):
+            self.assertTrue(asyncio.iscoroutinefunction(getattr(AsyncNLPEngine, name)), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
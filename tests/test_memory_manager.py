@@ -0,0 +1,25 @@
+import sys
+import unittest
+from unittest import mock
+
+from Core_Brain.memory_manager import MemoryManager
+
+
+class MemoryManagerTest(unittest.TestCase):
+    def test_history_is_encrypted(self):
+        memory = MemoryManager()
+        memory.add_memory("I feel sad today", "I'm here for you.", session_id="s1")
+        self.assertNotIn("sad", memory.history[0]["user"])
+        self.assertEqual(memory.get_context_text("s1"), "User: I feel sad today\nEcho: I'm here for you.")
+
+    def test_nothing_is_stored_without_cryptography(self):
+        memory = MemoryManager()
+        # None in sys.modules makes the import raise ImportError
+        with mock.patch.dict(sys.modules, {"cryptography": None, "cryptography.fernet": None}):
+            memory.add_memory("my password is hunter2", "Noted.", session_id="s1")
+        self.assertEqual(memory.history, [])
+        self.assertEqual(memory.get_context_text("s1"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from Core_Brain.nlp_engine import local_intent
+from Core_Brain.nlp_engine.local_emotion import LexiconEmotionDetector
+from Core_Brain.nlp_engine.nlp_engine import NLPEngine
+from Core_Brain.nlp_engine.resilience import CircuitBreaker
+
+
+class _HangingHTTP:
+    """Stands in for the HTTP client against an upstream that never answers: each post blocks for its timeout."""
+
+    def __init__(self):
+        self.timeouts = []
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        with self._lock:
+            self.timeouts.append(timeout)
+            self.in_flight += 1
+        try:
+            time.sleep(timeout)
+            raise TimeoutError(f"read timed out after {timeout}s")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class ConcurrentClassificationTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = NLPEngine(
+            concurrent_classification=True, classify_timeout=0.8, local_intent=False, emotion_mode="llm",
+            semantic_cache=False, classify_cache=False,
+        )
+        self.engine.breaker = CircuitBreaker("test")
+        self.http = self.engine.http = _HangingHTTP()
+
+    def test_slow_upstream_gets_fallbacks_within_the_timeout(self):
+        started = time.monotonic()
+        intent, emotion = self.engine._detect_intent_and_emotion("hello there")
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(intent, "unknown")
+        self.assertEqual(emotion, {"emotion": "neutral", "sentiment": "neutral"})
+
+    def test_abandoned_calls_release_their_workers(self):
+        self.engine._detect_intent_and_emotion("hello there")
+        # The HTTP calls were given the phase's budget, not the retry policy's own timeout
+        self.assertTrue(self.http.timeouts)
+        self.assertLessEqual(max(self.http.timeouts), 0.8)
+        time.sleep(0.3)
+        self.assertEqual(self.http.in_flight, 0)
+
+
+class _BatchOnlyClassifier:
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.calls = []
+
+    def predict(self, text):
+        raise AssertionError("batch prefill should not classify texts one at a time")
+
+    def predict_batch(self, texts):
+        self.calls.append(list(texts))
+        return self.predictions
+
+
+class BatchPrefillTest(unittest.TestCase):
+    TEXTS = ["hi there", "what do you think about it", "hello again"]
+
+    def test_intent_prefill_is_one_vectorized_pass(self):
+        engine = NLPEngine(local_intent=True, local_intent_threshold=0.8, classify_cache=False)
+        classifier = _BatchOnlyClassifier([("greeting", 0.95), ("question", 0.3), ("greeting", 0.9)])
+        with mock.patch.object(local_intent, "get_local_intent_classifier", return_value=classifier):
+            results = engine._batch_prefill("intent", self.TEXTS)
+        self.assertEqual(results, ["greeting", None, "greeting"])
+        self.assertEqual(classifier.calls, [self.TEXTS])
+
+    def test_emotion_prefill_matches_per_text_detection(self):
+        engine = NLPEngine(emotion_mode="prefilter", local_emotion_threshold=0.3, classify_cache=False)
+        texts = ["I am so happy today", "ok", "I'm really scared and anxious"]
+        expected = [engine._local_emotion(text) for text in texts]
+        with mock.patch.object(LexiconEmotionDetector, "predict", side_effect=AssertionError("one at a time")):
+            self.assertEqual(engine._batch_prefill("emotion", texts), expected)
+        self.assertIsNone(expected[1])
+        self.assertEqual(expected[0]["emotion"], "happy")
+
+
+if __name__ == "__main__":
+    unittest.main()
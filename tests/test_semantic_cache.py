@@ -0,0 +1,71 @@
+import unittest
+
+from Core_Brain.nlp_engine.config import SEMANTIC_CACHE_THRESHOLD
+from Core_Brain.nlp_engine.semantic_cache import SemanticCache
+
+# (stored message, paraphrase that should reuse its entry)
+PARAPHRASES = [
+    ("I feel sad today", "feeling so sad today"),
+    ("I feel sad today", "I am sad today"),
+    ("I feel sad today", "i'm really sad today"),
+    ("I feel sad today", "I feel so sad today."),
+    ("I'm stressed about my exams", "I am so stressed about my exam"),
+    ("I'm stressed about my exams", "feeling stressed about exams"),
+    ("I can't sleep at night", "I cannot sleep at night"),
+    ("my boss yelled at me", "my boss was yelling at me"),
+    ("I miss my mom so much", "i really miss my mom"),
+    ("I am anxious about tomorrow", "feeling really anxious about tomorrow"),
+]
+
+# (stored message, message that must not get its analysis or reply)
+DIFFERENT = [
+    # opposite affect
+    ("I feel sad today", "I feel happy today"),
+    ("I am anxious about tomorrow", "I am excited about tomorrow"),
+    # negated
+    ("I feel sad today", "I am not sad today"),
+    ("I'm stressed about my exams", "I'm not stressed about my exams"),
+    ("I can't sleep at night", "I can sleep at night"),
+    # same affect, something else
+    ("I feel sad today", "I feel sad about my dog"),
+    ("I feel sad today", "I feel sad today at work"),
+    ("I'm stressed about my exams", "I'm stressed about my job"),
+    ("my boss yelled at me", "my wife yelled at me"),
+    ("my dog died yesterday", "my cat died yesterday"),
+    ("hello", "how are you"),
+]
+
+
+class SemanticCacheTest(unittest.TestCase):
+    def lookup_after_store(self, stored, query):
+        cache = SemanticCache(max_entries=8, ttl=60)
+        cache.store(stored, {"response": stored})
+        return cache.lookup(query)
+
+    def test_default_threshold_is_calibrated(self):
+        self.assertEqual(SemanticCache(max_entries=1).threshold, SEMANTIC_CACHE_THRESHOLD)
+
+    def test_paraphrases_hit(self):
+        for stored, query in PARAPHRASES:
+            with self.subTest(query=query):
+                value, similarity = self.lookup_after_store(stored, query)
+                self.assertEqual(value, {"response": stored}, f"similarity {similarity:.3f}")
+
+    def test_negated_opposite_and_unrelated_messages_miss(self):
+        for stored, query in DIFFERENT:
+            with self.subTest(query=query):
+                value, similarity = self.lookup_after_store(stored, query)
+                self.assertIsNone(value, f"similarity {similarity:.3f}")
+
+    def test_closest_entry_wins(self):
+        cache = SemanticCache(max_entries=8, ttl=60)
+        cache.store("I feel sad today", {"emotion": "sad"})
+        cache.store("I feel happy today", {"emotion": "happy"})
+        cache.store("I'm stressed about my exams", {"emotion": "fear"})
+        self.assertEqual(cache.lookup("feeling so happy today")[0], {"emotion": "happy"})
+        self.assertEqual(cache.lookup("so stressed about exams")[0], {"emotion": "fear"})
+        self.assertEqual(cache.stats()["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
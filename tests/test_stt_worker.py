@@ -0,0 +1,119 @@
+import os
+import queue
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from multiprocessing import Pipe
+from unittest import mock
+
+from Core_Brain import stt_backends
+from Core_Brain.stt_backends import STTBackend
+from Core_Brain.stt_tiers import resolve_profile
+from Core_Brain.stt_worker import STTClient, STTWorker, STTWorkerError, _Job
+
+
+class _EchoBackend(STTBackend):
+    name = "echo"
+
+    def transcribe(self, samples, options=None, deadline=None, profile=None):
+        return f"{len(samples)} samples"
+
+    def capabilities(self):
+        return {"name": self.name, "model": "stub", "batching": False, "thread_safe": True}
+
+
+class _StubTiered(STTBackend):
+    """Routes like TieredBackend: rejects unknown profiles, and "broken" clips hit a tier that can't load."""
+
+    name = "tiered"
+
+    def select(self, duration_s, profile=None, queue_depth=None):
+        resolve_profile(profile)
+        if duration_s > 1:
+            raise RuntimeError("could not load tier small")
+        return "tiny", _EchoBackend()
+
+    def capabilities(self):
+        return {"name": self.name, "model": "tiny", "batching": False, "thread_safe": True}
+
+
+def _worker(address=None):
+    with mock.patch.object(stt_backends, "load_backend", return_value=_StubTiered()):
+        return STTWorker(address=address, concurrency=1, batch_window_ms=0)
+
+
+class InferenceLoopTest(unittest.TestCase):
+    def test_routing_errors_fail_the_job_not_the_thread(self):
+        worker = _worker()
+        replies = queue.Queue()
+        thread = threading.Thread(target=worker._inference_loop, daemon=True)
+        thread.start()
+
+        for job_id, samples, profile in [(1, [0.0] * 1600, "bogus"), (2, [0.0] * 32000, None), (3, [0.0] * 1600, None)]:
+            worker.jobs.put(_Job(job_id, samples, {}, profile, replies.put, None))
+            reply = replies.get(timeout=2)
+            self.assertEqual(reply["id"], job_id)
+            if job_id == 3:
+                self.assertEqual(reply["text"], "1600 samples")
+            else:
+                self.assertIn("error", reply)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(worker.stats()["failed"], 2)
+
+    def test_unknown_profile_is_rejected_before_queueing(self):
+        worker = _worker()
+        server, client = Pipe()
+        thread = threading.Thread(target=worker._serve_connection, args=(server,), daemon=True)
+        thread.start()
+        client.send({"op": "transcribe", "id": 7, "audio": [0.0] * 1600, "profile": "bogus"})
+        self.assertTrue(client.poll(2), "no reply")
+        reply = client.recv()
+        client.close()
+        self.assertEqual(reply["id"], 7)
+        self.assertIn("Unknown STT profile", reply["error"])
+        self.assertEqual(worker.jobs.qsize(), 0)
+
+
+class SocketTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+        self.address = os.path.join(self.directory, "echo-stt", "stt.sock")
+
+    def test_socket_is_private_and_needs_the_generated_authkey(self):
+        worker = _worker(self.address)
+        listener = worker._listen()
+        self.addCleanup(listener.close)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(self.address)).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(self.address).st_mode) & 0o077, 0)
+        self.assertEqual(stat.S_IMODE(os.stat(self.address + ".key").st_mode), 0o600)
+
+        def accept(attempts):
+            for _ in range(attempts):
+                try:
+                    conn = listener.accept()
+                except Exception:
+                    continue
+                threading.Thread(target=worker._serve_connection, args=(conn,), daemon=True).start()
+
+        threading.Thread(target=accept, args=(2,), daemon=True).start()
+        with self.assertRaises(STTWorkerError):
+            STTClient(self.address, authkey=b"guessed", timeout=2).stats()
+        # No configured key: the client reads the one the worker generated
+        client = STTClient(self.address, timeout=2)
+        self.addCleanup(client.close)
+        self.assertEqual(client.stats()["queue_depth"], 0)
+
+    def test_shared_directory_is_refused(self):
+        os.makedirs(os.path.dirname(self.address))
+        os.chmod(os.path.dirname(self.address), 0o777)
+        with self.assertRaises(STTWorkerError):
+            _worker(self.address)._listen()
+        self.assertFalse(os.path.exists(self.address))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from Core_Brain.nlp_engine.http_client import HTTPClient
+from Core_Brain.nlp_engine.nlp_engine import NLPEngine
+from Core_Brain.nlp_engine.resilience import CircuitBreaker
+
+
+class _Unauthorized(BaseHTTPRequestHandler):
+    requests = 0
+
+    def do_POST(self):
+        type(self).requests += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"error": {"message": "invalid api key"}}).encode()
+        self.send_response(401)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SyncStreamTest(unittest.TestCase):
+    def setUp(self):
+        _Unauthorized.requests = 0
+        self.server = HTTPServer(("127.0.0.1", 0), _Unauthorized)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_client_error_is_not_retried(self):
+        engine = NLPEngine(semantic_cache=False, classify_cache=False)
+        engine.breaker = CircuitBreaker("test")
+        engine.api_url = f"http://127.0.0.1:{self.server.server_port}/chat/completions"
+        deltas = list(engine.call_groq_model_stream([{"role": "user", "content": "hi"}]))
+        self.assertEqual(_Unauthorized.requests, 1)
+        self.assertEqual(deltas, ["[Groq Error]: Failed after 1 attempts"])
+        self.assertEqual(engine.breaker._failures, 0)
+
+    def test_error_body_is_readable_from_requests(self):
+        client = HTTPClient(http2=False)
+        self.addCleanup(client.close)
+        url = f"http://127.0.0.1:{self.server.server_port}/chat/completions"
+        with client.stream_post(url, json={}) as response:
+            self.assertEqual(response.status_code, 401)
+            self.assertIn("invalid api key", response.read_text())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from Core_Brain.text_to_speech import MAX_CHUNK_CHARS, SentenceChunker
+
+
+class SentenceChunkerTest(unittest.TestCase):
+    def test_long_clause_is_cut_after_its_comma(self):
+        first = "I know the last few weeks have been " + "really " * 12 + "hard on you,"
+        second = " and " + "it is okay to take things slowly " * 5
+        chunker = SentenceChunker()
+        chunks = chunker.feed(first + second)
+        self.assertEqual(chunks[0], first)
+        self.assertEqual(chunker.flush(), [second.strip()])
+
+    def test_long_clause_without_a_comma_is_cut_at_a_space(self):
+        text = "and then " * 40
+        chunks = SentenceChunker().feed(text)
+        self.assertTrue(chunks)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), MAX_CHUNK_CHARS)
+            self.assertTrue(chunk.endswith(("and", "then")))
+
+    def test_sentences_are_split_and_short_ones_joined(self):
+        chunker = SentenceChunker()
+        chunks = chunker.feed("Hi. That sounds like a really long day. Do you want to ")
+        self.assertEqual(chunks, ["Hi. That sounds like a really long day."])
+        self.assertEqual(chunker.feed("talk about it?"), [])
+        self.assertEqual(chunker.flush(), ["Do you want to talk about it?"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from Core_Brain.text_to_speech import TextToSpeech
+from Core_Brain.tts_backends import TTSBackend
+from Core_Brain.tts_cache import AudioCache
+
+
+class _FakeBackend(TTSBackend):
+    name = "fake"
+    audio_format = "wav"
+
+    def __init__(self):
+        super().__init__(voice="", rate=0)
+        self.calls = 0
+
+    def synthesize(self, text, lang="en", timeout=None):
+        self.calls += 1
+        return b"RIFF" + text.encode("utf-8")
+
+    def capabilities(self):
+        return {"name": self.name, "voice": None, "format": self.audio_format, "offline": True, "thread_safe": True}
+
+
+class BrokenCacheDirTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        blocker = os.path.join(tmp.name, "not-a-dir")
+        with open(blocker, "w") as f:
+            f.write("x")
+        self.backend = _FakeBackend()
+        self.cache = AudioCache(directory=os.path.join(blocker, "tts"))
+        self.tts = TextToSpeech(cache=self.cache, backend=self.backend)
+
+    def test_synthesis_works_without_the_disk_tier(self):
+        self.assertEqual(self.tts.text_to_audio_bytes("hello"), b"RIFFhello")
+        self.assertIsNotNone(self.cache.disk_error)
+        # Still served from the memory tier
+        self.assertEqual(self.tts.text_to_audio_bytes("hello"), b"RIFFhello")
+        self.assertEqual(self.backend.calls, 1)
+
+    def test_speak_falls_back_to_a_temp_file(self):
+        path = self.tts.speak("hello")
+        self.assertFalse(path.startswith("[TTS Error]"))
+        self.addCleanup(os.remove, path)
+        self.assertFalse(self.tts.owns_file(path))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"RIFFhello")
+
+    def test_base64_works(self):
+        self.assertTrue(self.tts.text_to_base64_audio("hello"))
+
+
+if __name__ == "__main__":
+    unittest.main()
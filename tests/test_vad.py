@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from Core_Brain.vad import VoiceActivityDetector
+
+RATE = 16000
+
+
+def _tone(seconds, amplitude, freq=220.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+class VoiceActivityDetectorTest(unittest.TestCase):
+    def setUp(self):
+        self.vad = VoiceActivityDetector(sample_rate=RATE, floor_db=-45)
+
+    def test_loud_low_contrast_clip_passes_through_untrimmed(self):
+        # -13 dBFS tone with a ~6 dB amplitude-modulation swing: loud, but nothing to segment
+        t = np.arange(int(1.5 * RATE)) / RATE
+        envelope = 0.75 + 0.25 * np.sin(2 * np.pi * 3 * t)
+        samples = (_tone(1.5, 0.3) * envelope).astype(np.float32)
+        trimmed, info = self.vad.process(samples)
+        self.assertTrue(info["speech"])
+        self.assertEqual(len(trimmed), len(samples))
+
+    def test_clip_below_floor_is_rejected(self):
+        samples = np.random.default_rng(0).normal(0, 10 ** (-60 / 20), RATE).astype(np.float32)
+        trimmed, info = self.vad.process(samples)
+        self.assertFalse(info["speech"])
+        self.assertEqual(len(trimmed), 0)
+
+    def test_silence_around_speech_is_trimmed(self):
+        silence = np.zeros(RATE, dtype=np.float32)
+        samples = np.concatenate([silence, _tone(1.0, 0.3), silence])
+        trimmed, info = self.vad.process(samples)
+        self.assertTrue(info["speech"])
+        self.assertLess(len(trimmed), 1.5 * RATE)
+        self.assertGreaterEqual(len(trimmed), RATE)
+
+
+if __name__ == "__main__":
+    unittest.main()